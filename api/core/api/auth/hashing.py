@@ -0,0 +1,103 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.contrib.auth.password_validation import validate_password
+
+
+class HashingPoolBusy(Exception):
+    """
+    Raised when the hashing pool already has as much work as it accepts.
+    """
+
+
+class BoundedExecutor:
+    """
+    Thread pool that accepts at most `max_workers + max_queued` tasks at a
+    time and rejects the rest instead of queueing them without limit.
+    """
+
+    def __init__(self, max_workers, max_queued):
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password-hashing"
+        )
+        self.slots = threading.BoundedSemaphore(max_workers + max_queued)
+
+    async def run(self, func, *args):
+        if not self.slots.acquire(blocking=False):
+            raise HashingPoolBusy()
+        try:
+            future = self.executor.submit(func, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+        # released when the task finishes rather than when the caller stops
+        # waiting: a cancelled request leaves its hashing thread running
+        future.add_done_callback(lambda future: self.slots.release())
+        return await asyncio.wrap_future(future)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_hashing_executor() -> BoundedExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = BoundedExecutor(
+                    settings.PASSWORD_HASHING_WORKERS,
+                    settings.PASSWORD_HASHING_QUEUE,
+                )
+    return _executor
+
+
+def verify_password(password, encoded) -> tuple:
+    """
+    Checks `password` against the `encoded` hash without touching the
+    database.
+
+    :return: tuple of whether it matches and whether the hash should be
+        upgraded to the current hasher
+    """
+    must_update = []
+    valid = hashers.check_password(
+        password, encoded, setter=lambda raw: must_update.append(True)
+    )
+    return valid, bool(must_update)
+
+
+async def acheck_password(user, password) -> bool:
+    """
+    Async `User.check_password` that hashes in the bounded pool. Upgrading
+    an outdated hash is best effort: when the pool is saturated by then it
+    is left for a later login, rather than failing a verified one.
+
+    :raises HashingPoolBusy: if the pool is saturated before verifying
+    """
+    executor = get_hashing_executor()
+    valid, must_update = await executor.run(verify_password, password, user.password)
+    if valid and must_update:
+        try:
+            user.password = await executor.run(hashers.make_password, password)
+        except HashingPoolBusy:
+            return valid
+        await user.asave(update_fields=["password"])
+    return valid
+
+
+async def amake_password(password) -> str:
+    """
+    :raises HashingPoolBusy: if the pool is saturated
+    """
+    return await get_hashing_executor().run(hashers.make_password, password)
+
+
+async def avalidate_password(password, user=None) -> None:
+    """
+    :raises HashingPoolBusy: if the pool is saturated
+    """
+    await get_hashing_executor().run(validate_password, password, user)
@@ -1,4 +1,10 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+from core.api.auth.authentication import EPOCH_CLAIM
+from models.user.models import User
 
 
 class UserLoginSerializer(serializers.Serializer):
@@ -11,3 +17,28 @@ class UserRegisterSerializer(serializers.Serializer):
     last_name = serializers.CharField(required=True)
     email = serializers.EmailField(required=True)
     password = serializers.CharField(write_only=True, required=True)
+
+
+class EpochTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refuses to refresh tokens of inactive users or tokens issued before
+    the user's tokens were revoked.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        epoch = (
+            User.objects.filter(
+                pk=refresh.get(api_settings.USER_ID_CLAIM), is_active=True
+            )
+            .values_list("token_epoch", flat=True)
+            .first()
+        )
+        if epoch is None or refresh.get(EPOCH_CLAIM) != epoch:
+            raise InvalidToken("Token has been revoked.")
+        return super().validate(attrs)
+
+
+class LogoutSerializer(serializers.Serializer):
+    refresh = serializers.CharField()
+    everywhere = serializers.BooleanField(required=False, default=False)
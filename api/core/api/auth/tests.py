@@ -0,0 +1,351 @@
+import asyncio
+import threading
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.test import APIClient, APIRequestFactory
+
+from core.api.auth.authentication import (
+    CachedJWTAuthentication,
+    TimedAuthenticationMixin,
+    get_refresh_token,
+)
+from core.api.auth.hashing import (
+    BoundedExecutor,
+    HashingPoolBusy,
+    acheck_password,
+)
+from core.api.auth.throttling import (
+    LoginEmailThrottle,
+    LoginIPThrottle,
+    MemoryBucketStore,
+    get_bucket_store,
+)
+from core.api.auth.views import UserLoginAPIView
+from core.api.user.views import UserProfileAPIView
+from models.user.cache import get_auth_user_cache
+from models.user.models import User
+
+PASSWORD = "correct-horse-battery"
+
+
+class AuthTestCase(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        get_auth_user_cache().clear()
+        get_bucket_store().clear()
+        self.user = User(
+            email="student@example.com", first_name="Ivan", last_name="Bondar"
+        )
+        self.user.set_password(PASSWORD)
+        self.user.save()
+
+
+class SaturatedExecutor:
+    """
+    Hashing pool that runs the first `accepted` tasks and then is busy.
+    """
+
+    def __init__(self, accepted):
+        self.accepted = accepted
+
+    async def run(self, func, *args):
+        if self.accepted == 0:
+            raise HashingPoolBusy()
+        self.accepted -= 1
+        return func(*args)
+
+
+class PasswordHashingTestCase(AuthTestCase):
+    def setUp(self):
+        super().setUp()
+        # an outdated hash, which a successful check upgrades
+        self.outdated = PBKDF2PasswordHasher().encode(PASSWORD, "saltsalt", 1000)
+        User.objects.filter(pk=self.user.pk).update(password=self.outdated)
+        self.user.refresh_from_db()
+
+    def check_password(self, password, executor):
+        with mock.patch(
+            "core.api.auth.hashing.get_hashing_executor", return_value=executor
+        ):
+            return async_to_sync(acheck_password)(self.user, password)
+
+    def test_outdated_hash_is_upgraded(self):
+        self.assertTrue(self.check_password(PASSWORD, SaturatedExecutor(2)))
+
+        self.user.refresh_from_db()
+        self.assertNotEqual(self.user.password, self.outdated)
+        self.assertTrue(self.user.check_password(PASSWORD))
+
+    def test_saturated_pool_skips_the_upgrade(self):
+        self.assertTrue(self.check_password(PASSWORD, SaturatedExecutor(1)))
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.password, self.outdated)
+
+    def test_saturated_pool_fails_the_check(self):
+        with self.assertRaises(HashingPoolBusy):
+            self.check_password(PASSWORD, SaturatedExecutor(0))
+
+    def test_login_succeeds_when_the_upgrade_is_skipped(self):
+        with mock.patch(
+            "core.api.auth.hashing.get_hashing_executor",
+            return_value=SaturatedExecutor(1),
+        ):
+            response = self.client.post(
+                "/api/auth/login",
+                {"email": self.user.email, "password": PASSWORD},
+                content_type="application/json",
+            )
+
+        self.assertEqual(response.status_code, 200, response.content)
+
+
+class BoundedExecutorTestCase(TestCase):
+    def setUp(self):
+        self.executor = BoundedExecutor(max_workers=1, max_queued=0)
+        self.addCleanup(self.executor.executor.shutdown)
+
+    def test_slot_is_held_until_a_cancelled_task_finishes(self):
+        started = threading.Event()
+        finish = threading.Event()
+        done = threading.Event()
+
+        def hash_slowly():
+            started.set()
+            finish.wait(5)
+            done.set()
+
+        async def cancel_and_retry():
+            task = asyncio.create_task(self.executor.run(hash_slowly))
+            await asyncio.to_thread(started.wait, 5)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+            # the thread still hashes, so the pool is still full
+            with self.assertRaises(HashingPoolBusy):
+                await self.executor.run(int, "1")
+
+            finish.set()
+            await asyncio.to_thread(done.wait, 5)
+            # the done callback runs right after the function returns
+            for _ in range(100):
+                try:
+                    return await self.executor.run(int, "1")
+                except HashingPoolBusy:
+                    await asyncio.sleep(0.01)
+
+        self.assertEqual(async_to_sync(cancel_and_retry)(), 1)
+
+
+# the bucket sizes of settings.REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]
+LOGIN_IP_CAPACITY = 60
+LOGIN_EMAIL_CAPACITY = 10
+
+
+class TimedSessionAuthentication(TimedAuthenticationMixin, SessionAuthentication):
+    pass
+
+
+@override_settings(SERVER_TIMING=True)
+class ServerTimingTestCase(AuthTestCase):
+    def get_metrics(self, response):
+        metrics = []
+        for metric in response["Server-Timing"].split(", "):
+            name, duration, *description = metric.split(";")
+            self.assertRegex(duration, r"^dur=\d+\.\d{3}$")
+            metrics.append((name, *description))
+        return metrics
+
+    def get_profile(self, token=None):
+        client = APIClient()
+        if token is not None:
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        with mock.patch.object(
+            UserProfileAPIView,
+            "authentication_classes",
+            [CachedJWTAuthentication, TimedSessionAuthentication],
+        ):
+            return client.get("/api/user/profile")
+
+    def test_every_authenticator_that_runs_is_reported(self):
+        response = self.get_profile()
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(
+            self.get_metrics(response),
+            [
+                ("auth", 'desc="CachedJWTAuthentication"'),
+                ("auth", 'desc="TimedSessionAuthentication"'),
+                ("total",),
+            ],
+        )
+
+    def test_authenticators_after_the_matching_one_do_not_run(self):
+        response = self.get_profile(get_refresh_token(self.user).access_token)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            self.get_metrics(response),
+            [("auth", 'desc="CachedJWTAuthentication"'), ("total",)],
+        )
+
+    @override_settings(SERVER_TIMING=False)
+    def test_disabled(self):
+        response = self.get_profile(get_refresh_token(self.user).access_token)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("Server-Timing"))
+
+
+class LogoutTestCase(AuthTestCase):
+    def logout(self, refresh, everywhere=False):
+        return APIClient().post(
+            "/api/auth/logout",
+            {"refresh": str(refresh), "everywhere": everywhere},
+            format="json",
+        )
+
+    def refresh(self, refresh):
+        return APIClient().post(
+            "/api/auth/token/refresh", {"refresh": str(refresh)}, format="json"
+        )
+
+    def test_logout_everywhere_revokes_every_token(self):
+        epoch = self.user.token_epoch
+        refresh = get_refresh_token(self.user)
+        other = get_refresh_token(self.user)
+
+        response = self.logout(refresh, everywhere=True)
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.token_epoch, epoch + 1)
+        self.assertEqual(self.refresh(other).status_code, 401)
+
+    def test_revoked_token_cannot_log_out_newer_sessions(self):
+        stale = get_refresh_token(self.user)
+        response = self.logout(get_refresh_token(self.user), everywhere=True)
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        epoch = self.user.token_epoch
+
+        for everywhere in [True, False]:
+            with self.subTest(everywhere=everywhere):
+                current = get_refresh_token(self.user)
+                response = self.logout(stale, everywhere=everywhere)
+
+                self.assertEqual(response.status_code, 401, response.content)
+                self.user.refresh_from_db()
+                self.assertEqual(self.user.token_epoch, epoch)
+                self.assertEqual(self.refresh(current).status_code, 200)
+
+    def test_inactive_user_cannot_log_out(self):
+        epoch = self.user.token_epoch
+        refresh = get_refresh_token(self.user)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        response = self.logout(refresh, everywhere=True)
+
+        self.assertEqual(response.status_code, 401, response.content)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.token_epoch, epoch)
+
+
+@mock.patch("core.api.auth.throttling.time.monotonic", return_value=1000.0)
+class LoginThrottleTestCase(TestCase):
+    """
+    Credential-stuffing bursts of 10k attempts, within the same instant so
+    no bucket refills.
+    """
+
+    ATTEMPTS = 10_000
+
+    def setUp(self):
+        get_bucket_store().clear()
+        self.factory = APIRequestFactory()
+        self.view = UserLoginAPIView()
+
+    def allowed(self, throttle_class, **request):
+        data = {"email": request.pop("email"), "password": "guess"}
+        request = self.view.initialize_request(
+            self.factory.post("/api/auth/login", data, format="json", **request)
+        )
+        return throttle_class().allow_request(request, self.view)
+
+    def test_one_address_with_spoofed_forwarded_for(self, monotonic):
+        allowed = sum(
+            self.allowed(
+                LoginIPThrottle,
+                email=f"user{attempt}@example.com",
+                REMOTE_ADDR="203.0.113.7",
+                HTTP_X_FORWARDED_FOR=f"10.{attempt // 256 % 256}.{attempt % 256}.1",
+            )
+            for attempt in range(self.ATTEMPTS)
+        )
+
+        self.assertEqual(allowed, LOGIN_IP_CAPACITY)
+
+    def test_one_email_from_many_addresses(self, monotonic):
+        allowed = sum(
+            self.allowed(
+                LoginEmailThrottle,
+                email=" Student@Example.com " if attempt % 2 else "student@example.com",
+                REMOTE_ADDR=f"10.{attempt // 256 % 256}.{attempt % 256}.1",
+            )
+            for attempt in range(self.ATTEMPTS)
+        )
+
+        self.assertEqual(allowed, LOGIN_EMAIL_CAPACITY)
+
+    def test_buckets_refill(self, monotonic):
+        for _ in range(LOGIN_EMAIL_CAPACITY):
+            self.assertTrue(
+                self.allowed(LoginEmailThrottle, email="student@example.com")
+            )
+        self.assertFalse(self.allowed(LoginEmailThrottle, email="student@example.com"))
+
+        # "10/min" refills a token every 6 seconds
+        monotonic.return_value += 6
+        self.assertTrue(self.allowed(LoginEmailThrottle, email="student@example.com"))
+        self.assertFalse(self.allowed(LoginEmailThrottle, email="student@example.com"))
+
+    def test_store_stays_bounded(self, monotonic):
+        store = MemoryBucketStore(max_entries=1000)
+        for attempt in range(self.ATTEMPTS):
+            store.consume(f"login_ip:{attempt}", LOGIN_IP_CAPACITY, 1.0, now=1000.0)
+
+        self.assertLessEqual(len(store.buckets), 1000)
+        self.assertEqual(len(store.buckets), len(store.expires))
+
+        # every bucket is full again after a minute and gets evicted
+        store.consume("login_ip:other", LOGIN_IP_CAPACITY, 1.0, now=2000.0)
+        store.evict(2000.0)
+        self.assertEqual(list(store.buckets), ["login_ip:other"])
+
+    def test_throttled_logins_never_hash(self, monotonic):
+        User.objects.create(
+            email="student@example.com", first_name="Ivan", last_name="Bondar"
+        )
+        attempts = 200
+        with mock.patch(
+            "core.api.auth.views.acheck_password", return_value=False
+        ) as check_password:
+            statuses = [
+                self.client.post(
+                    "/api/auth/login",
+                    {"email": "student@example.com", "password": "guess"},
+                    content_type="application/json",
+                    HTTP_X_FORWARDED_FOR=f"10.0.{attempt}.1",
+                ).status_code
+                for attempt in range(attempts)
+            ]
+
+        self.assertEqual(statuses.count(400), LOGIN_EMAIL_CAPACITY)
+        self.assertEqual(statuses.count(429), attempts - LOGIN_EMAIL_CAPACITY)
+        self.assertEqual(check_password.call_count, LOGIN_EMAIL_CAPACITY)
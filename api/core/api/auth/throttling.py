@@ -0,0 +1,198 @@
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+
+class MemoryBucketStore:
+    """
+    Token buckets of this process, kept in a dict of
+    key -> (tokens, last update). A bucket that has refilled completely is
+    the same as no bucket, so it is evicted once it would be full again.
+    """
+
+    def __init__(self, max_entries=100_000, sweep_interval=1024):
+        self.max_entries = max_entries
+        self.sweep_interval = sweep_interval
+        self.buckets = {}
+        self.expires = {}
+        self.lock = threading.Lock()
+        self.operations = 0
+
+    def consume(self, key, capacity, refill_rate, now=None):
+        """
+        Takes a token from the bucket of `key` if it has one.
+
+        :return: tuple of whether the request is allowed and the seconds
+            to wait for the next token if it is not
+        """
+        if now is None:
+            now = time.monotonic()
+        with self.lock:
+            tokens, updated_at = self.buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+            if tokens >= 1:
+                tokens -= 1
+                allowed, wait = True, None
+            else:
+                allowed, wait = False, (1 - tokens) / refill_rate
+
+            # re-inserting keeps the dict ordered by last use
+            self.buckets[key] = (tokens, now)
+            self.expires[key] = now + (capacity - tokens) / refill_rate
+
+            self.operations += 1
+            if (
+                self.operations % self.sweep_interval == 0
+                or len(self.buckets) > self.max_entries
+            ):
+                self.evict(now)
+        return allowed, wait
+
+    def evict(self, now):
+        for key in [key for key, expires in self.expires.items() if expires <= now]:
+            del self.buckets[key]
+            del self.expires[key]
+        while len(self.buckets) > self.max_entries:
+            key = next(iter(self.buckets))
+            del self.buckets[key]
+            del self.expires[key]
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+            self.expires.clear()
+
+
+class CacheBucketStore:
+    """
+    Token buckets in a Django cache, shared by every process using it.
+
+    The read and the write are not atomic, so concurrent requests for the
+    same key may occasionally both get the last token.
+    """
+
+    def __init__(self, alias="default", prefix="throttle"):
+        self.cache = caches[alias]
+        self.prefix = prefix
+
+    def consume(self, key, capacity, refill_rate, now=None):
+        if now is None:
+            now = time.time()
+        cache_key = f"{self.prefix}:{key}"
+        tokens, updated_at = self.cache.get(cache_key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+        if tokens >= 1:
+            tokens -= 1
+            allowed, wait = True, None
+        else:
+            allowed, wait = False, (1 - tokens) / refill_rate
+
+        timeout = math.ceil((capacity - tokens) / refill_rate) + 1
+        self.cache.set(cache_key, (tokens, now), timeout)
+        return allowed, wait
+
+    def clear(self):
+        self.cache.clear()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_bucket_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = import_string(settings.AUTH_THROTTLE_STORE)()
+    return _store
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Throttle with a token bucket per key: `scope`'s rate in
+    `DEFAULT_THROTTLE_RATES`, e.g. "10/min", allows bursts of 10 requests
+    and refills one token every 6 seconds.
+    """
+
+    scope = None
+    durations = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+    def __init__(self):
+        self.wait_time = None
+
+    def get_rate(self):
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def parse_rate(self, rate):
+        """
+        :return: tuple of the bucket capacity and the refill rate per second
+        """
+        num, period = rate.split("/")
+        capacity = int(num)
+        return capacity, capacity / self.durations[period[0]]
+
+    def get_key(self, request, view):
+        """
+        Returns the key of the bucket to take a token from, or None to not
+        throttle the request.
+        """
+        raise NotImplementedError(".get_key() must be overridden")
+
+    def allow_request(self, request, view):
+        rate = self.get_rate()
+        if rate is None:
+            return True
+        key = self.get_key(request, view)
+        if key is None:
+            return True
+
+        capacity, refill_rate = self.parse_rate(rate)
+        allowed, self.wait_time = get_bucket_store().consume(
+            f"{self.scope}:{key}", capacity, refill_rate
+        )
+        return allowed
+
+    def wait(self):
+        return self.wait_time
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """
+    Buckets per client address. X-Forwarded-For is only trusted as far as
+    `NUM_PROXIES` proxies appended to it, see `get_ident`.
+    """
+
+    def get_key(self, request, view):
+        return self.get_ident(request)
+
+
+class EmailTokenBucketThrottle(TokenBucketThrottle):
+    """
+    Buckets per email of the request body, so one account cannot be
+    guessed at from many addresses at once.
+    """
+
+    def get_key(self, request, view):
+        email = request.data.get("email") if hasattr(request.data, "get") else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        return email.strip().lower()
+
+
+class LoginIPThrottle(IPTokenBucketThrottle):
+    scope = "login_ip"
+
+
+class LoginEmailThrottle(EmailTokenBucketThrottle):
+    scope = "login_email"
+
+
+class RegisterIPThrottle(IPTokenBucketThrottle):
+    scope = "register_ip"
@@ -4,11 +4,16 @@ from rest_framework_simplejwt.views import (
     TokenRefreshView,
 )
 
-from core.api.auth.views import UserLoginAPIView, UserRegisterAPIView
+from core.api.auth.views import (
+    UserLoginAPIView,
+    UserLogoutAPIView,
+    UserRegisterAPIView,
+)
 
 
 urlpatterns = [
     path("login", UserLoginAPIView.as_view(), name="token_obtain_pair"),
     path("register", UserRegisterAPIView.as_view(), name="user_register"),
+    path("logout", UserLogoutAPIView.as_view(), name="user_logout"),
     path("token/refresh", TokenRefreshView.as_view(), name="token_refresh"),
 ]
@@ -1,39 +1,78 @@
-from django.contrib.auth import authenticate
-from django.contrib.auth.models import update_last_login
-from django.contrib.auth.password_validation import validate_password
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
 from rest_framework import status
 from rest_framework.views import APIView
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from core.api.helpers.rest_api import rest_default_error_response, rest_default_response
-from core.api.auth.serializers import UserLoginSerializer, UserRegisterSerializer
+from core.api.helpers.views import AsyncAPIView
+from core.api.auth.authentication import EPOCH_CLAIM, get_refresh_token
+from core.api.auth.hashing import (
+    HashingPoolBusy,
+    acheck_password,
+    amake_password,
+    avalidate_password,
+)
+from core.api.auth.throttling import (
+    LoginIPThrottle,
+    LoginEmailThrottle,
+    RegisterIPThrottle,
+)
+from core.api.auth.serializers import (
+    LogoutSerializer,
+    UserLoginSerializer,
+    UserRegisterSerializer,
+)
 from models.user.models import User
+from models.user.utils import touch_last_login
 
+# seconds a client should wait before retrying when hashing is saturated
+HASHING_RETRY_AFTER = 1
 
-class UserLoginAPIView(APIView):
+
+def hashing_busy_response():
+    response = rest_default_error_response(
+        data="Server is busy, please try again.",
+        message="Server is busy.",
+        status=status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
+    response["Retry-After"] = str(HASHING_RETRY_AFTER)
+    return response
+
+
+class UserLoginAPIView(AsyncAPIView):
     """
     An endpoint to login a user.
     """
     serializer_class = UserLoginSerializer
+    throttle_classes = [LoginIPThrottle, LoginEmailThrottle]
 
-    def post(self, request):
+    async def post(self, request):
         serializer = UserLoginSerializer(data=request.data)
         if not serializer.is_valid():
             return rest_default_error_response(
                 serializer=serializer,
                 message="An error occurred during login.",
             )
-        qv_user = User.objects.filter(email__iexact=request.data.get("email"))
-        if not qv_user.exists():
+        # emails are stored lowercased, so an exact match on the lowercased
+        # input is case-insensitive and can use the email index
+        user = await User.objects.filter(
+            email=serializer.validated_data["email"].lower()
+        ).afirst()
+        if user is None:
             return rest_default_error_response(
                 data="Username does not exist.",
                 message="User not found.",
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        user = qv_user.first()
-
-        if not user.check_password(request.data.get("password")):
+        try:
+            valid = await acheck_password(user, serializer.validated_data["password"])
+        except HashingPoolBusy:
+            return hashing_busy_response()
+        if not valid:
             return rest_default_error_response(
                 data="Invalid password.",
                 message="Invalid password.",
@@ -47,12 +86,8 @@ class UserLoginAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        user_auth = authenticate(
-            username=user.username, password=request.data.get("password")
-        )
-
-        update_last_login(None, user_auth)
-        refresh = RefreshToken.for_user(user_auth)
+        await sync_to_async(touch_last_login)(user)
+        refresh = await sync_to_async(get_refresh_token)(user)
 
         response_data = {
             "id": user.id,
@@ -70,10 +105,11 @@ class UserLoginAPIView(APIView):
         )
 
 
-class UserRegisterAPIView(APIView):
+class UserRegisterAPIView(AsyncAPIView):
     serializer_class = UserRegisterSerializer
+    throttle_classes = [RegisterIPThrottle]
 
-    def post(self, request):
+    async def post(self, request):
         serializer = UserRegisterSerializer(data=request.data)
         if not serializer.is_valid():
             return rest_default_error_response(
@@ -86,16 +122,62 @@ class UserRegisterAPIView(APIView):
         user.first_name = serializer.validated_data["first_name"]
         user.last_name = serializer.validated_data["last_name"]
         try:
-            validate_password(serializer.validated_data["password"])
-        except Exception as e:
+            await avalidate_password(serializer.validated_data["password"])
+            user.password = await amake_password(serializer.validated_data["password"])
+        except HashingPoolBusy:
+            return hashing_busy_response()
+        except ValidationError as e:
             return rest_default_error_response(
                 data=e,
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        user.set_password(serializer.validated_data["password"])
-        user.save()
+        await user.asave()
 
         return rest_default_response(
             message="User registered successfully.",
             status=status.HTTP_201_CREATED,
         )
+
+
+class UserLogoutAPIView(APIView):
+    """
+    Revokes a refresh token, or with `everywhere` every token of its user.
+    Works without an access token, so an expired session can still log out.
+    """
+    serializer_class = LogoutSerializer
+    authentication_classes = []
+
+    def post(self, request):
+        serializer = LogoutSerializer(data=request.data)
+        if not serializer.is_valid():
+            return rest_default_error_response(
+                serializer=serializer,
+                message="An error occurred during logout.",
+            )
+        try:
+            refresh = RefreshToken(serializer.validated_data["refresh"])
+        except TokenError as e:
+            return rest_default_error_response(
+                data=str(e), status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # like a refresh, a token of an inactive user or one issued before
+        # the last revocation (e.g. an old "logout everywhere") is refused,
+        # so it cannot end the sessions that came after it
+        user = User.objects.filter(
+            pk=refresh.get(api_settings.USER_ID_CLAIM), is_active=True
+        ).first()
+        if user is None or refresh.get(EPOCH_CLAIM) != user.token_epoch:
+            return rest_default_error_response(
+                data="Token has been revoked.",
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+
+        refresh.blacklist()
+        if serializer.validated_data["everywhere"]:
+            user.revoke_tokens()
+
+        return rest_default_response(
+            message="User logged out successfully.",
+            status=status.HTTP_200_OK,
+        )
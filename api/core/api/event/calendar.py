@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from models.event.utils import get_last_occurrence_date
+
+# events have no end time, so every VEVENT gets one class period
+EVENT_DURATION = timedelta(minutes=80)
+PRODUCT_ID = "-//StarostaHub//Group schedule//UK"
+
+
+def escape_text(value):
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold_line(line):
+    """
+    Folds a content line to 75 octets as required by RFC 5545.
+    """
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+
+    parts = []
+    current = ""
+    limit = 75
+    for char in line:
+        if len((current + char).encode("utf-8")) > limit:
+            parts.append(current)
+            current = ""
+            limit = 74  # continuation lines start with a space
+        current += char
+    parts.append(current)
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def format_local_datetime(date, time):
+    return datetime.combine(date, time).strftime("%Y%m%dT%H%M%S")
+
+
+def format_utc_datetime(value):
+    return value.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def format_duration(value):
+    return f"PT{int(value.total_seconds() // 60)}M"
+
+
+def iter_event_lines(event, exdates=()):
+    yield "BEGIN:VEVENT"
+    yield f"UID:event-{event.pk}@starostahub"
+    yield f"DTSTAMP:{format_utc_datetime(event.updated_at)}"
+    yield f"DTSTART:{format_local_datetime(event.date, event.time)}"
+    yield f"DURATION:{format_duration(EVENT_DURATION)}"
+    yield f"SUMMARY:{escape_text(event.name)}"
+    if event.url:
+        yield f"DESCRIPTION:{escape_text(event.url)}"
+    if event.recurring and event.recurring_until:
+        # the same last date as the materialized occurrences of the JSON feed
+        until = format_local_datetime(get_last_occurrence_date(event), event.time)
+        yield f"RRULE:FREQ=WEEKLY;UNTIL={until}"
+        for exdate in exdates:
+            yield f"EXDATE:{format_local_datetime(exdate, event.time)}"
+    yield "END:VEVENT"
+
+
+def iter_group_calendar(group, events, cancelled_dates):
+    """
+    Yields the iCalendar document for `group` chunk by chunk, one VEVENT
+    per event. Recurring events are written as RRULEs, never expanded.
+
+    :param events: iterable of active events of the group
+    :param cancelled_dates: dict of event id to a list of cancelled dates
+    """
+    header = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODUCT_ID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape_text(group.name)}",
+    ]
+    yield "".join(fold_line(line) for line in header)
+
+    for event in events:
+        exdates = cancelled_dates.get(event.pk, ())
+        if not (event.recurring and event.recurring_until) and exdates:
+            continue
+        yield "".join(fold_line(line) for line in iter_event_lines(event, exdates))
+
+    yield fold_line("END:VCALENDAR")
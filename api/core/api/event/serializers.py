@@ -2,10 +2,11 @@ from rest_framework import serializers
 
 from core.api.user.serializers import GroupSerializer
 from models.event.models import Event
+from models.event.utils import MAX_RECURRENCE_SPAN
 
 
 class EventSerializer(serializers.ModelSerializer):
-    group = GroupSerializer(read_only=True)
+    group_id = serializers.IntegerField(read_only=True)
     weekday = serializers.IntegerField(read_only=True)
 
     class Meta:
@@ -20,5 +21,58 @@ class EventSerializer(serializers.ModelSerializer):
             "recurring",
             "recurring_until",
             "is_active",
-            "group",
+            "group_id",
         ]
+
+    def validate(self, attrs):
+        # partial updates of other fields leave the schedule alone
+        if {"date", "recurring", "recurring_until"}.isdisjoint(attrs):
+            return attrs
+        date = attrs.get("date", getattr(self.instance, "date", None))
+        recurring_until = attrs.get(
+            "recurring_until", getattr(self.instance, "recurring_until", None)
+        )
+        if date and recurring_until and recurring_until > date + MAX_RECURRENCE_SPAN:
+            raise serializers.ValidationError(
+                {
+                    "recurring_until": "Recurring events can run for at most "
+                    f"{MAX_RECURRENCE_SPAN.days} days."
+                }
+            )
+        return attrs
+
+
+class ExpandedEventSerializer(EventSerializer):
+    """
+    Event with its group embedded, for clients passing `?expand=group`.
+    """
+
+    group = GroupSerializer(read_only=True)
+
+    class Meta(EventSerializer.Meta):
+        fields = EventSerializer.Meta.fields + ["group"]
+
+
+class BulkEventOperationSerializer(serializers.Serializer):
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+
+    op = serializers.ChoiceField(choices=[CREATE, UPDATE, DELETE])
+    id = serializers.IntegerField(required=False)
+    data = serializers.DictField(required=False)
+
+    def validate(self, attrs):
+        if attrs["op"] != self.CREATE and "id" not in attrs:
+            raise serializers.ValidationError({"id": "This field is required."})
+        if attrs["op"] != self.DELETE and "data" not in attrs:
+            raise serializers.ValidationError({"data": "This field is required."})
+        return attrs
+
+
+class BulkEventSerializer(serializers.Serializer):
+    MAX_OPERATIONS = 500
+
+    # each item is validated as an operation on its own, so that errors
+    # are reported per index
+    operations = serializers.ListField(allow_empty=False, max_length=MAX_OPERATIONS)
@@ -0,0 +1,31 @@
+from hashlib import md5
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(*parts):
+    """
+    Builds a strong ETag out of the parts a response version depends on.
+    """
+    value = ":".join(str(part) for part in parts)
+    return quote_etag(md5(value.encode(), usedforsecurity=False).hexdigest())
+
+
+def conditional_response(request, etag, last_modified):
+    """
+    Returns a bodyless 304 response if the client already has this version
+    of the resource, otherwise None.
+
+    :param etag: quoted ETag of the current version
+    :param last_modified: aware datetime of the last change
+    """
+    return get_conditional_response(
+        request, etag=etag, last_modified=int(last_modified.timestamp())
+    )
+
+
+def set_conditional_headers(response, etag, last_modified):
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(int(last_modified.timestamp()))
+    return response
@@ -0,0 +1,86 @@
+import base64
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def keyset_filter(fields, values):
+    """
+    Builds a filter matching rows that come strictly after `values` in the
+    (`fields`) ordering, e.g. (a > x) OR (a = x AND b > y) OR ...
+    """
+    condition = Q()
+    for index, field in enumerate(fields):
+        lookup = {name: value for name, value in zip(fields[:index], values[:index])}
+        lookup[f"{field}__gt"] = values[index]
+        condition |= Q(**lookup)
+    return condition
+
+
+class KeysetPagination:
+    """
+    Cursor pagination over a unique, ascending ordering of model fields.
+
+    The cursor holds the ordering values of the last row on a page, so a
+    page is always one range scan no matter how deep the client goes.
+    """
+
+    cursor_query_param = "cursor"
+    limit_query_param = "limit"
+    max_limit = 100
+
+    def __init__(self, ordering):
+        self.ordering = tuple(ordering)
+        self.next_link = None
+
+    def get_limit(self, request):
+        default_limit = settings.REST_FRAMEWORK.get("PAGE_SIZE", 10)
+        try:
+            limit = int(request.query_params.get(self.limit_query_param, default_limit))
+        except ValueError:
+            raise ValueError(f"Invalid '{self.limit_query_param}', expected a number.")
+        return max(1, min(limit, self.max_limit))
+
+    def encode_cursor(self, values):
+        payload = json.dumps([str(value) for value in values])
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, queryset, cursor):
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if len(values) != len(self.ordering):
+                raise ValueError
+            opts = queryset.model._meta
+            return [
+                opts.get_field(field).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise ValueError("Invalid cursor.")
+
+    def paginate_queryset(self, queryset, request):
+        limit = self.get_limit(request)
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(
+                keyset_filter(self.ordering, self.decode_cursor(queryset, cursor))
+            )
+
+        page = list(queryset.order_by(*self.ordering)[: limit + 1])
+        self.next_link = None
+        if len(page) > limit:
+            page = page[:limit]
+            last = page[-1]
+            url = remove_query_param(request.build_absolute_uri(), self.cursor_query_param)
+            self.next_link = replace_query_param(
+                url,
+                self.cursor_query_param,
+                self.encode_cursor(getattr(last, field) for field in self.ordering),
+            )
+        return page
+
+    def get_paginated_data(self, data):
+        return {"next": self.next_link, "results": data}
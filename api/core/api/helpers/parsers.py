@@ -0,0 +1,37 @@
+import io
+import re
+
+from django.conf import settings
+from rest_framework import parsers
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson reads integers beyond 64 bits as floats; bodies with runs of
+# digits that long (in numbers or not) are left to the stdlib parser
+LONG_NUMBER_RE = re.compile(rb"\d{19}")
+
+
+class FastJSONParser(parsers.JSONParser):
+    """
+    DRF's `JSONParser` that decodes with orjson when it is installed and
+    the body is UTF-8. Bodies that may hold integers over 64 bits, and
+    anything orjson rejects, go to the stdlib parser, so the results, the
+    accepted input and the error messages stay the same.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+
+        content = stream.read()
+        if LONG_NUMBER_RE.search(content):
+            return super().parse(io.BytesIO(content), media_type, parser_context)
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(content), media_type, parser_context)
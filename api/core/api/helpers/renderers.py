@@ -0,0 +1,176 @@
+import json
+import re
+import secrets
+
+from rest_framework import renderers
+from rest_framework.settings import api_settings
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class PreRenderedJSON:
+    """
+    A value already encoded as JSON by `prerender_json`, e.g. a payload
+    cached as bytes. `PreRenderedJSONRenderer` splices it into responses
+    as is instead of encoding it again.
+    """
+
+    __slots__ = ("content",)
+
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def decode(self):
+        return json.loads(self.content)
+
+
+class PreRenderedJSONEncoder(encoders.JSONEncoder):
+    """
+    Encodes every `PreRenderedJSON` as a placeholder string and collects
+    its content in `splices` for the renderer to swap in. Without
+    `splices` (e.g. when indenting) it decodes the content instead.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.splices = None
+        self.nonce = None
+
+    def get_placeholder(self, index):
+        return f"\x00{self.nonce}:{index}\x00"
+
+    def default(self, obj):
+        if isinstance(obj, PreRenderedJSON):
+            if self.splices is None:
+                return obj.decode()
+            self.splices.append(obj.content)
+            return self.get_placeholder(len(self.splices) - 1)
+        return super().default(obj)
+
+
+def splice_json(content: bytes, splices: list, nonce: str) -> bytes:
+    """
+    Replaces the placeholders of `PreRenderedJSONEncoder` in encoded JSON
+    with the pre-rendered contents. The placeholders hold NUL characters,
+    which JSON always escapes, and a per-render nonce, so no string of the
+    data itself can be mistaken for one. All of them are replaced in one
+    pass, so spliced contents are never searched for placeholders.
+    """
+    placeholder = re.compile(
+        rb'"\\u0000' + re.escape(nonce.encode()) + rb':(\d+)\\u0000"'
+    )
+    return placeholder.sub(lambda match: splices[int(match[1])], content)
+
+
+class PreRenderedJSONRenderer(renderers.JSONRenderer):
+    """
+    DRF's `JSONRenderer` that also renders `PreRenderedJSON` values, so a
+    cached payload is sent without being decoded and encoded again. The
+    output is the same as rendering the decoded value.
+    """
+
+    encoder_class = PreRenderedJSONEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+
+        if indent is None:
+            separators = (
+                renderers.SHORT_SEPARATORS if self.compact else renderers.LONG_SEPARATORS
+            )
+        else:
+            separators = renderers.INDENT_SEPARATORS
+
+        encoder = self.encoder_class(
+            indent=indent,
+            ensure_ascii=self.ensure_ascii,
+            allow_nan=not self.strict,
+            separators=separators,
+        )
+        # pre-rendered content is compact, so it is only spliced into
+        # compact output
+        if indent is None:
+            encoder.splices = []
+            encoder.nonce = secrets.token_hex(8)
+
+        ret = encoder.encode(data)
+        # escaped like DRF does, to keep the output a strict javascript subset
+        ret = ret.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029").encode()
+        if encoder.splices:
+            ret = splice_json(ret, encoder.splices, encoder.nonce)
+        return ret
+
+
+class FastJSONRenderer(PreRenderedJSONRenderer):
+    """
+    `PreRenderedJSONRenderer` that encodes with orjson when it is
+    installed, with the same output: dates, times and datetimes go through
+    DRF's encoder rather than orjson's own formats, and U+2028/U+2029 are
+    escaped the same way.
+
+    Indented, ASCII-only or non-compact output, and values orjson cannot
+    encode (e.g. integers over 64 bits), fall back to the stdlib encoder.
+    Floats are written in their shortest form, which may differ from
+    `repr` in the exponent notation, and NaN and infinity as null.
+    """
+
+    options = (
+        orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS if orjson else 0
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        encoder = self.encoder_class()
+        encoder.splices = []
+        encoder.nonce = secrets.token_hex(8)
+        try:
+            ret = orjson.dumps(data, default=encoder.default, option=self.options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
+        if encoder.splices:
+            ret = splice_json(ret, encoder.splices, encoder.nonce)
+        return ret
+
+
+class EventStreamRenderer(renderers.BaseRenderer):
+    """
+    Lets views that stream server-sent events accept `text/event-stream`
+    requests. The stream itself is a `StreamingHttpResponse`; responses
+    rendered by this renderer (errors) are JSON.
+    """
+
+    media_type = "text/event-stream"
+    format = "event-stream"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return FastJSONRenderer().render(data)
+
+
+def prerender_json(data) -> PreRenderedJSON:
+    """
+    Encodes `data` with the API's JSON renderer, so the result can be
+    cached and later spliced into responses by it.
+    """
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    return PreRenderedJSON(renderer.render(data) if data is not None else b"null")
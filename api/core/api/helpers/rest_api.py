@@ -3,18 +3,35 @@ from rest_framework import status
 
 
 def rest_default_response(data=None, message=None, status=status.HTTP_200_OK):
+    """
+    :param data: the payload, may be `PreRenderedJSON` to send cached,
+        already encoded JSON as is
+    """
     return Response(data={"data": data, "message": message}, status=status)
 
 
+def iter_error_messages(field, errors):
+    """
+    Yields the messages of a field's errors, including nested ones: the
+    per-index errors of list fields and the per-key errors of dict fields
+    and nested serializers.
+    """
+    if isinstance(errors, dict):
+        for key, nested_errors in errors.items():
+            yield from iter_error_messages(
+                key if isinstance(key, str) else field, nested_errors
+            )
+    elif isinstance(errors, list):
+        for error in errors:
+            yield from iter_error_messages(field, error)
+    elif "This field" in errors:
+        yield errors.replace("This field", field.capitalize())
+    else:
+        yield str(errors)
+
+
 def normalize_serializer_errors(serializer):
-    errors = []
-    for field, field_errors in serializer.errors.items():
-        for error in field_errors:
-            if "This field" in error:
-                errors.append(error.replace("This field", field.capitalize()))
-            else:
-                errors.append(str(error))
-    return errors
+    return list(iter_error_messages("", serializer.errors))
 
 
 def rest_default_error_response(
@@ -0,0 +1,37 @@
+import json
+import time
+
+
+def format_sse_message(message) -> bytes:
+    """
+    Formats a hub message as a server-sent event whose data is JSON.
+    """
+    return (
+        f"id: {message.id}\n"
+        f"event: {message.event}\n"
+        f"data: {json.dumps(message.data, separators=(',', ':'))}\n\n"
+    ).encode()
+
+
+async def iter_sse(messages, duration, retry):
+    """
+    Streams hub messages as server-sent events, with a comment line for
+    every idle heartbeat (a None message), until `duration` seconds have
+    passed. Clients then reconnect, and authenticate again, with the
+    `Last-Event-ID` they got.
+
+    :param messages: async iterator of hub messages, closed at the end
+    :param retry: milliseconds clients should wait before reconnecting
+    """
+    deadline = time.monotonic() + duration
+    try:
+        yield f"retry: {retry}\n\n".encode()
+        async for message in messages:
+            if message is None:
+                yield b": heartbeat\n\n"
+            else:
+                yield format_sse_message(message)
+            if time.monotonic() >= deadline:
+                break
+    finally:
+        await messages.aclose()
@@ -0,0 +1,184 @@
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from unittest import mock, skipUnless
+
+from django.test import SimpleTestCase
+from django.utils import translation
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from core.api.helpers.renderers import (
+    FastJSONRenderer,
+    PreRenderedJSON,
+    PreRenderedJSONRenderer,
+    orjson,
+    splice_json,
+)
+from core.api.helpers.rest_api import normalize_serializer_errors
+
+
+class ItemSerializer(serializers.Serializer):
+    name = serializers.CharField()
+
+
+class NestedSerializer(serializers.Serializer):
+    title = serializers.CharField()
+    tags = serializers.ListField(child=serializers.IntegerField())
+    options = serializers.DictField(child=serializers.IntegerField())
+    items = ItemSerializer(many=True)
+
+
+class NormalizeSerializerErrorsTestCase(SimpleTestCase):
+    def setUp(self):
+        # the field name replaces "This field" of the English messages
+        translation.activate("en")
+        self.addCleanup(translation.deactivate)
+
+    def test_field_errors_name_the_field(self):
+        serializer = NestedSerializer(data={})
+        serializer.is_valid()
+
+        self.assertIn("Title is required.", normalize_serializer_errors(serializer))
+
+    def test_nested_errors_are_flattened(self):
+        serializer = NestedSerializer(
+            data={
+                "title": "Timetable",
+                "tags": [1, "x"],
+                "options": {"limit": "x"},
+                "items": [{"name": "Lecture"}, {}],
+            }
+        )
+        serializer.is_valid()
+
+        errors = normalize_serializer_errors(serializer)
+
+        self.assertEqual(len(errors), 3)
+        self.assertIn("Name is required.", errors)
+        self.assertTrue(all(isinstance(error, str) for error in errors))
+
+
+NONCE = "0123456789abcdef"
+# a string that encodes the same as the first placeholder of a render
+# with NONCE
+PLACEHOLDER = f"\x00{NONCE}:0\x00"
+
+ROSTER = {
+    "name": "Група КН-21",
+    "students": [{"id": 1, "full_name": "Бондар Іван"}, {"id": 2, "email": None}],
+    "count": 2,
+}
+
+
+class PreRenderedJSONTestCase(SimpleTestCase):
+    renderer_class = PreRenderedJSONRenderer
+
+    def render(self, data):
+        return self.renderer_class().render(data)
+
+    def prerender(self, data):
+        return PreRenderedJSON(self.renderer_class().render(data))
+
+    def assertRendersAs(self, data, decoded):
+        self.assertEqual(self.render(data), JSONRenderer().render(decoded))
+
+    def test_envelope(self):
+        self.assertRendersAs(
+            {"data": self.prerender(ROSTER), "message": None},
+            {"data": ROSTER, "message": None},
+        )
+
+    def test_several_splices(self):
+        first, second = {"id": 1}, [1, "two", None]
+        self.assertRendersAs(
+            [self.prerender(first), "x", {"next": self.prerender(second)}],
+            [first, "x", {"next": second}],
+        )
+
+    def test_strings_that_look_like_placeholders(self):
+        data = {"name": PLACEHOLDER, "tags": [f"\x00{NONCE}:1\x00", "\\u0000"]}
+        self.assertRendersAs(
+            {"data": self.prerender(data), "message": PLACEHOLDER[:-1]},
+            {"data": data, "message": PLACEHOLDER[:-1]},
+        )
+
+    def test_spliced_placeholders_of_the_same_render_are_kept(self):
+        # spliced contents that hold the live placeholders, as if the nonce
+        # were guessed, are not spliced into themselves
+        first = {"name": f"\x00{NONCE}:1\x00"}
+        second = {"name": PLACEHOLDER}
+        data = [self.prerender(first), self.prerender(second)]
+
+        with mock.patch(
+            "core.api.helpers.renderers.secrets.token_hex", return_value=NONCE
+        ):
+            content = self.render(data)
+
+        self.assertEqual(content, JSONRenderer().render([first, second]))
+
+    def test_indented_output_decodes_the_content(self):
+        data = {"data": self.prerender(ROSTER), "message": None}
+        self.assertEqual(
+            self.renderer_class().render(data, "application/json; indent=2", {}),
+            JSONRenderer().render(
+                {"data": ROSTER, "message": None}, "application/json; indent=2", {}
+            ),
+        )
+
+    def test_splice_json(self):
+        content = f'[1,"\\u0000{NONCE}:0\\u0000",{{"a":"\\u0000{NONCE}:1\\u0000"}}]'
+
+        self.assertEqual(
+            splice_json(content.encode(), [b'{"b":2}', b"null"], NONCE),
+            b'[1,{"b":2},{"a":null}]',
+        )
+
+
+@skipUnless(orjson, "orjson is not installed")
+class FastJSONRendererTestCase(PreRenderedJSONTestCase):
+    """
+    Runs the splicing tests with orjson too, and checks that it renders
+    the same bytes as DRF's renderer.
+    """
+
+    renderer_class = FastJSONRenderer
+
+    def test_types_encoded_by_drf(self):
+        values = {
+            "date": date(2030, 1, 7),
+            "time": time(8, 30),
+            "time_with_microseconds": time(8, 30, 15, 123456),
+            "datetime": datetime(2030, 1, 7, 8, 30, tzinfo=timezone.utc),
+            "datetime_with_microseconds": datetime(
+                2030, 1, 7, 8, 30, 15, 123456, tzinfo=timezone.utc
+            ),
+            "naive_datetime": datetime(2030, 1, 7, 8, 30),
+            "offset_datetime": datetime(
+                2030, 1, 7, 8, 30, tzinfo=timezone(timedelta(hours=2))
+            ),
+            "timedelta": timedelta(hours=1, minutes=30),
+            "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "decimal": Decimal("12.50"),
+            "integer_decimal": Decimal("3"),
+            "float": 0.1,
+            "tuple": (1, "two"),
+            "unicode": "Група КН-21",
+            "line_separators": f"a{chr(0x2028)}b{chr(0x2029)}c",
+            "int_keys": {1: "one", 2: "two"},
+        }
+        for name, value in values.items():
+            with self.subTest(name):
+                data = {"data": {name: value}, "message": None}
+                self.assertEqual(self.render(data), JSONRenderer().render(data))
+
+    def test_values_orjson_cannot_encode_fall_back(self):
+        data = {"data": {"big": 2**70}, "message": None}
+        self.assertEqual(self.render(data), JSONRenderer().render(data))
+
+    def test_spliced_stdlib_payload(self):
+        # payloads cached before orjson was installed are spliced as well
+        cached = PreRenderedJSON(PreRenderedJSONRenderer().render(ROSTER))
+        self.assertRendersAs(
+            {"data": cached, "message": None}, {"data": ROSTER, "message": None}
+        )
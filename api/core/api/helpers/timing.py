@@ -0,0 +1,56 @@
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.utils.deprecation import MiddlewareMixin
+
+
+def add_server_timing(request, name, duration, description=None):
+    """
+    Records a metric to report in the `Server-Timing` header.
+
+    :param request: the Django request (`request._request` of a DRF one)
+    :param duration: seconds
+    """
+    timings = request.__dict__.setdefault("_server_timings", [])
+    timings.append((name, duration, description))
+
+
+@contextmanager
+def server_timing(request, name, description=None):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_server_timing(request, name, time.perf_counter() - start, description)
+
+
+def format_server_timing(timings):
+    metrics = []
+    for name, duration, description in timings:
+        metric = f"{name};dur={duration * 1000:.3f}"
+        if description:
+            metric += f';desc="{description}"'
+        metrics.append(metric)
+    return ", ".join(metrics)
+
+
+class ServerTimingMiddleware(MiddlewareMixin):
+    """
+    Adds the metrics recorded with `server_timing` to the response as a
+    `Server-Timing` header, together with the total time of the request.
+    Enabled by `SERVER_TIMING`.
+    """
+
+    def process_request(self, request):
+        if settings.SERVER_TIMING:
+            request._server_timing_start = time.perf_counter()
+
+    def process_response(self, request, response):
+        start = getattr(request, "_server_timing_start", None)
+        if start is None:
+            return response
+        timings = request.__dict__.get("_server_timings", [])
+        timings.append(("total", time.perf_counter() - start, None))
+        response["Server-Timing"] = format_server_timing(timings)
+        return response
@@ -0,0 +1,68 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView whose handlers may be coroutines.
+
+    Authentication, permission and throttle checks still run the regular
+    synchronous DRF code, in a worker thread, before the handler is
+    awaited on the event loop. Handlers must use the async ORM (or
+    `sync_to_async`) for database access, and `acheck_object_permissions`
+    for object permissions.
+
+    Django does not allow a view to mix sync and async handlers, so every
+    handler of a subclass has to be a coroutine; sync ones can be wrapped
+    in `sync_to_async`.
+    """
+
+    async def acheck_object_permissions(self, request, obj):
+        """
+        Async `check_object_permissions`. Permissions with an
+        `ahas_object_permission` coroutine are awaited, the others run in
+        a worker thread.
+        """
+        for permission in self.get_permissions():
+            if hasattr(permission, "ahas_object_permission"):
+                allowed = await permission.ahas_object_permission(request, self, obj)
+            else:
+                allowed = await sync_to_async(permission.has_object_permission)(
+                    request, self, obj
+                )
+            if not allowed:
+                self.permission_denied(
+                    request,
+                    message=getattr(permission, "message", None),
+                    code=getattr(permission, "code", None),
+                )
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+        except Exception as exc:
+            # the exception handler rolls back the database connections, so
+            # it has to run in the thread that owns them
+            response = await sync_to_async(self.handle_exception)(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
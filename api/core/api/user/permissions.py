@@ -15,5 +15,21 @@ class IsStarostaOrStudentInGroup(BasePermission):
         return (
             request.user
             and request.user.is_authenticated
-            and (request.user.group.pk == obj.pk or request.user.is_superuser)
+            and (request.user.group_pk == obj.pk or request.user.is_superuser)
         )
+
+    async def ahas_object_permission(self, request, view, obj):
+        user = request.user
+        if not (user and user.is_authenticated):
+            return False
+        return user.is_superuser or await user.aget_group_pk() == obj.pk
+
+
+def check_starosta(view, request):
+    """
+    Denies the request unless the user may manage groups. For handlers of
+    views that also let students read: DRF's `permission_classes`
+    decorator only applies to function views, not to APIView methods.
+    """
+    if not IsStarosta().has_permission(request, view):
+        view.permission_denied(request)
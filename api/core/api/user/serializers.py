@@ -23,7 +23,7 @@ class GroupSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Group
-        fields = ["id", "name", "starosta", "students"]
+        fields = ["id", "name", "starosta", "students", "calendar_token"]
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -43,6 +43,9 @@ class UserSerializer(serializers.ModelSerializer):
         ]
 
     def get_group(self, obj):
+        # views that already have the (cached) group payload pass it in
+        if "group_data" in self.context:
+            return self.context["group_data"]
         return GroupSerializer(obj.group, context=self.context).data
 
 
@@ -0,0 +1,544 @@
+from datetime import date, time, timedelta
+
+from django.core.cache import caches
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.api.auth.authentication import get_refresh_token
+from models.event.models import Event, EventOccurrence
+from models.user.cache import get_auth_user_cache
+from models.user.choices import UserRoleChoices
+from models.user.models import User, Group
+
+
+class APITestCase(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        get_auth_user_cache().clear()
+        self.starosta = User.objects.create(
+            email="starosta@example.com",
+            first_name="Olena",
+            last_name="Koval",
+            role=UserRoleChoices.STAROSTA,
+        )
+        self.group = Group.objects.get(starosta=self.starosta)
+
+    def get_client(self, user):
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {get_refresh_token(user).access_token}"
+        )
+        return client
+
+    def add_students(self, count):
+        students = [
+            User.objects.create(
+                email=f"student{index}@example.com",
+                first_name="Student",
+                last_name=str(index),
+            )
+            for index in range(count)
+        ]
+        self.group.students.add(*students)
+        return students
+
+    def add_events(self, count):
+        return [
+            Event.objects.create(
+                group=self.group,
+                name=f"Lecture {index}",
+                url="https://meet.example.com",
+                date=date(2030, 1, 7),
+                time=time(8 + index % 10, index % 60),
+            )
+            for index in range(count)
+        ]
+
+
+class GroupEventsTestCase(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.students = self.add_students(30)
+        self.add_events(10)
+        self.client = self.get_client(self.starosta)
+        self.url = f"/api/user/groups/{self.group.pk}/events?from=2030-01-01"
+
+    def test_events_sideload_the_group_once(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertEqual(len(data["results"]), 10)
+        for event in data["results"]:
+            self.assertEqual(event["group_id"], self.group.pk)
+            self.assertNotIn("group", event)
+        self.assertEqual(
+            [group["id"] for group in data["included"]["groups"]], [self.group.pk]
+        )
+        self.assertEqual(response.content.count(self.students[0].email.encode()), 1)
+
+    def test_expanded_events_embed_the_group(self):
+        response = self.client.get(f"{self.url}&expand=group")
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertNotIn("included", data)
+        for event in data["results"]:
+            self.assertEqual(event["group"]["id"], self.group.pk)
+
+    def test_payload_size_does_not_grow_with_roster_per_event(self):
+        size = len(self.client.get(self.url).content)
+        self.add_students(30)
+        caches["default"].clear()
+
+        grown = len(self.client.get(self.url).content)
+
+        # the roster is sent once: 30 more students add about 30 members'
+        # worth of bytes, not 30 per event
+        self.assertLess(grown - size, 30 * 250)
+        self.assertLess(size, 12 * 1024)
+
+    def test_deleted_event_is_not_answered_with_304(self):
+        old, recent = self.add_events(2)[:2]
+        an_hour_ago = timezone.now() - timedelta(hours=1)
+        Event.objects.update(updated_at=an_hour_ago)
+        Event.objects.filter(pk=recent.pk).update(
+            updated_at=an_hour_ago + timedelta(minutes=1)
+        )
+        EventOccurrence.objects.update(updated_at=an_hour_ago)
+        Group.objects.filter(pk=self.group.pk).update(updated_at=an_hour_ago)
+        last_modified = self.client.get(self.url)["Last-Modified"]
+
+        old.delete()
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, 200)
+        ids = [event["id"] for event in response.json()["data"]["results"]]
+        self.assertNotIn(old.pk, ids)
+        self.assertIn(recent.pk, ids)
+
+    def test_query_count(self):
+        # authentication is cached after the first request
+        self.client.get(self.url)
+        caches["default"].clear()
+
+        with self.assertNumQueries(4):
+            self.client.get(self.url)
+        self.add_students(30)
+        self.add_events(10)
+        caches["default"].clear()
+        with self.assertNumQueries(4):
+            self.client.get(self.url)
+        # cached payload
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+
+
+class EventsPaginationTestCase(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = self.get_client(self.starosta)
+        self.url = f"/api/user/groups/{self.group.pk}/events"
+
+    def create_events(self, count, event_date, event_time):
+        return [
+            Event.objects.create(
+                group=self.group,
+                name=f"Lecture {index}",
+                url="https://meet.example.com",
+                date=event_date,
+                time=event_time,
+            )
+            for index in range(count)
+        ]
+
+    def get_all_pages(self, url):
+        results, pages = [], 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, response.content)
+            data = response.json()["data"]
+            results.extend(data["results"])
+            url = data["next"]
+            pages += 1
+        return results, pages
+
+    def test_pages_split_rows_with_equal_date_and_time(self):
+        same = self.create_events(7, date(2030, 1, 7), time(10))
+        earlier = self.create_events(2, date(2030, 1, 7), time(8))
+        later = self.create_events(2, date(2030, 1, 8), time(8))
+
+        results, pages = self.get_all_pages(f"{self.url}?from=2030-01-01&limit=3")
+
+        self.assertEqual(pages, 4)
+        self.assertEqual(
+            [event["id"] for event in results],
+            [event.pk for event in earlier + same + later],
+        )
+
+    def test_next_link_keeps_the_window(self):
+        self.create_events(3, date(2030, 1, 7), time(10))
+        self.create_events(3, date(2030, 2, 7), time(10))
+
+        response = self.client.get(f"{self.url}?from=2030-01-01&to=2030-01-31&limit=2")
+        next_url = response.json()["data"]["next"]
+        self.assertIn("to=2030-01-31", next_url)
+
+        results, _ = self.get_all_pages(next_url)
+        self.assertEqual([event["date"] for event in results], ["2030-01-07"])
+
+    def test_invalid_cursor(self):
+        for cursor in ["x", "WyJhIl0=", "WyIyMDMwLTAxLTA3IiwgIngiLCAiMSJd"]:
+            with self.subTest(cursor=cursor):
+                response = self.client.get(f"{self.url}?cursor={cursor}")
+
+                self.assertEqual(response.status_code, 400, response.content)
+
+
+class GroupCalendarTestCase(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = (
+            f"/api/user/groups/{self.group.pk}/calendar.ics"
+            f"?token={self.group.calendar_token}"
+        )
+
+    def test_deleted_event_is_not_answered_with_304(self):
+        old, recent = self.add_events(2)
+        # the deleted event is not the most recently updated one
+        an_hour_ago = timezone.now() - timedelta(hours=1)
+        Event.objects.filter(pk=old.pk).update(updated_at=an_hour_ago)
+        Event.objects.filter(pk=recent.pk).update(
+            updated_at=an_hour_ago + timedelta(minutes=1)
+        )
+        EventOccurrence.objects.update(updated_at=an_hour_ago)
+        Group.objects.filter(pk=self.group.pk).update(updated_at=an_hour_ago)
+        last_modified = self.client.get(self.url)["Last-Modified"]
+
+        old.delete()
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, 200)
+        content = b"".join(response.streaming_content)
+        self.assertNotIn(f"UID:event-{old.pk}@".encode(), content)
+        self.assertIn(f"UID:event-{recent.pk}@".encode(), content)
+
+    def test_unchanged_calendar_is_answered_with_304(self):
+        self.add_events(2)
+        last_modified = self.client.get(self.url)["Last-Modified"]
+
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_rrule_ends_on_the_last_occurrence(self):
+        Event.objects.create(
+            group=self.group,
+            name="Lecture",
+            url="https://meet.example.com",
+            date=date(2020, 1, 6),
+            time=time(10),
+            recurring=True,
+            recurring_until=date(2031, 1, 1),
+        )
+        event = Event.objects.create(
+            group=self.group,
+            name="Seminar",
+            url="https://meet.example.com",
+            date=date(2030, 1, 7),
+            time=time(12),
+            recurring=True,
+            # ends before it starts, so it only happens once
+            recurring_until=date(2029, 1, 1),
+        )
+
+        content = b"".join(self.client.get(self.url).streaming_content)
+
+        self.assertIn(b"RRULE:FREQ=WEEKLY;UNTIL=20310101T100000", content)
+        self.assertIn(b"RRULE:FREQ=WEEKLY;UNTIL=20300107T120000", content)
+        self.assertEqual(event.occurrences.count(), 1)
+
+
+class GroupEventsBulkTestCase(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = self.get_client(self.starosta)
+        self.url = f"/api/user/groups/{self.group.pk}/events/bulk"
+        self.event_data = {
+            "name": "Lecture",
+            "url": "https://meet.example.com",
+            "date": "2030-01-07",
+            "time": "10:00",
+        }
+
+    def test_operations_are_applied(self):
+        (event,) = self.add_events(1)
+
+        response = self.client.post(
+            self.url,
+            {
+                "operations": [
+                    {"op": "create", "data": self.event_data},
+                    {"op": "update", "id": event.pk, "data": {"name": "Seminar"}},
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(Event.objects.filter(group=self.group).count(), 2)
+        event.refresh_from_db()
+        self.assertEqual(event.name, "Seminar")
+
+    def test_invalid_items_are_reported_per_index(self):
+        for item in ["create", 1, None, ["create"]]:
+            with self.subTest(item=item):
+                response = self.client.post(
+                    self.url,
+                    {"operations": [{"op": "create", "data": self.event_data}, item]},
+                    format="json",
+                )
+
+                self.assertEqual(response.status_code, 400, response.content)
+                first, second = response.json()["data"]
+                self.assertNotIn("errors", first)
+                self.assertEqual(second["index"], 1)
+                self.assertTrue(second["errors"])
+        self.assertFalse(Event.objects.exists())
+
+    def test_invalid_operation_data_is_reported(self):
+        response = self.client.post(
+            self.url,
+            {"operations": [{"op": "create", "data": "Lecture"}]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 400, response.content)
+        self.assertTrue(response.json()["data"][0]["errors"])
+
+    def test_operations_must_be_a_list(self):
+        for operations in ["create", {"op": "create"}, []]:
+            with self.subTest(operations=operations):
+                response = self.client.post(
+                    self.url, {"operations": operations}, format="json"
+                )
+
+                self.assertEqual(response.status_code, 400, response.content)
+                self.assertTrue(response.json()["data"]["errors"])
+
+
+class QueryCountTestCase(APITestCase):
+    # queries of a request whose user is already cached by authentication
+    # and whose payload is not cached yet
+    QUERIES = {
+        "/api/user/your-group": 3,
+        "/api/user/groups/{pk}": 3,
+        "/api/user/profile": 3,
+        "/api/user/groups/{pk}/events": 4,
+    }
+
+    def setUp(self):
+        super().setUp()
+        self.students = self.add_students(20)
+        self.add_events(5)
+
+    def get_urls(self):
+        return {url.format(pk=self.group.pk): count for url, count in self.QUERIES.items()}
+
+    def assertQueryCounts(self, user):
+        client = self.get_client(user)
+        for url, count in self.get_urls().items():
+            with self.subTest(url=url):
+                client.get(url)
+                caches["default"].clear()
+                with self.assertNumQueries(count):
+                    self.assertEqual(client.get(url).status_code, 200)
+                # the cached payload only needs the group row
+                with self.assertNumQueries(1):
+                    client.get(url)
+
+    def test_starosta_endpoints(self):
+        self.assertQueryCounts(self.starosta)
+
+    def test_student_endpoints(self):
+        self.assertQueryCounts(self.students[0])
+
+    def test_query_count_does_not_grow_with_roster(self):
+        self.add_students(100)
+        self.assertQueryCounts(self.starosta)
+
+    def test_authentication_resolves_the_group_once(self):
+        client = self.get_client(self.starosta)
+        for url, count in self.get_urls().items():
+            with self.subTest(url=url):
+                caches["default"].clear()
+                get_auth_user_cache().clear()
+                # the user and their group id
+                with self.assertNumQueries(count + 2):
+                    client.get(url)
+
+    def test_available_students(self):
+        client = self.get_client(self.starosta)
+        client.get("/api/user/available-students")
+
+        with self.assertNumQueries(1):
+            response = client.get("/api/user/available-students?q=stud")
+        self.assertEqual(response.status_code, 200)
+
+
+class GroupUpdateTestCase(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.students = self.add_students(3)
+        self.url = f"/api/user/groups/{self.group.pk}"
+
+    def get_roster(self):
+        return set(self.group.students.values_list("pk", flat=True))
+
+    def patch(self, user, data):
+        return self.get_client(user).patch(self.url, data, format="json")
+
+    def test_starosta_sets_the_roster(self):
+        others = self.add_students(2)
+
+        response = self.patch(
+            self.starosta, {"set_students": [self.students[0].pk, others[0].pk]}
+        )
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self.get_roster(), {self.students[0].pk, others[0].pk})
+
+    def test_students_cannot_change_the_roster(self):
+        for data in [
+            {"set_students": [self.students[0].pk]},
+            {"remove_students": [self.students[1].pk]},
+            {"name": "Renamed"},
+        ]:
+            with self.subTest(data=data):
+                response = self.patch(self.students[0], data)
+
+                self.assertEqual(response.status_code, 403, response.content)
+                self.assertEqual(
+                    self.get_roster(), {student.pk for student in self.students}
+                )
+
+    def test_invalid_ids_change_nothing(self):
+        (other,) = self.add_students(1)
+        self.group.students.remove(other)
+
+        response = self.patch(
+            self.starosta,
+            {
+                "set_students": [other.pk, 999999, "x", self.starosta.pk],
+                "name": "Renamed",
+            },
+        )
+
+        self.assertEqual(response.status_code, 400, response.content)
+        # values that are not ids first, then the unknown ids in order
+        self.assertEqual(
+            response.json()["data"]["errors"],
+            [
+                "Student x not found.",
+                f"Student {self.starosta.pk} not found.",
+                "Student 999999 not found.",
+            ],
+        )
+        self.assertEqual(self.get_roster(), {student.pk for student in self.students})
+        self.group.refresh_from_db()
+        self.assertNotEqual(self.group.name, "Renamed")
+
+    def test_students_cannot_change_events(self):
+        (event,) = self.add_events(1)
+        client = self.get_client(self.students[0])
+        url = f"{self.url}/events"
+        event_data = {
+            "name": "Lecture",
+            "url": "https://meet.example.com",
+            "date": "2030-01-07",
+            "time": "10:00",
+        }
+
+        for response in [
+            client.post(url, event_data, format="json"),
+            client.patch(f"{url}/{event.pk}", {"name": "Seminar"}, format="json"),
+            client.delete(f"{url}/{event.pk}"),
+        ]:
+            self.assertEqual(response.status_code, 403, response.content)
+        self.assertEqual(Event.objects.get().name, event.name)
+
+
+class AvailableStudentsTestCase(APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = self.get_client(self.starosta)
+        self.url = "/api/user/available-students"
+
+    def test_lists_matching_students_without_a_group(self):
+        grouped = User.objects.create(
+            email="anna.grouped@example.com", first_name="Anna", last_name="Bilyk"
+        )
+        self.group.students.add(grouped)
+        free = [
+            User.objects.create(
+                email=f"anna{index}@example.com",
+                first_name="Anna",
+                last_name=f"Shevchenko{index}",
+            )
+            for index in range(3)
+        ]
+        User.objects.create(
+            email="ivan@example.com", first_name="Ivan", last_name="Anneko"
+        )
+
+        results, url = [], f"{self.url}?q=ANNA&limit=2"
+        while url:
+            data = self.client.get(url).json()["data"]
+            results.extend(user["id"] for user in data["results"])
+            url = data["next"]
+
+        self.assertEqual(results, [user.pk for user in free])
+
+    def test_students_cannot_search(self):
+        (student,) = self.add_students(1)
+
+        response = self.get_client(student).get(f"{self.url}?q=a")
+
+        self.assertEqual(response.status_code, 403)
+
+
+class UserGroupTestCase(APITestCase):
+    def test_group_is_resolved_once(self):
+        user = User.objects.get(pk=self.starosta.pk)
+
+        with self.assertNumQueries(2):
+            self.assertEqual(user.group, self.group)
+            self.assertEqual(user.group_pk, self.group.pk)
+            user.students
+
+    def test_group_pk_does_not_load_the_group(self):
+        user = User.objects.get(pk=self.starosta.pk)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(user.group_pk, self.group.pk)
+            self.assertEqual(user.group_pk, self.group.pk)
+
+    def test_resolving_a_group_never_creates_one(self):
+        self.group.delete()
+        user = User.objects.get(pk=self.starosta.pk)
+
+        self.assertIsNone(user.group)
+        self.assertIsNone(user.group_pk)
+        self.assertFalse(Group.objects.filter(starosta=self.starosta).exists())
+
+    def test_starosta_group_is_created_with_the_starosta(self):
+        student = User.objects.create(
+            email="student@example.com", first_name="Ivan", last_name="Bondar"
+        )
+        self.assertFalse(Group.objects.filter(starosta=student).exists())
+
+        student.role = UserRoleChoices.STAROSTA
+        student.save()
+
+        self.assertTrue(Group.objects.filter(starosta=student).exists())
@@ -6,9 +6,13 @@ from core.api.user.views import (
     AvailableStudentsListAPIView,
     GroupAPIView,
     UserInviteAPIView,
+    GroupRosterImportAPIView,
     YourGroupAPIView,
     GroupEventsAPIView,
+    GroupEventsBulkAPIView,
     GroupEventAPIView,
+    GroupCalendarView,
+    GroupStreamAPIView,
 )
 
 
@@ -23,7 +27,27 @@ urlpatterns = [
     path("your-group", YourGroupAPIView.as_view(), name="your-group"),
     path("groups/<int:pk>", GroupAPIView.as_view(), name="group"),
     path("groups/<int:pk>/invite", UserInviteAPIView.as_view(), name="group-invite"),
+    path(
+        "groups/<int:pk>/invite/import",
+        GroupRosterImportAPIView.as_view(),
+        name="group-invite-import",
+    ),
     path("groups/<int:pk>/events", GroupEventsAPIView.as_view(), name="group-events"),
+    path(
+        "groups/<int:pk>/events/bulk",
+        GroupEventsBulkAPIView.as_view(),
+        name="group-events-bulk",
+    ),
+    path(
+        "groups/<int:pk>/calendar.ics",
+        GroupCalendarView.as_view(),
+        name="group-calendar",
+    ),
+    path(
+        "groups/<int:pk>/stream",
+        GroupStreamAPIView.as_view(),
+        name="group-stream",
+    ),
     path(
         "groups/<int:pk>/events/<int:event_id>",
         GroupEventAPIView.as_view(),
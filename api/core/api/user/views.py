@@ -1,16 +1,48 @@
-from datetime import timedelta
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.http import Http404, StreamingHttpResponse
 from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+from django.utils.dateparse import parse_date
+from django.views import View
 
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.generics import ListAPIView
-from rest_framework.decorators import permission_classes as permission_classes_decorator
 
-from models.user.models import User, Group
+from models.user.models import (
+    User,
+    Group,
+    GROUP_MEMBER_FIELDS,
+    prefetch_group_members,
+)
+from models.common.cache import get_payload_cache
+from models.common.pubsub import get_hub
 from models.user.choices import UserRoleChoices
-from models.user.utils import create_user_invite
-from models.event.models import Event
+from models.user.roster import (
+    RosterError,
+    RosterRowStatus,
+    import_roster,
+    iter_roster_rows,
+)
+from models.user.utils import (
+    create_user_invite,
+    get_group_channel,
+    search_users,
+    update_group_members,
+)
+from models.event.models import Event, EventOccurrence
+from models.event.utils import (
+    build_occurrence,
+    apply_event_changes,
+    annotate_schedule_version,
+    get_schedule_last_modified,
+)
 
 from core.api.user.serializers import (
     UserSerializer,
@@ -19,9 +51,79 @@ from core.api.user.serializers import (
     UserInviteSerializer,
     CreateUserInviteSerializer,
 )
-from core.api.event.serializers import EventSerializer
-from core.api.user.permissions import IsStarosta, IsStarostaOrStudentInGroup
-from core.api.helpers.rest_api import rest_default_response, rest_default_error_response
+from core.api.event.calendar import iter_group_calendar
+from core.api.event.serializers import (
+    EventSerializer,
+    ExpandedEventSerializer,
+    BulkEventSerializer,
+    BulkEventOperationSerializer,
+)
+from core.api.user.permissions import (
+    IsStarosta,
+    IsStarostaOrStudentInGroup,
+    check_starosta,
+)
+from core.api.helpers.conditional import (
+    make_etag,
+    conditional_response,
+    set_conditional_headers,
+)
+from core.api.helpers.pagination import KeysetPagination
+from core.api.helpers.renderers import (
+    EventStreamRenderer,
+    FastJSONRenderer,
+    prerender_json,
+)
+from core.api.helpers.sse import iter_sse
+from core.api.helpers.views import AsyncAPIView
+from core.api.helpers.rest_api import (
+    rest_default_response,
+    rest_default_error_response,
+    normalize_serializer_errors,
+)
+
+
+def parse_date_param(request, name):
+    value = request.query_params.get(name)
+    if not value:
+        return None
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValueError(f"Invalid '{name}' date, expected YYYY-MM-DD.")
+    return parsed
+
+
+def parse_last_event_id(request):
+    """
+    The id of the last server-sent event a reconnecting client got, from
+    the `Last-Event-ID` header or, for clients that cannot set it, the
+    `last_event_id` query param.
+    """
+    value = request.headers.get("Last-Event-ID") or request.query_params.get(
+        "last_event_id"
+    )
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def get_group_data(group):
+    """
+    Returns the serialized `group` as pre-rendered JSON, cached per group
+    version.
+    """
+
+    def build():
+        prefetch_group_members([group])
+        return prerender_json(GroupSerializer(group).data)
+
+    return get_payload_cache().get_or_build(
+        "group", build, [("group", group.pk)], [group.updated_at.isoformat()]
+    )
 
 
 class UserRolesAPIView(APIView):
@@ -33,16 +135,29 @@ class UserRolesAPIView(APIView):
         )
 
 
-class UserProfileAPIView(APIView):
+class UserProfileAPIView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = UserSerializer
 
-    def get(self, request):
-        return rest_default_response(
-            data=UserSerializer(request.user).data, status=status.HTTP_200_OK
-        )
+    async def get(self, request):
+        group_pk = await request.user.aget_group_pk()
+        group = None
+        if group_pk:
+            group = await Group.objects.alive().filter(pk=group_pk).afirst()
+        if group:
+            group_data = await sync_to_async(get_group_data)(group)
+        else:
+            group_data = GroupSerializer(None).data
+        serializer = UserSerializer(request.user, context={"group_data": group_data})
+        return rest_default_response(data=serializer.data, status=status.HTTP_200_OK)
+
+    async def patch(self, request):
+        return await sync_to_async(self.partial_update)(request)
+
+    async def delete(self, request):
+        return await sync_to_async(self.destroy)(request)
 
-    def patch(self, request):
+    def partial_update(self, request):
         serializer = UserSerializer(request.user, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
@@ -53,7 +168,7 @@ class UserProfileAPIView(APIView):
             serializer, status=status.HTTP_400_BAD_REQUEST
         )
 
-    def delete(self, request):
+    def destroy(self, request):
         request.user.delete()
         return rest_default_response(status=status.HTTP_204_NO_CONTENT)
 
@@ -65,54 +180,83 @@ class AvailableStudentsListAPIView(ListAPIView):
     def get_queryset(self):
         students = User.objects.filter(
             role=UserRoleChoices.STUDENT, students_group__isnull=True, is_active=True
-        )
-        return students
+        ).only(*GROUP_MEMBER_FIELDS, "search_name")
+        return search_users(students, self.request.query_params.get("q"))
 
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        serializer = self.serializer_class(queryset, many=True)
-        return rest_default_response(data=serializer.data, status=status.HTTP_200_OK)
+        paginator = KeysetPagination(ordering=("search_name", "id"))
+        try:
+            page = paginator.paginate_queryset(self.get_queryset(), request)
+        except ValueError as e:
+            return rest_default_error_response(
+                data=str(e), status=status.HTTP_400_BAD_REQUEST
+            )
+
+        serializer = self.serializer_class(page, many=True)
+        return rest_default_response(
+            data=paginator.get_paginated_data(serializer.data),
+            status=status.HTTP_200_OK,
+        )
 
 
-class YourGroupAPIView(APIView):
+class YourGroupAPIView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = GroupSerializer
 
-    def get(self, request):
-        if not request.user.group:
+    async def get(self, request):
+        # only the group row; the members come with the cached payload
+        group_pk = await request.user.aget_group_pk()
+        group = None
+        if group_pk:
+            group = await Group.objects.alive().filter(pk=group_pk).afirst()
+        if not group:
             return rest_default_error_response(
                 data="You are not in a group", status=status.HTTP_404_NOT_FOUND
             )
-        return rest_default_response(
-            data=GroupSerializer(request.user.group).data, status=status.HTTP_200_OK
-        )
 
+        etag = make_etag("group", group.pk, group.updated_at.isoformat())
+        not_modified = conditional_response(request, etag, group.updated_at)
+        if not_modified is not None:
+            return set_conditional_headers(not_modified, etag, group.updated_at)
+
+        data = await sync_to_async(get_group_data)(group)
+        response = rest_default_response(data=data, status=status.HTTP_200_OK)
+        return set_conditional_headers(response, etag, group.updated_at)
 
-class GroupAPIView(APIView):
+
+class GroupAPIView(AsyncAPIView):
     permission_classes = [IsStarostaOrStudentInGroup]
     serializer_class = GroupSerializer
 
     def get_object(self, pk):
         try:
-            return Group.objects.get(pk=pk)
+            return Group.objects.alive().get(pk=pk)
         except Group.DoesNotExist:
             return None
 
-    def get(self, request, pk):
-        group = self.get_object(pk)
+    async def get(self, request, pk):
+        group = await Group.objects.alive().filter(pk=pk).afirst()
         if not group:
             return rest_default_error_response(
                 data="Group not found", status=status.HTTP_404_NOT_FOUND
             )
 
-        self.check_object_permissions(request, group)
+        await self.acheck_object_permissions(request, group)
 
-        return rest_default_response(
-            data=GroupSerializer(group).data, status=status.HTTP_200_OK
-        )
+        etag = make_etag("group", group.pk, group.updated_at.isoformat())
+        not_modified = conditional_response(request, etag, group.updated_at)
+        if not_modified is not None:
+            return set_conditional_headers(not_modified, etag, group.updated_at)
+
+        data = await sync_to_async(get_group_data)(group)
+        response = rest_default_response(data=data, status=status.HTTP_200_OK)
+        return set_conditional_headers(response, etag, group.updated_at)
 
-    @permission_classes_decorator([IsStarosta, IsStarostaOrStudentInGroup])
-    def patch(self, request, pk):
+    async def patch(self, request, pk):
+        return await sync_to_async(self.partial_update)(request, pk)
+
+    def partial_update(self, request, pk):
+        check_starosta(self, request)
         group = self.get_object(pk)
         if not group:
             return rest_default_error_response(
@@ -123,13 +267,24 @@ class GroupAPIView(APIView):
 
         serializer = GroupSerializer(group, data=request.data, partial=True)
         if serializer.is_valid():
-            serializer.save()
-            if "remove_students" in request.data:
-                for student in request.data["remove_students"]:
-                    group.students.remove(User.objects.get(pk=student))
-            if "students" in request.data:
-                for student in request.data["students"]:
-                    group.students.add(User.objects.get(pk=student))
+            with transaction.atomic():
+                invalid_students = update_group_members(
+                    group,
+                    add=request.data.get("students", []),
+                    remove=request.data.get("remove_students", []),
+                    members=request.data.get("set_students"),
+                )
+                if invalid_students:
+                    return rest_default_error_response(
+                        data=[
+                            f"Student {student} not found."
+                            for student in invalid_students
+                        ],
+                        message="Invalid students.",
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+                serializer.save()
+            prefetch_group_members([group])
             return rest_default_response(
                 data=GroupSerializer(group).data, status=status.HTTP_200_OK
             )
@@ -144,7 +299,7 @@ class UserInviteAPIView(APIView):
 
     def get_object(self, pk):
         try:
-            return Group.objects.get(pk=pk)
+            return Group.objects.alive().get(pk=pk)
         except Group.DoesNotExist:
             return None
 
@@ -174,17 +329,16 @@ class UserInviteAPIView(APIView):
         )
 
 
-class GroupEventsAPIView(APIView):
-    permission_classes = [IsStarostaOrStudentInGroup]
-    serializer_class = EventSerializer
+class GroupRosterImportAPIView(APIView):
+    permission_classes = [IsStarosta, IsStarostaOrStudentInGroup]
 
     def get_object(self, pk):
         try:
-            return Group.objects.get(pk=pk)
+            return Group.objects.alive().get(pk=pk)
         except Group.DoesNotExist:
             return None
 
-    def get(self, request, pk):
+    def post(self, request, pk):
         group = self.get_object(pk)
         if not group:
             return rest_default_error_response(
@@ -193,47 +347,125 @@ class GroupEventsAPIView(APIView):
 
         self.check_object_permissions(request, group)
 
-        events = Event.objects.filter(group=group, is_active=True)
-
-        all_events = []
-        for event in events:
-            all_events.append(event)
-            
-            if event.recurring and event.recurring_until:
-                current_date = event.date + timedelta(days=7)
-                while current_date <= event.recurring_until:
-                    virtual_event = Event(
-                        id=event.id,
-                        group=event.group,
-                        name=event.name,
-                        url=event.url,
-                        date=current_date,
-                        time=event.time,
-                        weekday=current_date.weekday(),
-                        recurring=event.recurring,
-                        recurring_until=event.recurring_until,
-                        is_active=event.is_active
-                    )
-                    all_events.append(virtual_event)
-                    current_date += timedelta(days=7)
+        roster = request.FILES.get("file")
+        if roster is None:
+            return rest_default_error_response(
+                data="File is required.", status=status.HTTP_400_BAD_REQUEST
+            )
 
-        # remove events that are in the past
-        all_events = [event for event in all_events if event.date >= timezone.now().date()]
+        try:
+            report = import_roster(group, iter_roster_rows(roster, roster.name))
+        except RosterError as e:
+            return rest_default_error_response(
+                data=str(e), status=status.HTTP_400_BAD_REQUEST
+            )
 
-        all_events = sorted(
-            all_events,
-            key=lambda event: (event.date, event.time),
+        created = sum(1 for row in report if row["status"] == RosterRowStatus.CREATED)
+        return rest_default_response(
+            data={"created": created, "rows": report}, status=status.HTTP_200_OK
         )
 
-        serialized_events = EventSerializer(all_events, many=True).data
 
-        return rest_default_response(
-            data=serialized_events,
-            status=status.HTTP_200_OK,
+class GroupEventsAPIView(AsyncAPIView):
+    permission_classes = [IsStarostaOrStudentInGroup]
+    serializer_class = EventSerializer
+
+    def get_object(self, pk):
+        try:
+            return Group.objects.alive().get(pk=pk)
+        except Group.DoesNotExist:
+            return None
+
+    async def get(self, request, pk):
+        groups = annotate_schedule_version(Group.objects.alive())
+        group = await groups.filter(pk=pk).afirst()
+        if not group:
+            return rest_default_error_response(
+                data="Group not found", status=status.HTTP_404_NOT_FOUND
+            )
+
+        await self.acheck_object_permissions(request, group)
+
+        try:
+            date_from = parse_date_param(request, "from") or timezone.now().date()
+            date_to = parse_date_param(request, "to")
+        except ValueError as e:
+            return rest_default_error_response(
+                data=str(e), status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # past occurrences drop out of the default window every midnight
+        last_modified = max(
+            get_schedule_last_modified(group),
+            timezone.now().replace(hour=0, minute=0, second=0, microsecond=0),
+        )
+        etag = make_etag(
+            "events",
+            group.pk,
+            last_modified.isoformat(),
+            group.events_count,
+            date_from,
+            request.get_full_path(),
         )
+        not_modified = conditional_response(request, etag, last_modified)
+        if not_modified is not None:
+            return set_conditional_headers(not_modified, etag, last_modified)
 
-    @permission_classes_decorator([IsStarosta, IsStarostaOrStudentInGroup])
-    def post(self, request, pk):
+        expand_group = "group" in request.query_params.get("expand", "").split(",")
+        try:
+            data = await sync_to_async(get_payload_cache().get_or_build)(
+                "events",
+                lambda: self.get_page_data(
+                    request, group, date_from, date_to, expand_group
+                ),
+                [("group", group.pk), ("schedule", group.pk)],
+                # the next link in the page is absolute
+                [etag, request.build_absolute_uri()],
+            )
+        except ValueError as e:
+            return rest_default_error_response(
+                data=str(e), status=status.HTTP_400_BAD_REQUEST
+            )
+
+        response = rest_default_response(data=data, status=status.HTTP_200_OK)
+        return set_conditional_headers(response, etag, last_modified)
+
+    def get_page_data(self, request, group, date_from, date_to, expand_group):
+        occurrences = EventOccurrence.objects.filter(
+            group=group, date__gte=date_from, is_cancelled=False
+        )
+        if date_to is not None:
+            occurrences = occurrences.filter(date__lte=date_to)
+        occurrences = occurrences.select_related("event")
+
+        paginator = KeysetPagination(ordering=("date", "time", "event_id"))
+        page = paginator.paginate_queryset(occurrences, request)
+
+        for occurrence in page:
+            occurrence.event.group = group
+        all_events = [
+            build_occurrence(occurrence.event, occurrence.date) for occurrence in page
+        ]
+
+        if expand_group:
+            prefetch_group_members([group])
+            return prerender_json(
+                paginator.get_paginated_data(
+                    ExpandedEventSerializer(all_events, many=True).data
+                )
+            )
+
+        data = paginator.get_paginated_data(
+            EventSerializer(all_events, many=True).data
+        )
+        data["included"] = {"groups": [get_group_data(group)]}
+        return prerender_json(data)
+
+    async def post(self, request, pk):
+        return await sync_to_async(self.create)(request, pk)
+
+    def create(self, request, pk):
+        check_starosta(self, request)
         group = self.get_object(pk)
         if not group:
             return rest_default_error_response(
@@ -258,13 +490,122 @@ class GroupEventsAPIView(APIView):
 
 
 
+class GroupEventsBulkAPIView(APIView):
+    """
+    An endpoint to create, update and delete many events of a group at once,
+    e.g. a whole semester timetable. Either every operation is applied or,
+    if any of them is invalid, none is.
+    """
+    permission_classes = [IsStarosta, IsStarostaOrStudentInGroup]
+    serializer_class = BulkEventSerializer
+
+    def get_object(self, pk):
+        try:
+            return Group.objects.alive().get(pk=pk)
+        except Group.DoesNotExist:
+            return None
+
+    def post(self, request, pk):
+        group = self.get_object(pk)
+        if not group:
+            return rest_default_error_response(
+                data="Group not found", status=status.HTTP_404_NOT_FOUND
+            )
+
+        self.check_object_permissions(request, group)
+
+        serializer = BulkEventSerializer(data=request.data)
+        if not serializer.is_valid():
+            return rest_default_error_response(
+                serializer=serializer, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        operations = []
+        for item in serializer.validated_data["operations"]:
+            operation_serializer = BulkEventOperationSerializer(data=item)
+            operation_serializer.is_valid()
+            operations.append(operation_serializer)
+
+        event_ids = [
+            operation.validated_data["id"]
+            for operation in operations
+            if not operation.errors and "id" in operation.validated_data
+        ]
+        events = Event.objects.alive().filter(group=group, pk__in=event_ids).in_bulk()
+
+        results = []
+        to_create, to_update, to_delete = [], [], []
+        seen_ids = set()
+        for index, operation in enumerate(operations):
+            item = operation.initial_data
+            result = {
+                "index": index,
+                "op": item.get("op") if isinstance(item, dict) else None,
+                "id": None,
+            }
+            results.append(result)
+            if operation.errors:
+                result["errors"] = normalize_serializer_errors(operation)
+                continue
+
+            op = operation.validated_data["op"]
+            event = None
+            if op != BulkEventOperationSerializer.CREATE:
+                event_id = operation.validated_data["id"]
+                result["id"] = event_id
+                event = events.get(event_id)
+                if event is None:
+                    result["errors"] = ["Event not found."]
+                    continue
+                if event_id in seen_ids:
+                    result["errors"] = ["Event is changed by another operation."]
+                    continue
+                seen_ids.add(event_id)
+
+            if op == BulkEventOperationSerializer.DELETE:
+                to_delete.append(event.pk)
+                continue
+
+            event_serializer = EventSerializer(
+                event, data=operation.validated_data["data"], partial=event is not None
+            )
+            if not event_serializer.is_valid():
+                result["errors"] = normalize_serializer_errors(event_serializer)
+                continue
+            if event is None:
+                to_create.append((result, event_serializer.validated_data))
+            else:
+                to_update.append((result, event, event_serializer.validated_data))
+
+        if any("errors" in result for result in results):
+            return rest_default_response(
+                data=results,
+                message="No changes were applied.",
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        created, updated = apply_event_changes(
+            group.pk,
+            [values for _, values in to_create],
+            [(event, values) for _, event, values in to_update],
+            to_delete,
+        )
+        for (result, _), event in zip(to_create, created):
+            result["id"] = event.pk
+            result["data"] = EventSerializer(event).data
+        for (result, _, _), event in zip(to_update, updated):
+            result["data"] = EventSerializer(event).data
+
+        return rest_default_response(data=results, status=status.HTTP_200_OK)
+
+
 class GroupEventAPIView(APIView):
     permission_classes = [IsStarostaOrStudentInGroup]
     serializer_class = EventSerializer
 
     def get_object(self, pk):
         try:
-            return Group.objects.get(pk=pk)
+            return Group.objects.alive().get(pk=pk)
         except Group.DoesNotExist:
             return None
 
@@ -277,7 +618,7 @@ class GroupEventAPIView(APIView):
 
         self.check_object_permissions(request, group)
 
-        event = Event.objects.get(pk=event_id)
+        event = Event.objects.alive().filter(group=group, pk=event_id).first()
         if not event:
             return rest_default_error_response(
                 data="Event not found", status=status.HTTP_404_NOT_FOUND
@@ -287,8 +628,8 @@ class GroupEventAPIView(APIView):
             data=EventSerializer(event).data, status=status.HTTP_200_OK
         )
 
-    @permission_classes_decorator([IsStarosta, IsStarostaOrStudentInGroup])
     def patch(self, request, pk, event_id):
+        check_starosta(self, request)
         group = self.get_object(pk)
         if not group:
             return rest_default_error_response(
@@ -297,7 +638,7 @@ class GroupEventAPIView(APIView):
 
         self.check_object_permissions(request, group)
 
-        event = Event.objects.get(pk=event_id)
+        event = Event.objects.alive().filter(group=group, pk=event_id).first()
         if not event:
             return rest_default_error_response(
                 data="Event not found", status=status.HTTP_404_NOT_FOUND
@@ -313,8 +654,8 @@ class GroupEventAPIView(APIView):
             serializer=serializer, status=status.HTTP_400_BAD_REQUEST
         )
 
-    @permission_classes_decorator([IsStarosta, IsStarostaOrStudentInGroup])
     def delete(self, request, pk, event_id):
+        check_starosta(self, request)
         group = self.get_object(pk)
         if not group:
             return rest_default_error_response(
@@ -323,7 +664,7 @@ class GroupEventAPIView(APIView):
 
         self.check_object_permissions(request, group)
 
-        event = Event.objects.get(pk=event_id)
+        event = Event.objects.alive().filter(group=group, pk=event_id).first()
         if not event:
             return rest_default_error_response(
                 data="Event not found", status=status.HTTP_404_NOT_FOUND
@@ -333,3 +674,91 @@ class GroupEventAPIView(APIView):
         return rest_default_response(
             message="Event deleted", status=status.HTTP_204_NO_CONTENT
         )
+
+
+class GroupCalendarView(View):
+    """
+    iCalendar feed of a group's schedule for calendar apps. Calendar apps
+    cannot send JWTs, so access is granted by the group's calendar token.
+    """
+
+    def get_object(self, pk):
+        try:
+            return annotate_schedule_version(Group.objects.alive()).get(pk=pk)
+        except Group.DoesNotExist:
+            return None
+
+    def get(self, request, pk):
+        group = self.get_object(pk)
+        token = request.GET.get("token", "")
+        if not group or not constant_time_compare(token, str(group.calendar_token)):
+            raise Http404("Group not found")
+
+        last_modified = get_schedule_last_modified(group)
+        etag = make_etag(
+            "calendar", group.pk, last_modified.isoformat(), group.events_count
+        )
+
+        response = conditional_response(request, etag, last_modified)
+        if response is None:
+            events = Event.objects.alive().filter(group=group, is_active=True)
+            cancelled_dates = defaultdict(list)
+            for event_id, date in EventOccurrence.objects.filter(
+                group=group, is_cancelled=True
+            ).values_list("event_id", "date"):
+                cancelled_dates[event_id].append(date)
+
+            response = StreamingHttpResponse(
+                iter_group_calendar(group, events.iterator(), cancelled_dates),
+                content_type="text/calendar; charset=utf-8",
+            )
+            response["Content-Disposition"] = 'inline; filename="calendar.ics"'
+        return set_conditional_headers(response, etag, last_modified)
+
+
+class GroupStreamAPIView(AsyncAPIView):
+    """
+    Server-sent events of the changes to a group and its schedule, so
+    clients reload only when something changed. Events carry the kind of
+    change (e.g. "event.updated") and the ids involved; "reset" means
+    changes were missed and everything should be reloaded.
+
+    Streams stay open, so they are only served by an ASGI server; they
+    end after `LIVE_UPDATES_STREAM_TIMEOUT` seconds and clients reconnect
+    with the `Last-Event-ID` they got.
+    """
+    permission_classes = [IsStarostaOrStudentInGroup]
+    renderer_classes = [FastJSONRenderer, EventStreamRenderer]
+
+    async def get(self, request, pk):
+        if not isinstance(request._request, ASGIRequest):
+            return rest_default_error_response(
+                data="Live updates need an ASGI server.",
+                status=status.HTTP_501_NOT_IMPLEMENTED,
+            )
+
+        group = await Group.objects.alive().filter(pk=pk).afirst()
+        if not group:
+            return rest_default_error_response(
+                data="Group not found", status=status.HTTP_404_NOT_FOUND
+            )
+
+        await self.acheck_object_permissions(request, group)
+
+        messages = get_hub().listen(
+            get_group_channel(group.pk),
+            parse_last_event_id(request),
+            timeout=settings.LIVE_UPDATES_HEARTBEAT,
+        )
+        response = StreamingHttpResponse(
+            iter_sse(
+                messages,
+                settings.LIVE_UPDATES_STREAM_TIMEOUT,
+                retry=settings.LIVE_UPDATES_RETRY * 1000,
+            ),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        # keeps proxies such as nginx from buffering the stream
+        response["X-Accel-Buffering"] = "no"
+        return response
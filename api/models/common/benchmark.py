@@ -0,0 +1,90 @@
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from django.db import connection, reset_queries, transaction
+from django.test.utils import CaptureQueriesContext
+
+
+@contextmanager
+def rolled_back():
+    """
+    Runs the block in a transaction that is always rolled back, so the
+    data a benchmark creates never stays in the database.
+    """
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def measure(func, repeat=5, setup=None):
+    """
+    Calls `func` `repeat` times, plus once to warm up, and once more each
+    to count its queries and trace its memory.
+
+    :param setup: called before every call, untimed (e.g. to clear caches)
+    :return: dict of the median wall and CPU time in ms, the number of
+        queries and the peak of traced Python memory in KB of one call
+    """
+
+    def call():
+        if setup is not None:
+            setup()
+        return func()
+
+    call()
+    wall, cpu = [], []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        func()
+        wall.append(time.perf_counter() - wall_start)
+        cpu.append(time.process_time() - cpu_start)
+
+    # the query log is capped, so it is emptied to count from zero
+    reset_queries()
+    with CaptureQueriesContext(connection) as queries:
+        call()
+
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "ms": statistics.median(wall) * 1000,
+        "cpu_ms": statistics.median(cpu) * 1000,
+        "queries": len(queries),
+        "peak_kb": peak / 1024,
+    }
+
+
+def format_table(headers, rows):
+    """
+    Formats rows of values as a plain text table.
+    """
+    rows = [
+        [f"{value:.1f}" if isinstance(value, float) else str(value) for value in row]
+        for row in rows
+    ]
+    widths = [
+        max(len(str(header)), *(len(row[index]) for row in rows))
+        for index, header in enumerate(headers)
+    ]
+    lines = [
+        "  ".join(str(header).ljust(width) for header, width in zip(headers, widths))
+    ]
+    for row in rows:
+        lines.append(
+            "  ".join(
+                value.ljust(width) if index == 0 else value.rjust(width)
+                for index, (value, width) in enumerate(zip(row, widths))
+            )
+        )
+    return "\n".join(lines)
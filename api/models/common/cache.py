@@ -0,0 +1,161 @@
+import threading
+import time
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+_missing = object()
+
+
+class VersionedCache:
+    """
+    Read-through cache of computed values (e.g. serialized payloads) keyed
+    by version counters, such as one per group. Writes bump the counters
+    instead of deleting entries, so a value is never looked up under a
+    stale version and old entries simply expire.
+
+    Works with any Django cache backend; with a per-process one (locmem)
+    every process has its own counters, so callers should also put
+    something that changes with the data (e.g. an ETag) in the key parts.
+    """
+
+    def __init__(
+        self,
+        alias="default",
+        prefix="versioned",
+        timeout=300,
+        lock_timeout=5,
+        wait_interval=0.02,
+    ):
+        self.alias = alias
+        self.prefix = prefix
+        self.timeout = timeout
+        self.lock_timeout = lock_timeout
+        self.wait_interval = wait_interval
+        self.stats = {}
+        self.stats_lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get_version_key(self, kind, pk):
+        return f"{self.prefix}:version:{kind}:{pk}"
+
+    def get_versions(self, dependencies):
+        """
+        :param dependencies: list of (kind, pk) pairs, e.g. ("group", 1)
+        :return: list of their current versions
+        """
+        keys = [self.get_version_key(kind, pk) for kind, pk in dependencies]
+        versions = self.cache.get_many(keys)
+        for key in keys:
+            if key not in versions:
+                # starting at the current time keeps a counter that was
+                # evicted from reusing versions of entries still cached
+                self.cache.add(key, time.time_ns(), None)
+                versions[key] = self.cache.get(key)
+        return [versions[key] for key in keys]
+
+    def bump(self, kind, pks):
+        """
+        Moves the versions of `pks` forward once the current transaction
+        commits, so no reader can cache data of the old state under the
+        new version.
+        """
+        pks = list(pks)
+        if pks:
+            transaction.on_commit(lambda: self.bump_now(kind, pks))
+
+    def bump_now(self, kind, pks):
+        for pk in pks:
+            key = self.get_version_key(kind, pk)
+            try:
+                self.cache.incr(key)
+            except ValueError:
+                self.cache.set(key, time.time_ns(), None)
+
+    def get_or_build(self, name, build, dependencies, parts=()):
+        """
+        Returns the cached value for the current versions of
+        `dependencies`, building and caching it on a miss. Only one caller
+        builds a missing value; concurrent ones wait for it for up to
+        `lock_timeout` seconds.
+
+        :param name: what is cached, e.g. "group"; the stats are per name
+        :param parts: further parts of the key, e.g. the query string
+        """
+        versions = self.get_versions(dependencies)
+        digest = md5(
+            ":".join(str(part) for part in (*dependencies, *parts)).encode(),
+            usedforsecurity=False,
+        ).hexdigest()
+        key = f"{self.prefix}:{name}:{digest}:{'.'.join(map(str, versions))}"
+
+        value = self.cache.get(key, _missing)
+        if value is not _missing:
+            self.count(name, "hits")
+            return value
+
+        lock_key = f"{key}:lock"
+        if not self.cache.add(lock_key, 1, self.lock_timeout):
+            deadline = time.monotonic() + self.lock_timeout
+            while time.monotonic() < deadline:
+                time.sleep(self.wait_interval)
+                value = self.cache.get(key, _missing)
+                if value is not _missing:
+                    self.count(name, "waits")
+                    return value
+                if self.cache.add(lock_key, 1, self.lock_timeout):
+                    break
+            else:
+                # the builder is stuck or gone, build without the lock
+                self.count(name, "misses")
+                return build()
+
+        self.count(name, "misses")
+        try:
+            value = build()
+            self.cache.set(key, value, self.timeout)
+        finally:
+            self.cache.delete(lock_key)
+        return value
+
+    def count(self, name, counter):
+        with self.stats_lock:
+            stats = self.stats.setdefault(name, {"hits": 0, "misses": 0, "waits": 0})
+            stats[counter] += 1
+
+    def get_stats(self):
+        """
+        :return: dict of name -> hits, misses and waits (hits after
+            waiting for a concurrent build) of this process
+        """
+        with self.stats_lock:
+            return {name: dict(stats) for name, stats in self.stats.items()}
+
+    def reset_stats(self):
+        with self.stats_lock:
+            self.stats.clear()
+
+
+_payload_cache = None
+_payload_cache_lock = threading.Lock()
+
+
+def get_payload_cache() -> VersionedCache:
+    """
+    Cache of serialized API payloads, in the `PAYLOAD_CACHE_ALIAS` cache.
+    """
+    global _payload_cache
+    if _payload_cache is None:
+        with _payload_cache_lock:
+            if _payload_cache is None:
+                _payload_cache = VersionedCache(
+                    alias=settings.PAYLOAD_CACHE_ALIAS,
+                    prefix="payload",
+                    timeout=settings.PAYLOAD_CACHE_TIMEOUT,
+                )
+    return _payload_cache
@@ -1,11 +1,21 @@
 from django.db import models
 
 
+class BaseModelQuerySet(models.QuerySet):
+    def alive(self):
+        """
+        Excludes soft-deleted rows.
+        """
+        return self.filter(deleted=False)
+
+
 class BaseModelFields(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True, db_index=True)
     deleted = models.BooleanField(default=False)
 
+    objects = BaseModelQuerySet.as_manager()
+
     class Meta:
         abstract = True
 
@@ -0,0 +1,235 @@
+import asyncio
+import threading
+import time
+from collections import deque, namedtuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+# `id` grows by one per message of a channel
+Message = namedtuple("Message", ["id", "event", "data"])
+# sent to a subscriber once it has caught up, with the id to resume from
+READY_EVENT = "ready"
+# tells a subscriber that messages were lost and it should reload everything
+RESET_EVENT = "reset"
+
+
+def get_first_id():
+    # ids start at the current time, so a restarted hub never hands out
+    # ids a client may still hold from before the restart
+    return time.time_ns() // 1000
+
+
+def get_backlog(last_id, current_id, messages):
+    """
+    Returns what a subscriber that last saw `last_id` missed: the
+    retained `messages` after it, or a reset if some are gone.
+
+    :param messages: the retained messages, ordered by id
+    """
+    if last_id is None or last_id == current_id:
+        return []
+    first_id = messages[0].id if messages else current_id + 1
+    if last_id > current_id or last_id < first_id - 1:
+        return [Message(current_id, RESET_EVENT, {})]
+    return [message for message in messages if message.id > last_id]
+
+
+class Subscriber:
+    def __init__(self, max_queued):
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+        self.max_queued = max_queued
+
+    def deliver(self, message):
+        """
+        Queues a message; runs on the subscriber's event loop. A subscriber
+        too slow to keep up gets a single reset instead of the backlog.
+        """
+        if self.queue.qsize() >= self.max_queued:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            message = Message(message.id, RESET_EVENT, {})
+        self.queue.put_nowait(message)
+
+
+class MemoryHub:
+    """
+    Publish/subscribe hub of this process. Keeps the last `history`
+    messages of every channel for subscribers resuming after a dropped
+    connection.
+
+    It only reaches subscribers connected to the same process; use
+    `CacheHub` when the server runs several workers.
+    """
+
+    def __init__(self, history=100, max_queued=100):
+        self.history = history
+        self.max_queued = max_queued
+        self.channels = {}
+        self.lock = threading.Lock()
+
+    def get_channel(self, name):
+        channel = self.channels.get(name)
+        if channel is None:
+            channel = self.channels[name] = {
+                "last_id": get_first_id(),
+                "messages": deque(maxlen=self.history),
+                "subscribers": set(),
+            }
+        return channel
+
+    def publish(self, name, event, data):
+        """
+        Sends a message to the subscribers of channel `name`. Safe to call
+        from any thread.
+        """
+        with self.lock:
+            channel = self.get_channel(name)
+            channel["last_id"] += 1
+            message = Message(channel["last_id"], event, data)
+            channel["messages"].append(message)
+            subscribers = list(channel["subscribers"])
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(subscriber.deliver, message)
+            except RuntimeError:
+                # the subscriber's event loop is closed, it is going away
+                pass
+
+    async def listen(self, name, last_id=None, timeout=None):
+        """
+        Yields the messages of channel `name`: the ones after `last_id`,
+        a `READY_EVENT` message, then new messages as they are published
+        and None whenever there was none for `timeout` seconds.
+        """
+        subscriber = Subscriber(self.max_queued)
+        with self.lock:
+            channel = self.get_channel(name)
+            channel["subscribers"].add(subscriber)
+            backlog = get_backlog(
+                last_id, channel["last_id"], list(channel["messages"])
+            )
+            current_id = channel["last_id"]
+        try:
+            for message in backlog:
+                yield message
+            yield Message(current_id, READY_EVENT, {})
+            while True:
+                try:
+                    yield await asyncio.wait_for(subscriber.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            with self.lock:
+                channel["subscribers"].discard(subscriber)
+                if not channel["subscribers"] and not channel["messages"]:
+                    self.channels.pop(name, None)
+
+
+class CacheHub:
+    """
+    Publish/subscribe through a Django cache every worker can reach, e.g.
+    a local Redis or the file-based cache: a stand-in for a real broker in
+    multi-worker setups. Subscribers poll the cache every `poll_interval`
+    seconds.
+    """
+
+    def __init__(
+        self, alias="default", prefix="hub", history=100, poll_interval=1.0
+    ):
+        self.alias = alias
+        self.prefix = prefix
+        self.history = history
+        self.poll_interval = poll_interval
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get_message_key(self, name, message_id):
+        return f"{self.prefix}:{name}:{message_id}"
+
+    def publish(self, name, event, data):
+        counter = f"{self.prefix}:{name}:last_id"
+        self.cache.add(counter, get_first_id(), None)
+        message_id = self.cache.incr(counter)
+        self.cache.set(
+            self.get_message_key(name, message_id),
+            (event, data),
+            # kept for as long as a full history of messages may take
+            max(self.history * self.poll_interval, 300),
+        )
+
+    async def get_last_id(self, name):
+        counter = f"{self.prefix}:{name}:last_id"
+        await self.cache.aadd(counter, get_first_id(), None)
+        return await self.cache.aget(counter)
+
+    async def get_messages(self, name, last_id, current_id):
+        """
+        Returns the messages after `last_id` up to `current_id`, or a reset
+        if any of them expired or there are more than `history`.
+        """
+        if current_id - last_id > self.history:
+            return [Message(current_id, RESET_EVENT, {})]
+        keys = [
+            self.get_message_key(name, message_id)
+            for message_id in range(last_id + 1, current_id + 1)
+        ]
+        found = await self.cache.aget_many(keys)
+        if len(found) < len(keys):
+            return [Message(current_id, RESET_EVENT, {})]
+        return [
+            Message(last_id + 1 + index, *found[key]) for index, key in enumerate(keys)
+        ]
+
+    async def listen(self, name, last_id=None, timeout=None):
+        """
+        Same as `MemoryHub.listen`.
+        """
+        current_id = await self.get_last_id(name)
+        if last_id is None or last_id > current_id:
+            backlog = [] if last_id is None else [Message(current_id, RESET_EVENT, {})]
+        else:
+            backlog = await self.get_messages(name, last_id, current_id)
+        for message in backlog:
+            yield message
+        yield Message(current_id, READY_EVENT, {})
+
+        last_id = current_id
+        idle_since = time.monotonic()
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            current_id = await self.get_last_id(name)
+            if current_id > last_id:
+                for message in await self.get_messages(name, last_id, current_id):
+                    yield message
+                last_id = current_id
+                idle_since = time.monotonic()
+            elif timeout is not None and time.monotonic() - idle_since >= timeout:
+                yield None
+                idle_since = time.monotonic()
+
+
+_hub = None
+_hub_lock = threading.Lock()
+
+
+def get_hub():
+    global _hub
+    if _hub is None:
+        with _hub_lock:
+            if _hub is None:
+                _hub = import_string(settings.LIVE_UPDATES_HUB)()
+    return _hub
+
+
+def publish_on_commit(name, event, data):
+    """
+    Publishes a message once the current transaction commits, so
+    subscribers that reload on it see the change.
+    """
+    transaction.on_commit(lambda: get_hub().publish(name, event, data))
@@ -0,0 +1,245 @@
+import asyncio
+import threading
+import time
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase
+
+from models.common.cache import VersionedCache
+from models.common.pubsub import CacheHub, MemoryHub, READY_EVENT, RESET_EVENT
+
+GROUP = [("group", 1)]
+
+
+class VersionedCacheTestCase(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.cache = VersionedCache(prefix="test", lock_timeout=5)
+        self.builds = 0
+
+    def build(self):
+        self.builds += 1
+        return f"payload {self.builds}"
+
+    def get(self, dependencies=GROUP, parts=()):
+        return self.cache.get_or_build("group", self.build, dependencies, parts)
+
+    def test_hits_and_misses_are_counted(self):
+        self.assertEqual(self.get(), "payload 1")
+        self.assertEqual(self.get(), "payload 1")
+        self.assertEqual(self.get(parts=["page=2"]), "payload 2")
+        self.assertEqual(self.get([("group", 2)]), "payload 3")
+
+        self.assertEqual(self.builds, 3)
+        self.assertEqual(
+            self.cache.get_stats(), {"group": {"hits": 1, "misses": 3, "waits": 0}}
+        )
+        self.cache.reset_stats()
+        self.assertEqual(self.cache.get_stats(), {})
+
+    def test_bump_takes_effect_on_commit(self):
+        self.get()
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.cache.bump("group", [1])
+            # until the commit, readers still get the old state's value
+            self.assertEqual(self.get(), "payload 1")
+        self.assertEqual(len(callbacks), 1)
+
+        self.assertEqual(self.get(), "payload 2")
+        self.assertEqual(self.get([("group", 2)]), "payload 3")
+
+    def test_evicted_version_does_not_reuse_cached_entries(self):
+        self.get()
+        caches["default"].delete(self.cache.get_version_key("group", 1))
+
+        self.assertEqual(self.get(), "payload 2")
+
+    def test_concurrent_misses_build_once(self):
+        building = threading.Event()
+        waiting = threading.Event()
+        finish = threading.Event()
+
+        def build():
+            self.builds += 1
+            building.set()
+            finish.wait(5)
+            return "payload"
+
+        sleep = time.sleep
+
+        def wait(seconds):
+            waiting.set()
+            sleep(seconds)
+
+        results = []
+
+        def get():
+            results.append(self.cache.get_or_build("group", build, GROUP))
+
+        with mock.patch("models.common.cache.time.sleep", side_effect=wait):
+            builder = threading.Thread(target=get)
+            builder.start()
+            self.assertTrue(building.wait(5))
+            waiter = threading.Thread(target=get)
+            waiter.start()
+            # the second miss finds the lock taken and waits for the build
+            self.assertTrue(waiting.wait(5))
+            finish.set()
+            builder.join(5)
+            waiter.join(5)
+
+        self.assertEqual(results, ["payload", "payload"])
+        self.assertEqual(self.builds, 1)
+        self.assertEqual(
+            self.cache.get_stats(), {"group": {"hits": 0, "misses": 1, "waits": 1}}
+        )
+
+
+CHANNEL = "group:1"
+
+
+class HubTestMixin:
+    """
+    Resuming from a Last-Event-ID, shared by the hubs.
+    """
+
+    def make_hub(self, history):
+        raise NotImplementedError
+
+    def setUp(self):
+        caches["default"].clear()
+        self.hub = self.make_hub(history=3)
+
+    def publish(self, count):
+        for index in range(count):
+            self.hub.publish(CHANNEL, "roster.changed", {"index": index})
+
+    def get_current_id(self):
+        return self.listen()[-1].id
+
+    @async_to_sync
+    async def listen(self, last_id=None, publish=0):
+        """
+        :return: the messages up to the ready one, and then `publish`
+            messages published after it
+        """
+        messages = []
+        stream = self.hub.listen(CHANNEL, last_id)
+        try:
+            async for message in stream:
+                messages.append(message)
+                if message.event == READY_EVENT:
+                    break
+            self.publish(publish)
+            for _ in range(publish):
+                messages.append(await asyncio.wait_for(anext(stream), 5))
+        finally:
+            await stream.aclose()
+        return messages
+
+    def summarize(self, messages):
+        return [(message.event, message.data) for message in messages]
+
+    def test_new_subscriber_gets_no_backlog(self):
+        self.publish(2)
+
+        messages = self.listen()
+
+        self.assertEqual(self.summarize(messages), [(READY_EVENT, {})])
+
+    def test_resume_gets_the_missed_messages(self):
+        self.publish(1)
+        last_id = self.get_current_id()
+        self.publish(2)
+
+        messages = self.listen(last_id)
+
+        self.assertEqual(
+            self.summarize(messages),
+            [
+                ("roster.changed", {"index": 0}),
+                ("roster.changed", {"index": 1}),
+                (READY_EVENT, {}),
+            ],
+        )
+        self.assertEqual(
+            [message.id for message in messages],
+            [last_id + 1, last_id + 2, last_id + 2],
+        )
+
+    def test_resume_from_the_current_id(self):
+        self.publish(1)
+        last_id = self.get_current_id()
+
+        messages = self.listen(last_id)
+
+        self.assertEqual(self.summarize(messages), [(READY_EVENT, {})])
+        self.assertEqual(messages[0].id, last_id)
+
+    def test_resume_after_the_history_is_gone(self):
+        self.publish(1)
+        last_id = self.get_current_id()
+        self.publish(4)
+
+        messages = self.listen(last_id)
+
+        self.assertEqual(
+            self.summarize(messages), [(RESET_EVENT, {}), (READY_EVENT, {})]
+        )
+
+    def test_resume_from_an_id_the_hub_never_gave(self):
+        # e.g. after a restart that lost the channel's ids
+        self.publish(1)
+        last_id = self.get_current_id()
+
+        messages = self.listen(last_id + 10)
+
+        self.assertEqual(
+            self.summarize(messages), [(RESET_EVENT, {}), (READY_EVENT, {})]
+        )
+
+    def test_live_messages_continue_from_the_ready_id(self):
+        messages = self.listen(publish=2)
+
+        ready_id = messages[0].id
+        self.assertEqual(
+            [(message.id, message.event) for message in messages],
+            [
+                (ready_id, READY_EVENT),
+                (ready_id + 1, "roster.changed"),
+                (ready_id + 2, "roster.changed"),
+            ],
+        )
+        # reconnecting with the last id seen misses nothing and repeats nothing
+        self.assertEqual(
+            self.summarize(self.listen(messages[-1].id)), [(READY_EVENT, {})]
+        )
+        self.assertEqual(
+            self.summarize(self.listen(messages[1].id)),
+            [("roster.changed", {"index": 1}), (READY_EVENT, {})],
+        )
+
+
+class MemoryHubTestCase(HubTestMixin, SimpleTestCase):
+    def make_hub(self, history):
+        return MemoryHub(history=history)
+
+
+class CacheHubTestCase(HubTestMixin, SimpleTestCase):
+    def make_hub(self, history):
+        return CacheHub(prefix="test-hub", history=history, poll_interval=0.01)
+
+    def test_resume_after_a_message_expired(self):
+        self.publish(1)
+        last_id = self.get_current_id()
+        self.publish(2)
+        caches["default"].delete(self.hub.get_message_key(CHANNEL, last_id + 1))
+
+        messages = self.listen(last_id)
+
+        self.assertEqual(
+            self.summarize(messages), [(RESET_EVENT, {}), (READY_EVENT, {})]
+        )
@@ -2,9 +2,17 @@ from django.contrib import admin
 
 from unfold.admin import ModelAdmin
 
-from models.event.models import Event
+from models.event.models import Event, EventOccurrence
 
 
 @admin.register(Event)
 class EventAdmin(ModelAdmin):
-    pass
\ No newline at end of file
+    pass
+
+
+@admin.register(EventOccurrence)
+class EventOccurrenceAdmin(ModelAdmin):
+    list_display = ["id", "event", "group", "date", "time", "is_cancelled"]
+    list_filter = ["is_cancelled"]
+    list_editable = ["is_cancelled"]
+    readonly_fields = ["event", "group", "date", "time"]
@@ -0,0 +1,121 @@
+from datetime import time, timedelta
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.api.auth.authentication import get_refresh_token
+from core.api.event.serializers import EventSerializer
+from models.common.benchmark import format_table, measure, rolled_back
+from models.event.models import Event
+from models.event.utils import RECURRENCE_STEP
+from models.user.choices import UserRoleChoices
+from models.user.models import User
+
+# how long every benchmarked event recurs, about two school years
+EVENT_SPAN = timedelta(days=2 * 366)
+
+
+def expand_all(events, today):
+    """
+    How the feed used to expand recurrences: every weekly copy from the
+    first date on, then the past ones dropped and the rest sorted.
+    """
+    all_events = []
+    for event in events:
+        all_events.append(event)
+        if event.recurring and event.recurring_until:
+            current_date = event.date + RECURRENCE_STEP
+            while current_date <= event.recurring_until:
+                all_events.append(
+                    Event(
+                        id=event.id,
+                        group_id=event.group_id,
+                        name=event.name,
+                        url=event.url,
+                        date=current_date,
+                        time=event.time,
+                        weekday=current_date.weekday(),
+                        recurring=event.recurring,
+                        recurring_until=event.recurring_until,
+                        is_active=event.is_active,
+                    )
+                )
+                current_date += RECURRENCE_STEP
+    all_events = [event for event in all_events if event.date >= today]
+    all_events.sort(key=lambda event: (event.date, event.time))
+    return EventSerializer(all_events, many=True).data
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the events feed of a group with many long-running recurring "
+        "events against expanding every occurrence in Python, as the feed "
+        "used to. Runs in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--events", type=int, default=60, help="Number of recurring events."
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Timed runs per case."
+        )
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            rows = self.run(options["events"], options["repeat"])
+        self.stdout.write(
+            format_table(["case", "ms", "queries", "peak KB", "items"], rows)
+        )
+
+    def run(self, events_count, repeat):
+        today = timezone.now().date()
+        starosta = User.objects.create(
+            email="bench-starosta@example.com",
+            first_name="Bench",
+            last_name="Starosta",
+            role=UserRoleChoices.STAROSTA,
+        )
+        group = starosta.group
+        # half of every event's span is in the past, as mid-semester
+        first_date = today - EVENT_SPAN / 2
+        for index in range(events_count):
+            Event.objects.create(
+                group=group,
+                name=f"Event {index}",
+                url="https://meet.example.com",
+                date=first_date + timedelta(days=index % 7),
+                time=time(8 + index % 10),
+                recurring=True,
+                recurring_until=first_date + EVENT_SPAN,
+            )
+
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {get_refresh_token(starosta).access_token}"
+        )
+        events = list(Event.objects.filter(group=group, is_active=True))
+        url = f"/api/user/groups/{group.pk}/events"
+        two_weeks = f"{url}?from={today}&to={today + timedelta(days=14)}&limit=100"
+
+        def clear_cache():
+            caches["default"].clear()
+
+        cases = [
+            ("expand in Python (before)", lambda: expand_all(events, today), None),
+            ("feed, first page", lambda: client.get(url), clear_cache),
+            ("feed, two weeks, limit=100", lambda: client.get(two_weeks), clear_cache),
+            ("feed, first page, cached", lambda: client.get(url), None),
+        ]
+        rows = []
+        for name, func, setup in cases:
+            result = func()
+            if hasattr(result, "status_code"):
+                items = len(result.json()["data"]["results"])
+            else:
+                items = len(result)
+            stats = measure(func, repeat, setup)
+            rows.append([name, stats["ms"], stats["queries"], stats["peak_kb"], items])
+        return rows
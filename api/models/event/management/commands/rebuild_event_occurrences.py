@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from models.event.models import Event
+from models.event.utils import OCCURRENCE_BATCH_SIZE, sync_event_occurrences
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the materialized occurrences of events."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--group",
+            type=int,
+            help="Only rebuild the occurrences of events in this group.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=OCCURRENCE_BATCH_SIZE,
+            help="Number of events synced per batch.",
+        )
+
+    def handle(self, *args, **options):
+        events = Event.objects.order_by("pk")
+        if options["group"] is not None:
+            events = events.filter(group_id=options["group"])
+
+        batch_size = options["batch_size"]
+        batch = []
+        total = 0
+        for event in events.iterator(chunk_size=batch_size):
+            batch.append(event)
+            if len(batch) >= batch_size:
+                sync_event_occurrences(batch)
+                total += len(batch)
+                batch = []
+        sync_event_occurrences(batch)
+        total += len(batch)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt occurrences for {total} events.")
+        )
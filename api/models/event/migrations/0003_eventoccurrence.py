@@ -0,0 +1,59 @@
+# Generated by Django 5.1.4 on 2026-10-18 07:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from models.event.utils import OCCURRENCE_BATCH_SIZE, iter_occurrence_dates
+
+
+def populate_occurrences(apps, schema_editor):
+    Event = apps.get_model('event', 'Event')
+    EventOccurrence = apps.get_model('event', 'EventOccurrence')
+
+    occurrences = []
+    for event in Event.objects.filter(is_active=True, deleted=False).iterator():
+        for occurrence_date in iter_occurrence_dates(event):
+            occurrences.append(
+                EventOccurrence(
+                    event_id=event.pk,
+                    group_id=event.group_id,
+                    date=occurrence_date,
+                    time=event.time,
+                )
+            )
+            if len(occurrences) >= OCCURRENCE_BATCH_SIZE:
+                EventOccurrence.objects.bulk_create(occurrences)
+                occurrences = []
+    EventOccurrence.objects.bulk_create(occurrences)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0002_alter_event_url'),
+        ('user', '0003_userinvite'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventOccurrence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True)),
+                ('deleted', models.BooleanField(default=False)),
+                ('date', models.DateField()),
+                ('time', models.TimeField()),
+                ('is_cancelled', models.BooleanField(default=False)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='occurrences', to='event.event')),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='event_occurrences', to='user.group')),
+            ],
+            options={
+                'verbose_name': 'Event occurrence',
+                'verbose_name_plural': 'Event occurrences',
+                'indexes': [models.Index(fields=['group', 'date', 'time'], name='event_occurrence_schedule')],
+                'constraints': [models.UniqueConstraint(fields=('event', 'date'), name='unique_event_occurrence_date')],
+            },
+        ),
+        migrations.RunPython(populate_occurrences, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.4 on 2026-10-18 07:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0003_eventoccurrence'),
+        ('user', '0005_alive_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['group', 'is_active', 'date'], name='event_group_active_date'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('deleted', False)), fields=['group', 'date'], name='event_alive_group_date'),
+        ),
+    ]
@@ -21,6 +21,16 @@ class Event(BaseModelFields):
     class Meta:
         verbose_name = "Event"
         verbose_name_plural = "Events"
+        indexes = [
+            models.Index(
+                fields=["group", "is_active", "date"], name="event_group_active_date"
+            ),
+            models.Index(
+                fields=["group", "date"],
+                condition=models.Q(deleted=False),
+                name="event_alive_group_date",
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -28,3 +38,32 @@ class Event(BaseModelFields):
     def save(self, *args, **kwargs):
         self.weekday = self.date.weekday()
         return super().save(*args, **kwargs)
+
+
+class EventOccurrence(BaseModelFields):
+    event = models.ForeignKey(
+        Event, on_delete=models.CASCADE, related_name="occurrences"
+    )
+    group = models.ForeignKey(
+        Group, on_delete=models.CASCADE, related_name="event_occurrences"
+    )
+    date = models.DateField()
+    time = models.TimeField()
+    is_cancelled = models.BooleanField(default=False)
+
+    class Meta:
+        verbose_name = "Event occurrence"
+        verbose_name_plural = "Event occurrences"
+        indexes = [
+            models.Index(
+                fields=["group", "date", "time"], name="event_occurrence_schedule"
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["event", "date"], name="unique_event_occurrence_date"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.event.name} ({self.date})"
@@ -0,0 +1,48 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from models.event.models import Event
+from models.event.utils import (
+    SCHEDULE_FIELDS,
+    bump_schedule_versions,
+    sync_event_occurrences,
+)
+from models.user.models import Group
+from models.user.utils import publish_group_change
+
+
+@receiver(post_save, sender=Event)
+def sync_occurrences_on_event_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not SCHEDULE_FIELDS.intersection(update_fields):
+        return
+    sync_event_occurrences([instance])
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def bump_schedule_version(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_schedule_versions([instance.group_id])
+
+
+@receiver(post_delete, sender=Event)
+def touch_group_on_event_delete(sender, instance, **kwargs):
+    # a hard-deleted event leaves no updated_at behind, so the group's moves
+    # the schedule's Last-Modified instead; its count alone only changes
+    # the ETag, which clients polling with If-Modified-Since never send
+    Group.objects.filter(pk=instance.group_id).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Event)
+def publish_event_save(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        event = "event.created" if created else "event.updated"
+        publish_group_change([instance.group_id], event, {"ids": [instance.pk]})
+
+
+@receiver(post_delete, sender=Event)
+def publish_event_delete(sender, instance, **kwargs):
+    publish_group_change([instance.group_id], "event.deleted", {"ids": [instance.pk]})
@@ -0,0 +1,232 @@
+from datetime import date, time, timedelta
+from importlib import import_module
+from unittest import mock, skipUnless
+
+from django.apps import apps
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.api.auth.authentication import get_refresh_token
+from models.event.models import Event, EventOccurrence
+from models.user.cache import get_auth_user_cache
+from models.user.choices import UserRoleChoices
+from models.user.models import User, Group
+
+
+class EventOccurrenceTestCase(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        get_auth_user_cache().clear()
+        self.starosta = User.objects.create(
+            email="starosta@example.com",
+            first_name="Olena",
+            last_name="Koval",
+            role=UserRoleChoices.STAROSTA,
+        )
+        self.group = Group.objects.get(starosta=self.starosta)
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {get_refresh_token(self.starosta).access_token}"
+        )
+
+    def create_event(self, **fields):
+        return Event.objects.create(
+            group=self.group, name="Lecture", url="https://meet.example.com", **fields
+        )
+
+    def test_recurring_event_materializes_weekly_occurrences(self):
+        event = self.create_event(
+            date=date(2030, 1, 7),
+            time=time(10),
+            recurring=True,
+            recurring_until=date(2030, 2, 4),
+        )
+
+        self.assertEqual(
+            list(event.occurrences.order_by("date").values_list("date", flat=True)),
+            [date(2030, 1, 7) + timedelta(weeks=week) for week in range(5)],
+        )
+
+    def test_rescheduling_keeps_cancelled_occurrences(self):
+        event = self.create_event(
+            date=date(2030, 1, 7),
+            time=time(10),
+            recurring=True,
+            recurring_until=date(2030, 2, 4),
+        )
+        event.occurrences.filter(date=date(2030, 1, 14)).update(is_cancelled=True)
+
+        event.recurring_until = date(2030, 1, 21)
+        event.save()
+
+        self.assertEqual(event.occurrences.count(), 3)
+        self.assertTrue(event.occurrences.get(date=date(2030, 1, 14)).is_cancelled)
+
+    def create_long_running_event(self):
+        # e.g. created before recurrences were capped, or in the admin
+        return self.create_event(
+            date=date(2020, 1, 6),
+            time=time(10),
+            recurring=True,
+            recurring_until=date(2031, 1, 1),
+        )
+
+    def test_long_running_events_keep_every_occurrence(self):
+        event = self.create_long_running_event()
+
+        weeks = (date(2031, 1, 1) - date(2020, 1, 6)) // timedelta(weeks=1)
+        self.assertEqual(event.occurrences.count(), weeks + 1)
+        self.assertEqual(
+            event.occurrences.order_by("-date").first().date,
+            date(2020, 1, 6) + timedelta(weeks=weeks),
+        )
+
+    def test_feed_lists_future_occurrences_of_long_running_events(self):
+        self.create_long_running_event()
+
+        response = self.client.get(
+            f"/api/user/groups/{self.group.pk}/events?from=2030-12-01"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [event["date"] for event in response.json()["data"]["results"]],
+            ["2030-12-02", "2030-12-09", "2030-12-16", "2030-12-23", "2030-12-30"],
+        )
+
+    def test_long_running_events_stay_editable(self):
+        event = self.create_long_running_event()
+        count = event.occurrences.count()
+
+        response = self.client.patch(
+            f"/api/user/groups/{self.group.pk}/events/{event.pk}",
+            {"name": "Seminar", "time": "11:00"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(event.occurrences.filter(time=time(11)).count(), count)
+
+    def test_migration_backfills_in_batches(self):
+        migration = import_module("models.event.migrations.0003_eventoccurrence")
+        event = self.create_long_running_event()
+        self.create_event(date=date(2030, 1, 7), time=time(12))
+        expected = sorted(EventOccurrence.objects.values_list("event", "date"))
+        EventOccurrence.objects.all().delete()
+
+        with mock.patch.object(migration, "OCCURRENCE_BATCH_SIZE", 100):
+            with mock.patch.object(
+                EventOccurrence.objects,
+                "bulk_create",
+                wraps=EventOccurrence.objects.bulk_create,
+            ) as bulk_create:
+                migration.populate_occurrences(apps, None)
+
+        self.assertEqual(
+            sorted(EventOccurrence.objects.values_list("event", "date")), expected
+        )
+        self.assertGreater(event.occurrences.count(), 500)
+        for call in bulk_create.call_args_list:
+            self.assertLessEqual(len(call.args[0]), 100)
+
+    def test_api_rejects_recurrence_over_the_span(self):
+        response = self.client.post(
+            f"/api/user/groups/{self.group.pk}/events",
+            {
+                "name": "Lecture",
+                "url": "https://meet.example.com",
+                "date": "2030-01-07",
+                "time": "10:00",
+                "recurring": True,
+                "recurring_until": "3000-01-01",
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(EventOccurrence.objects.exists())
+
+    def test_api_rejects_moving_recurrence_end_over_the_span(self):
+        event = self.create_event(
+            date=date(2030, 1, 7),
+            time=time(10),
+            recurring=True,
+            recurring_until=date(2030, 2, 4),
+        )
+
+        response = self.client.patch(
+            f"/api/user/groups/{self.group.pk}/events/{event.pk}",
+            {"recurring_until": "2099-01-01"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(event.occurrences.count(), 5)
+
+    def test_bulk_api_rejects_recurrence_over_the_span(self):
+        response = self.client.post(
+            f"/api/user/groups/{self.group.pk}/events/bulk",
+            {
+                "operations": [
+                    {
+                        "op": "create",
+                        "data": {
+                            "name": "Lecture",
+                            "url": "https://meet.example.com",
+                            "date": "2030-01-07",
+                            "time": "10:00",
+                            "recurring": True,
+                            "recurring_until": "9999-12-31",
+                        },
+                    }
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Event.objects.exists())
+
+
+@skipUnless(connection.vendor == "sqlite", "query plans are checked on SQLite")
+class EventIndexTestCase(TestCase):
+    def setUp(self):
+        starosta = User.objects.create(
+            email="starosta@example.com",
+            first_name="Olena",
+            last_name="Koval",
+            role=UserRoleChoices.STAROSTA,
+        )
+        self.group = Group.objects.get(starosta=starosta)
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(f"USING INDEX {index_name}", plan)
+        self.assertNotIn("SCAN", plan)
+
+    def test_alive_events_of_a_group(self):
+        # the calendar feed; SQLite tests `is_active=True` as a bare column,
+        # so the group prefix of the partial index answers it
+        self.assertUsesIndex(
+            Event.objects.alive().filter(group=self.group, is_active=True),
+            "event_alive_group_date",
+        )
+
+    def test_schedule_window_of_a_group(self):
+        self.assertUsesIndex(
+            EventOccurrence.objects.filter(
+                group=self.group, date__gte=date(2030, 1, 1), date__lte=date(2030, 2, 1)
+            ),
+            "event_occurrence_schedule",
+        )
+
+    def test_schedule_is_read_in_index_order(self):
+        plan = (
+            EventOccurrence.objects.filter(group=self.group, date__gte=date(2030, 1, 1))
+            .order_by("date", "time")
+            .explain()
+        )
+        self.assertIn("USING INDEX event_occurrence_schedule", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
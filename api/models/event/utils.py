@@ -0,0 +1,240 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Iterable, Iterator, Optional
+
+from django.db import transaction
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.utils import timezone
+
+from models.common.cache import get_payload_cache
+from models.user.utils import publish_group_change
+from models.event.models import Event, EventOccurrence
+
+
+RECURRENCE_STEP = timedelta(days=7)
+# how long a recurring event written through the API may run; every
+# occurrence is a row, so this bounds how many rows one write can add.
+# Events that already run longer keep all their occurrences.
+MAX_RECURRENCE_SPAN = timedelta(days=2 * 366)
+OCCURRENCE_BATCH_SIZE = 500
+# changing any other field does not move the occurrences of an event
+SCHEDULE_FIELDS = {
+    "group",
+    "date",
+    "time",
+    "recurring",
+    "recurring_until",
+    "is_active",
+    "deleted",
+}
+
+
+def get_last_occurrence_date(event: Event) -> date:
+    if event.recurring and event.recurring_until:
+        return max(event.date, event.recurring_until)
+    return event.date
+
+
+def get_first_occurrence_date(event: Event, date_from: date = None) -> Optional[date]:
+    """
+    Returns the date of the first occurrence of the event on or after
+    `date_from`, jumping over the past weeks instead of walking them.
+    """
+    if date_from is None or event.date >= date_from:
+        return event.date
+    if not (event.recurring and event.recurring_until):
+        return None
+    weeks = -(-(date_from - event.date).days // RECURRENCE_STEP.days)
+    first_date = event.date + weeks * RECURRENCE_STEP
+    if first_date > get_last_occurrence_date(event):
+        return None
+    return first_date
+
+
+def iter_occurrence_dates(
+    event: Event, date_from: date = None, date_to: date = None
+) -> Iterator[date]:
+    current_date = get_first_occurrence_date(event, date_from)
+    if current_date is None:
+        return
+    last_date = get_last_occurrence_date(event)
+    if date_to is not None and date_to < last_date:
+        last_date = date_to
+    while current_date <= last_date:
+        yield current_date
+        current_date += RECURRENCE_STEP
+
+
+def build_occurrence(event: Event, occurrence_date: date) -> Event:
+    """
+    Returns an unsaved copy of the event placed on `occurrence_date`.
+    """
+    if occurrence_date == event.date:
+        return event
+    occurrence = Event(
+        id=event.id,
+        group_id=event.group_id,
+        name=event.name,
+        url=event.url,
+        date=occurrence_date,
+        time=event.time,
+        weekday=occurrence_date.weekday(),
+        recurring=event.recurring,
+        recurring_until=event.recurring_until,
+        is_active=event.is_active,
+    )
+    if Event.group.is_cached(event):
+        occurrence.group = event.group
+    return occurrence
+
+
+def sync_event_occurrences(events: Iterable[Event]) -> None:
+    """
+    Brings the materialized occurrences of `events` in line with their
+    schedule. Occurrences whose date is still part of the schedule are
+    kept, so per-occurrence overrides such as cancellations survive.
+    """
+    events = list(events)
+    if not events:
+        return
+
+    existing = defaultdict(dict)
+    for occurrence in EventOccurrence.objects.filter(event__in=events):
+        existing[occurrence.event_id][occurrence.date] = occurrence
+
+    now = timezone.now()
+    to_create, to_update, to_delete = [], [], []
+    for event in events:
+        current = existing.pop(event.pk, {})
+        if event.is_active and not event.deleted:
+            occurrence_dates = iter_occurrence_dates(event)
+        else:
+            occurrence_dates = ()
+        for occurrence_date in occurrence_dates:
+            occurrence = current.pop(occurrence_date, None)
+            if occurrence is None:
+                to_create.append(
+                    EventOccurrence(
+                        event=event,
+                        group_id=event.group_id,
+                        date=occurrence_date,
+                        time=event.time,
+                    )
+                )
+            elif occurrence.time != event.time or occurrence.group_id != event.group_id:
+                occurrence.time = event.time
+                occurrence.group_id = event.group_id
+                occurrence.updated_at = now
+                to_update.append(occurrence)
+        to_delete.extend(occurrence.pk for occurrence in current.values())
+
+    with transaction.atomic():
+        if to_delete:
+            EventOccurrence.objects.filter(pk__in=to_delete).delete()
+        EventOccurrence.objects.bulk_create(to_create, batch_size=OCCURRENCE_BATCH_SIZE)
+        EventOccurrence.objects.bulk_update(
+            to_update,
+            ["time", "group", "updated_at"],
+            batch_size=OCCURRENCE_BATCH_SIZE,
+        )
+    bump_schedule_versions({event.group_id for event in events})
+
+
+def bump_schedule_versions(group_ids: Iterable[int]) -> None:
+    """
+    Invalidates the cached event payloads of the given groups.
+    """
+    get_payload_cache().bump("schedule", group_ids)
+
+
+def apply_event_changes(
+    group_id: int,
+    to_create: Iterable[dict],
+    to_update: Iterable[tuple],
+    to_delete: Iterable[int],
+):
+    """
+    Applies a batch of already validated event changes of one group in a
+    single transaction and re-syncs the occurrences of the touched events.
+
+    :param to_create: field values of the events to create
+    :param to_update: (event, field values) pairs of the events to update
+    :param to_delete: ids of the events to delete
+
+    :return: tuple of the created and the updated events
+    """
+    now = timezone.now()
+    created = []
+    for values in to_create:
+        event = Event(group_id=group_id, **values)
+        event.weekday = event.date.weekday()
+        created.append(event)
+
+    updated = []
+    update_fields = {"weekday", "updated_at"}
+    for event, values in to_update:
+        for field, value in values.items():
+            setattr(event, field, value)
+        event.weekday = event.date.weekday()
+        event.updated_at = now
+        update_fields.update(values)
+        updated.append(event)
+
+    with transaction.atomic():
+        to_delete = list(to_delete)
+        if to_delete:
+            Event.objects.filter(group_id=group_id, pk__in=to_delete).delete()
+        Event.objects.bulk_create(created, batch_size=OCCURRENCE_BATCH_SIZE)
+        Event.objects.bulk_update(
+            updated, sorted(update_fields), batch_size=OCCURRENCE_BATCH_SIZE
+        )
+        sync_event_occurrences(created + updated)
+        bump_schedule_versions([group_id])
+        # bulk writes send no per-event signals (deletes do)
+        if created:
+            publish_group_change(
+                [group_id], "event.created", {"ids": [event.pk for event in created]}
+            )
+        if updated:
+            publish_group_change(
+                [group_id], "event.updated", {"ids": [event.pk for event in updated]}
+            )
+
+    return created, updated
+
+
+def annotate_schedule_version(groups):
+    """
+    Annotates a group queryset with what a change to the group's schedule
+    moves: the latest `updated_at` of its events and occurrences and the
+    number of its events (which drops on hard deletes).
+    """
+    events = Event.objects.filter(group=OuterRef("pk")).order_by().values("group")
+    occurrences = (
+        EventOccurrence.objects.filter(group=OuterRef("pk")).order_by().values("group")
+    )
+    return groups.annotate(
+        events_updated_at=Subquery(
+            events.annotate(value=Max("updated_at")).values("value")
+        ),
+        events_count=Subquery(events.annotate(value=Count("pk")).values("value")),
+        occurrences_updated_at=Subquery(
+            occurrences.annotate(value=Max("updated_at")).values("value")
+        ),
+    )
+
+
+def get_schedule_last_modified(group):
+    """
+    Returns the last time the schedule of a group annotated by
+    `annotate_schedule_version` changed.
+    """
+    return max(
+        value
+        for value in (
+            group.updated_at,
+            group.events_updated_at,
+            group.occurrences_updated_at,
+        )
+        if value is not None
+    )
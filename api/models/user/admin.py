@@ -3,7 +3,7 @@ from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 
 from unfold.admin import ModelAdmin
 
-from models.user.models import User, Group
+from models.user.models import User, Group, InviteEmail
 
 
 @admin.register(User)
@@ -91,3 +91,10 @@ class GroupAdmin(ModelAdmin):
     ]
     readonly_fields = ["created_at", "updated_at"]
     filter_horizontal = ["students"]
+
+
+@admin.register(InviteEmail)
+class InviteEmailAdmin(ModelAdmin):
+    list_display = ["id", "invite", "status", "attempts", "next_attempt_at", "sent_at"]
+    list_filter = ["status"]
+    readonly_fields = ["invite", "attempts", "sent_at", "last_error"]
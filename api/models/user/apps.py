@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class UserConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "models.user"
+
+    def ready(self):
+        import models.user.signals  # noqa: F401
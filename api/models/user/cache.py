@@ -0,0 +1,141 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from models.user.models import User
+
+# the user fields an authenticated request gets without a query; anything
+# else is loaded on first access
+AUTH_USER_FIELDS = [
+    field.attname
+    for field in User._meta.concrete_fields
+    if field.attname
+    in {
+        "id",
+        "username",
+        "email",
+        "first_name",
+        "last_name",
+        "full_name",
+        "role",
+        "is_active",
+        "is_staff",
+        "is_superuser",
+        "token_epoch",
+    }
+]
+
+# the group fields the cached group id of its members depends on
+GROUP_AUTH_FIELDS = frozenset({"starosta", "starosta_id", "deleted"})
+
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded LRU cache whose entries expire after `ttl`
+    seconds.
+    """
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= now:
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def delete(self, *keys):
+        with self.lock:
+            for key in keys:
+                self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+_user_cache = None
+_user_cache_lock = threading.Lock()
+
+
+def get_auth_user_cache() -> LRUCache:
+    """
+    Cache of user id to (`AUTH_USER_FIELDS` values, group id) used by the
+    JWT authentication. It is per process, so `AUTH_USER_CACHE_TTL` bounds
+    how long other processes may see a stale user.
+    """
+    global _user_cache
+    if _user_cache is None:
+        with _user_cache_lock:
+            if _user_cache is None:
+                _user_cache = LRUCache(
+                    settings.AUTH_USER_CACHE_SIZE, settings.AUTH_USER_CACHE_TTL
+                )
+    return _user_cache
+
+
+def load_auth_user(user_id, group_pk=None):
+    """
+    Returns the cached entry of `user_id`, loading it on a miss, or None
+    if the user does not exist.
+
+    :param group_pk: the group id when already known (e.g. from a token
+        claim), saving the group lookup on a miss
+    """
+    cache = get_auth_user_cache()
+    entry = cache.get(user_id)
+    if entry is not None:
+        return entry
+
+    values = (
+        User.objects.filter(pk=user_id).values_list(*AUTH_USER_FIELDS).first()
+    )
+    if values is None:
+        return None
+    if group_pk is None:
+        user = User.from_db("default", AUTH_USER_FIELDS, values)
+        group_pk = user.resolve_group_pk()
+    entry = (values, group_pk)
+    cache.set(user_id, entry)
+    return entry
+
+
+def build_auth_user(entry) -> User:
+    """
+    Builds a fresh, partially loaded user from a cache entry, so requests
+    never share (and mutate) one instance.
+    """
+    values, group_pk = entry
+    user = User.from_db("default", AUTH_USER_FIELDS, values)
+    user._group_pk_cache = group_pk
+    return user
+
+
+def invalidate_auth_users(user_ids=None) -> None:
+    """
+    Drops the given users from the cache, or every user if None.
+    """
+    cache = get_auth_user_cache()
+    if user_ids is None:
+        cache.clear()
+    else:
+        cache.delete(*user_ids)
@@ -14,3 +14,23 @@ class UserRoleChoices(object):
     @classmethod
     def to_list(cls):
         return [choice[0] for choice in cls.get_choices()]
+
+
+class InviteEmailStatusChoices(object):
+    PENDING = "Pending"
+    SENDING = "Sending"
+    SENT = "Sent"
+    FAILED = "Failed"
+
+    @classmethod
+    def get_choices(cls):
+        return (
+            (cls.PENDING, "Pending"),
+            (cls.SENDING, "Sending"),
+            (cls.SENT, "Sent"),
+            (cls.FAILED, "Failed"),
+        )
+
+    @classmethod
+    def to_list(cls):
+        return [choice[0] for choice in cls.get_choices()]
@@ -0,0 +1,148 @@
+from contextlib import contextmanager
+from datetime import time, timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+
+from core.api.auth.authentication import get_refresh_token
+from core.api.helpers.parsers import FastJSONParser
+from core.api.helpers.renderers import FastJSONRenderer, PreRenderedJSONRenderer
+from models.common.benchmark import format_table, measure, rolled_back
+from models.event.models import Event
+from models.user.choices import UserRoleChoices
+from models.user.models import User
+
+# renderer and parser of each setup
+JSON_CLASSES = {
+    "stdlib": (PreRenderedJSONRenderer, JSONParser),
+    "orjson": (FastJSONRenderer, FastJSONParser),
+}
+
+
+def get_path(cls):
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+@contextmanager
+def use_json_classes(renderer_class, parser_class):
+    """
+    Renders and parses with the given classes in every view that takes
+    them from `APIView`, and in pre-rendered payloads.
+    """
+    rest_framework = {
+        **settings.REST_FRAMEWORK,
+        "DEFAULT_RENDERER_CLASSES": [get_path(renderer_class)],
+        "DEFAULT_PARSER_CLASSES": [get_path(parser_class)],
+    }
+    with (
+        override_settings(REST_FRAMEWORK=rest_framework),
+        mock.patch.object(APIView, "renderer_classes", [renderer_class]),
+        mock.patch.object(APIView, "parser_classes", [parser_class]),
+    ):
+        yield
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the stdlib and orjson JSON renderer and parser on the group "
+        "and events endpoints, with cold and cached payloads. Runs in a "
+        "transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--students", type=int, default=300, help="Students in the group."
+        )
+        parser.add_argument(
+            "--events", type=int, default=100, help="Events of the group."
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=10, help="Timed requests per case."
+        )
+
+    def handle(self, *args, **options):
+        rows = []
+        contents = {}
+        with rolled_back():
+            cases = self.get_cases(options["students"], options["events"])
+            for name, (renderer_class, parser_class) in JSON_CLASSES.items():
+                with use_json_classes(renderer_class, parser_class):
+                    for case, func, setup in cases:
+                        if setup is not None:
+                            setup()
+                        response = func()
+                        assert response.status_code < 300, response.content
+                        contents.setdefault(case, set()).add(response.content)
+                        stats = measure(func, options["repeat"], setup)
+                        rows.append([case, name, stats["ms"], stats["cpu_ms"]])
+
+        for case, responses in contents.items():
+            # created events may get new ids
+            if not case.startswith("POST"):
+                assert len(responses) == 1, f"{case} differs between renderers"
+        self.stdout.write(format_table(["case", "JSON", "ms", "CPU ms"], rows))
+
+    def get_cases(self, students_count, events_count):
+        today = timezone.now().date()
+        starosta = User.objects.create(
+            email="bench-starosta@example.com",
+            first_name="Bench",
+            last_name="Starosta",
+            role=UserRoleChoices.STAROSTA,
+        )
+        group = starosta.group
+        students = [
+            User(
+                email=f"bench-student{index}@example.com",
+                first_name="Bench",
+                last_name=str(index),
+            )
+            for index in range(students_count)
+        ]
+        for student in students:
+            student.normalize()
+        group.students.add(*User.objects.bulk_create(students, batch_size=500))
+        for index in range(events_count):
+            Event.objects.create(
+                group=group,
+                name=f"Event {index}",
+                url="https://meet.example.com",
+                date=today + timedelta(days=index % 7),
+                time=time(8 + index % 10, index % 60),
+            )
+
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {get_refresh_token(starosta).access_token}"
+        )
+        group_url = f"/api/user/groups/{group.pk}"
+        events_url = f"{group_url}/events?limit=100"
+        event = {
+            "name": "Lecture",
+            "url": "https://meet.example.com",
+            "date": str(today),
+            "time": "10:00",
+        }
+
+        def clear_cache():
+            caches["default"].clear()
+
+        def create_event():
+            # the event is rolled back, so the GETs see the same events
+            with rolled_back():
+                return client.post(f"{group_url}/events", event, format="json")
+
+        return [
+            (f"GET {group_url}", lambda: client.get(group_url), clear_cache),
+            (f"GET {group_url}, cached", lambda: client.get(group_url), None),
+            (f"GET {events_url}", lambda: client.get(events_url), clear_cache),
+            (f"GET {events_url}, cached", lambda: client.get(events_url), None),
+            (f"POST {group_url}/events", create_event, None),
+        ]
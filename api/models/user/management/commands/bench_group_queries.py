@@ -0,0 +1,100 @@
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIClient
+
+from core.api.auth.authentication import get_refresh_token
+from core.api.user.serializers import GroupSerializer
+from models.common.benchmark import format_table, measure, rolled_back
+from models.user.cache import get_auth_user_cache
+from models.user.choices import UserRoleChoices
+from models.user.models import User, Group
+
+ENDPOINTS = [
+    "/api/user/your-group",
+    "/api/user/groups/{pk}",
+    "/api/user/profile",
+    "/api/user/groups/{pk}/events",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the queries, time and peak memory of serializing a group and "
+        "of the group endpoints for several roster sizes. Runs in a "
+        "transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default="30,300,3000",
+            help="Comma-separated roster sizes.",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Timed runs per case."
+        )
+
+    def handle(self, *args, **options):
+        rows = []
+        for size in [int(size) for size in options["sizes"].split(",")]:
+            with rolled_back():
+                rows.extend(self.run(size, options["repeat"]))
+        self.stdout.write(
+            format_table(["case", "students", "ms", "queries", "peak KB"], rows)
+        )
+
+    def run(self, size, repeat):
+        starosta = User.objects.create(
+            email="bench-starosta@example.com",
+            first_name="Bench",
+            last_name="Starosta",
+            role=UserRoleChoices.STAROSTA,
+        )
+        group = starosta.group
+        students = [
+            User(
+                email=f"bench-student{index}@example.com",
+                first_name="Bench",
+                last_name=str(index),
+            )
+            for index in range(size)
+        ]
+        for student in students:
+            student.normalize()
+        group.students.add(*User.objects.bulk_create(students, batch_size=500))
+
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {get_refresh_token(starosta).access_token}"
+        )
+
+        def clear_caches():
+            caches["default"].clear()
+            get_auth_user_cache().clear()
+
+        cases = [
+            # how every group was serialized before: full user rows, loaded lazily
+            (
+                "serialize, lazy (before)",
+                lambda: GroupSerializer(Group.objects.get(pk=group.pk)).data,
+                None,
+            ),
+            (
+                "serialize, with_members()",
+                lambda: GroupSerializer(
+                    Group.objects.with_members().get(pk=group.pk)
+                ).data,
+                None,
+            ),
+        ]
+        for endpoint in ENDPOINTS:
+            url = endpoint.format(pk=group.pk)
+            cases.append(
+                (f"GET {endpoint}", lambda url=url: client.get(url), clear_caches)
+            )
+
+        rows = []
+        for name, func, setup in cases:
+            stats = measure(func, repeat, setup)
+            rows.append([name, size, stats["ms"], stats["queries"], stats["peak_kb"]])
+        return rows
@@ -0,0 +1,119 @@
+from datetime import date, time
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from core.api.event.serializers import EventSerializer
+from core.api.helpers.renderers import (
+    FastJSONRenderer,
+    PreRenderedJSON,
+    PreRenderedJSONRenderer,
+)
+from core.api.user.serializers import GroupSerializer
+from models.common.benchmark import format_table, measure, rolled_back
+from models.event.models import Event
+from models.user.choices import UserRoleChoices
+from models.user.models import User, Group
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the time and peak memory of rendering the response envelope "
+        "of a large roster and of an events page, encoded on every response "
+        "as before, or spliced in pre-rendered. Runs in a transaction that "
+        "is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--students", type=int, default=2000, help="Students in the roster."
+        )
+        parser.add_argument(
+            "--events", type=int, default=100, help="Events in the page."
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=20, help="Timed renders per case."
+        )
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            payloads = self.build_payloads(options["students"], options["events"])
+        rows = []
+        for name, data in payloads:
+            rows.extend(self.run(name, data, options["repeat"]))
+        self.stdout.write(
+            format_table(["payload", "case", "µs", "peak KB", "KB"], rows)
+        )
+
+    def build_payloads(self, students_count, events_count):
+        starosta = User.objects.create(
+            email="bench-starosta@example.com",
+            first_name="Bench",
+            last_name="Starosta",
+            role=UserRoleChoices.STAROSTA,
+        )
+        group = starosta.group
+        students = [
+            User(
+                email=f"bench-student{index}@example.com",
+                first_name="Bench",
+                last_name=str(index),
+            )
+            for index in range(students_count)
+        ]
+        for student in students:
+            student.normalize()
+        group.students.add(*User.objects.bulk_create(students, batch_size=500))
+        roster = GroupSerializer(Group.objects.with_members().get(pk=group.pk)).data
+
+        events = Event.objects.bulk_create(
+            Event(
+                group=group,
+                name=f"Event {index}",
+                url="https://meet.example.com",
+                date=date(2030, 1, 7),
+                weekday=date(2030, 1, 7).weekday(),
+                time=time(8 + index % 10, index % 60),
+            )
+            for index in range(events_count)
+        )
+        page = {"next": None, "results": EventSerializer(events, many=True).data}
+        return [("roster", roster), ("events page", page)]
+
+    def run(self, name, data, repeat):
+        def envelope(data):
+            return {"data": data, "message": None}
+
+        expected = JSONRenderer().render(envelope(data))
+        cached = {
+            renderer_class: PreRenderedJSON(renderer_class().render(data))
+            for renderer_class in [PreRenderedJSONRenderer, FastJSONRenderer]
+        }
+        cases = [
+            ("JSONRenderer (before)", JSONRenderer, data),
+            ("PreRenderedJSONRenderer", PreRenderedJSONRenderer, data),
+            (
+                "PreRenderedJSONRenderer, spliced",
+                PreRenderedJSONRenderer,
+                cached[PreRenderedJSONRenderer],
+            ),
+            ("FastJSONRenderer", FastJSONRenderer, data),
+            ("FastJSONRenderer, spliced", FastJSONRenderer, cached[FastJSONRenderer]),
+        ]
+
+        rows = []
+        for case, renderer_class, value in cases:
+            renderer = renderer_class()
+            content = renderer.render(envelope(value))
+            assert content == expected, f"{case} renders a different {name}"
+            stats = measure(lambda: renderer.render(envelope(value)), repeat)
+            rows.append(
+                [
+                    name,
+                    case,
+                    stats["ms"] * 1000,
+                    stats["peak_kb"],
+                    len(content) / 1024,
+                ]
+            )
+        return rows
@@ -0,0 +1,101 @@
+from django.contrib.auth import authenticate
+from django.contrib.auth.models import update_last_login
+from django.core.management.base import BaseCommand
+from rest_framework import status
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.views import APIView
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.api.auth.throttling import get_bucket_store
+from models.common.benchmark import format_table, measure, rolled_back
+from models.user.models import User
+
+PASSWORD = "bench-password-1"
+
+
+class LoginBeforeAPIView(APIView):
+    """
+    The login pipeline before it was reworked: two lookups, the password
+    hashed by both `check_password` and `authenticate`, and a full
+    `last_login` save on every login.
+    """
+
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        users = User.objects.filter(email__iexact=request.data.get("email"))
+        if not users.exists():
+            return Response(status=status.HTTP_400_BAD_REQUEST)
+        user = users.first()
+        if not user.check_password(request.data.get("password")) or not user.is_active:
+            return Response(status=status.HTTP_400_BAD_REQUEST)
+        user_auth = authenticate(
+            username=user.username, password=request.data.get("password")
+        )
+        update_last_login(None, user_auth)
+        refresh = RefreshToken.for_user(user_auth)
+        return Response({"access": str(refresh.access_token), "refresh": str(refresh)})
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the CPU time and queries of a successful login before and "
+        "after the single-hash login pipeline, with the configured password "
+        "hasher. Runs in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Timed logins per case."
+        )
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            rows = self.run(options["repeat"])
+        self.stdout.write(
+            format_table(
+                ["case", "ms", "CPU ms", "logins/s per core", "queries"], rows
+            )
+        )
+
+    def run(self, repeat):
+        user = User(
+            email="bench-login@example.com", first_name="Bench", last_name="Login"
+        )
+        user.set_password(PASSWORD)
+        user.save()
+        credentials = {"email": user.email, "password": PASSWORD}
+
+        factory = APIRequestFactory()
+        before_view = LoginBeforeAPIView.as_view()
+        client = APIClient()
+
+        def login_before():
+            request = factory.post("/api/auth/login", credentials, format="json")
+            response = before_view(request)
+            assert response.status_code == 200, response.data
+
+        def login():
+            response = client.post("/api/auth/login", credentials, format="json")
+            assert response.status_code == 200, response.content
+
+        def reset_throttles():
+            # every login comes from the same address and email
+            get_bucket_store().clear()
+
+        rows = []
+        for name, func in [("before", login_before), ("single hash", login)]:
+            stats = measure(func, repeat, reset_throttles)
+            rows.append(
+                [
+                    name,
+                    stats["ms"],
+                    stats["cpu_ms"],
+                    1000 / stats["cpu_ms"],
+                    stats["queries"],
+                ]
+            )
+        return rows
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from models.user.models import Group
+from models.user.roster import (
+    ROSTER_CHUNK_SIZE,
+    RosterError,
+    RosterRowStatus,
+    import_roster,
+    iter_roster_rows,
+)
+
+
+class Command(BaseCommand):
+    help = "Invites the students of a CSV or XLSX roster to a group."
+
+    def add_arguments(self, parser):
+        parser.add_argument("group", type=int, help="Id of the group.")
+        parser.add_argument("path", help="Path to the .csv or .xlsx roster.")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=ROSTER_CHUNK_SIZE,
+            help="Number of rows written per batch.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            group = Group.objects.alive().get(pk=options["group"])
+        except Group.DoesNotExist:
+            raise CommandError(f"Group {options['group']} not found.")
+
+        try:
+            with open(options["path"], "rb") as roster:
+                report = import_roster(
+                    group,
+                    iter_roster_rows(roster, options["path"]),
+                    chunk_size=options["chunk_size"],
+                )
+        except (OSError, RosterError) as e:
+            raise CommandError(str(e))
+
+        created = 0
+        for row in report:
+            if row["status"] == RosterRowStatus.CREATED:
+                created += 1
+            else:
+                self.stdout.write(
+                    f"Row {row['row']} ({row['email']}): {row.get('error', row['status'])}"
+                )
+        self.stdout.write(
+            self.style.SUCCESS(f"Invited {created} of {len(report)} students.")
+        )
@@ -0,0 +1,194 @@
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.api.auth.authentication import get_refresh_token
+from models.common.benchmark import format_table
+from models.user.models import User
+
+PATHS = [
+    "/api/user/your-group",
+    "/api/user/groups/{group}",
+    "/api/user/groups/{group}/events",
+    "/api/user/profile",
+]
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+async def read_response(reader):
+    """
+    Reads one HTTP/1.1 response.
+
+    :return: tuple of the status code and whether the server closes the
+        connection after it
+    """
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.split(b"\r\n")
+    status = int(lines[0].split(b" ", 2)[1])
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(b":")
+        headers[name.strip().lower()] = value.strip().lower()
+
+    if headers.get(b"transfer-encoding") == b"chunked":
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.readexactly(int(headers.get(b"content-length", 0)))
+    return status, headers.get(b"connection") == b"close"
+
+
+async def run_client(host, port, requests, stop, timeout, results):
+    """
+    Sends `requests` in turn over one keep-alive connection until `stop`,
+    reconnecting when the server closes it, and appends the path, status
+    (None on a failure) and latency of each to `results`.
+    """
+    connection = None
+    index = 0
+    while time.perf_counter() < stop:
+        path, request = requests[index % len(requests)]
+        index += 1
+        start = time.perf_counter()
+        try:
+            if connection is None:
+                connection = await asyncio.wait_for(
+                    asyncio.open_connection(host, port), timeout
+                )
+            reader, writer = connection
+            writer.write(request)
+            await writer.drain()
+            status, close = await asyncio.wait_for(read_response(reader), timeout)
+        except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            status, close = None, True
+        results.append((path, status, time.perf_counter() - start))
+        if close and connection is not None:
+            connection[1].close()
+            connection = None
+    if connection is not None:
+        connection[1].close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Load tests a running server with concurrent keep-alive clients that "
+        "GET the read endpoints as the given user, and reports requests per "
+        "second and p50/p99 latency per path. See the README for comparing "
+        "the WSGI and ASGI servers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "paths",
+            nargs="*",
+            help="Paths to request, in turn; {group} is the user's group id. "
+            "Defaults to the group, events and profile reads.",
+        )
+        parser.add_argument(
+            "--url", default="http://127.0.0.1:8000", help="Server to test."
+        )
+        parser.add_argument(
+            "--email", required=True, help="User to issue the access token for."
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=100, help="Concurrent connections."
+        )
+        parser.add_argument(
+            "--duration", type=float, default=10, help="Seconds to run."
+        )
+        parser.add_argument(
+            "--timeout", type=float, default=30, help="Seconds per request."
+        )
+
+    def handle(self, *args, **options):
+        url = urlsplit(options["url"])
+        if url.scheme != "http" or not url.hostname:
+            raise CommandError("--url must be a plain http:// URL.")
+        user = User.objects.filter(email=options["email"].lower()).first()
+        if user is None:
+            raise CommandError(f"No user with the email {options['email']}.")
+
+        token = get_refresh_token(user).access_token
+        paths = [
+            path.format(group=user.group_pk) for path in options["paths"] or PATHS
+        ]
+        requests = [
+            (
+                path,
+                (
+                    f"GET {path} HTTP/1.1\r\n"
+                    f"Host: {url.netloc}\r\n"
+                    f"Authorization: Bearer {token}\r\n"
+                    "\r\n"
+                ).encode(),
+            )
+            for path in paths
+        ]
+
+        results = []
+        elapsed = asyncio.run(
+            self.run(
+                url.hostname,
+                url.port or 80,
+                requests,
+                options["concurrency"],
+                options["duration"],
+                options["timeout"],
+                results,
+            )
+        )
+
+        rows = []
+        for path in [*paths, None]:
+            selected = [
+                (status, latency)
+                for result_path, status, latency in results
+                if path in (None, result_path)
+            ]
+            if not selected:
+                continue
+            latencies = [latency for _, latency in selected]
+            rows.append(
+                [
+                    path or "all",
+                    len(selected) / elapsed,
+                    percentile(latencies, 0.5) * 1000,
+                    percentile(latencies, 0.99) * 1000,
+                    sum(1 for status, _ in selected if status != 200),
+                ]
+            )
+        self.stdout.write(
+            f"{options['concurrency']} connections, {elapsed:.1f} s, {url.netloc}"
+        )
+        self.stdout.write(
+            format_table(["path", "req/s", "p50 ms", "p99 ms", "errors"], rows)
+        )
+
+    async def run(self, host, port, requests, concurrency, duration, timeout, results):
+        start = time.perf_counter()
+        stop = start + duration
+        clients = []
+        for index in range(concurrency):
+            # every client starts on a different path
+            offset = index % len(requests)
+            clients.append(
+                run_client(
+                    host,
+                    port,
+                    requests[offset:] + requests[:offset],
+                    stop,
+                    timeout,
+                    results,
+                )
+            )
+        await asyncio.gather(*clients)
+        return time.perf_counter() - start
@@ -0,0 +1,48 @@
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from models.user.outbox import check_invite_url, deliver_invite_emails
+
+
+class Command(BaseCommand):
+    help = "Sends queued invite emails, batch by batch."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.INVITE_EMAIL_BATCH_SIZE,
+            help="Number of emails claimed and sent over one connection.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds to wait when the outbox has nothing due.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the due emails and exit instead of polling.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            check_invite_url()
+        except ImproperlyConfigured as e:
+            raise CommandError(str(e))
+
+        while True:
+            claimed, sent = deliver_invite_emails(options["batch_size"])
+            if claimed:
+                self.stdout.write(f"Sent {sent} of {claimed} invite emails.")
+                continue
+            if options["once"]:
+                break
+            try:
+                time.sleep(options["interval"])
+            except KeyboardInterrupt:
+                break
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.4 on 2026-10-18 08:02
+
+import uuid
+
+from django.db import migrations, models
+
+
+def generate_calendar_tokens(apps, schema_editor):
+    Group = apps.get_model('user', 'Group')
+    for group in Group.objects.all():
+        group.calendar_token = uuid.uuid4()
+        group.save(update_fields=['calendar_token'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0003_userinvite'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='group',
+            name='calendar_token',
+            field=models.UUIDField(editable=False, null=True),
+        ),
+        migrations.RunPython(generate_calendar_tokens, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='group',
+            name='calendar_token',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+    ]
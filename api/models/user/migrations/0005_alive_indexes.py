@@ -0,0 +1,21 @@
+# Generated by Django 5.1.4 on 2026-10-18 07:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0004_group_calendar_token'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='group',
+            index=models.Index(condition=models.Q(('deleted', False)), fields=['starosta'], name='group_alive_starosta'),
+        ),
+        migrations.AddIndex(
+            model_name='userinvite',
+            index=models.Index(condition=models.Q(('deleted', False)), fields=['user'], name='userinvite_alive_user'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+
+
+def fill_search_name(apps, schema_editor):
+    User = apps.get_model("user", "User")
+    batch = []
+    for user in User.objects.only("pk", "full_name").iterator(chunk_size=BATCH_SIZE):
+        user.search_name = " ".join(user.full_name.split()).lower()
+        batch.append(user)
+        if len(batch) >= BATCH_SIZE:
+            User.objects.bulk_update(batch, ["search_name"])
+            batch = []
+    User.objects.bulk_update(batch, ["search_name"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0005_alive_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='search_name',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.RunPython(fill_search_name, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('is_active', True), ('role', 'Student')), fields=['search_name', 'id'], name='user_student_search_name'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('is_active', True), ('role', 'Student')), fields=['email'], name='user_student_email'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.4 on 2026-10-18 07:45
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0006_user_search_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InviteEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True)),
+                ('deleted', models.BooleanField(default=False)),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Sending', 'Sending'), ('Sent', 'Sent'), ('Failed', 'Failed')], default='Pending', max_length=255)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('claim_token', models.UUIDField(blank=True, editable=False, null=True)),
+                ('locked_until', models.DateTimeField(blank=True, null=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('invite', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='emails', to='user.userinvite')),
+            ],
+            options={
+                'verbose_name': 'Invite email',
+                'verbose_name_plural': 'Invite emails',
+                'indexes': [models.Index(condition=models.Q(('status__in', ['Pending', 'Sending'])), fields=['next_attempt_at'], name='inviteemail_due')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-18 08:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0008_user_email_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='token_epoch',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
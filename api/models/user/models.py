@@ -1,10 +1,22 @@
 import uuid
 
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 from django.contrib.auth.models import AbstractUser
 
-from models.user.choices import UserRoleChoices
-from models.common.models import BaseModelFields
+from models.user.choices import UserRoleChoices, InviteEmailStatusChoices
+from models.common.models import BaseModelFields, BaseModelQuerySet
+
+# the user fields a serialized group shows for its members
+GROUP_MEMBER_FIELDS = (
+    "id",
+    "username",
+    "email",
+    "first_name",
+    "last_name",
+    "full_name",
+    "role",
+)
 
 
 class User(AbstractUser):
@@ -14,10 +26,23 @@ class User(AbstractUser):
         choices=UserRoleChoices.get_choices(),
         default=UserRoleChoices.STUDENT,
     )
+    # lowercased full name, so name searches are plain index range scans
+    search_name = models.CharField(max_length=255, blank=True, editable=False)
+    # issued tokens carry the epoch they were issued in; bumping it revokes
+    # every token of the user
+    token_epoch = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         verbose_name = "User"
         verbose_name_plural = "Users"
+        indexes = [
+            models.Index(
+                fields=["search_name", "id"],
+                condition=models.Q(role=UserRoleChoices.STUDENT, is_active=True),
+                name="user_student_search_name",
+            ),
+            models.Index(fields=["email"], name="user_email"),
+        ]
 
     def __str__(self):
         return self.username
@@ -28,27 +53,104 @@ class User(AbstractUser):
 
     @property
     def students(self):
-        if self.is_starosta:
-            group, created = self.starosta_group.get_or_create(starosta=self)
+        group = self.group
+        if self.is_starosta and group:
             return group.get_students()
         return None
 
     @property
     def group(self):
+        """
+        The group the user leads or studies in, loaded once per user
+        instance (and so once per request for `request.user`).
+        """
+        if not hasattr(self, "_group_cache"):
+            self._group_cache = self.resolve_group()
+        return self._group_cache
+
+    @property
+    def group_pk(self):
+        if hasattr(self, "_group_cache"):
+            return self._group_cache.pk if self._group_cache else None
+        if not hasattr(self, "_group_pk_cache"):
+            self._group_pk_cache = self.resolve_group_pk()
+        return self._group_pk_cache
+
+    async def aget_group(self):
+        """
+        Async version of `group`.
+        """
+        if not hasattr(self, "_group_cache"):
+            self._group_cache = None
+            if self.pk is not None:
+                self._group_cache = await self.get_groups().with_members().afirst()
+        return self._group_cache
+
+    async def aget_group_pk(self):
+        """
+        Async version of `group_pk`.
+        """
+        if hasattr(self, "_group_cache") or hasattr(self, "_group_pk_cache"):
+            return self.group_pk
+        self._group_pk_cache = None
+        if self.pk is not None:
+            self._group_pk_cache = (
+                await self.get_groups().values_list("pk", flat=True).afirst()
+            )
+        return self._group_pk_cache
+
+    def get_groups(self):
+        groups = Group.objects.alive()
         if self.is_starosta:
-            group, created = self.starosta_group.get_or_create(starosta=self)
-            return group
-        else:
-            group = self.students_group.first()
-            if group:
-                return group
-        return None
+            return groups.filter(starosta=self)
+        return groups.filter(students=self)
+
+    def resolve_group(self):
+        if self.pk is None:
+            return None
+        return self.get_groups().with_members().first()
+
+    def resolve_group_pk(self):
+        if self.pk is None:
+            return None
+        return self.get_groups().values_list("pk", flat=True).first()
+
+    def clear_group_cache(self):
+        self.__dict__.pop("_group_cache", None)
+        self.__dict__.pop("_group_pk_cache", None)
+
+    def ensure_starosta_group(self):
+        """
+        Creates the group of a starosta unless they already lead one.
+        """
+        if not Group.objects.alive().filter(starosta=self).exists():
+            Group.objects.create(starosta=self)
+            self.clear_group_cache()
+
+    def set_password(self, raw_password):
+        super().set_password(raw_password)
+        self.token_epoch += 1
+
+    def revoke_tokens(self):
+        """
+        Invalidates every access and refresh token issued to the user.
+        """
+        self.token_epoch += 1
+        self.save(update_fields=["token_epoch"])
+
+    @staticmethod
+    def normalize_search(value):
+        return " ".join((value or "").split()).lower()
 
     @staticmethod
     def check_email_unique(email):
         return User.objects.filter(email=email.lower()).exists()
 
-    def save(self, *args, **kwargs):
+    def normalize(self):
+        """
+        Cleans up the derived and free-form fields; `save` calls it, and
+        so must anything that writes users around it (e.g. `bulk_create`).
+        """
         if self.is_superuser:
             self.role = UserRoleChoices.ADMIN
         if self.first_name is not None:
@@ -61,12 +163,18 @@ class User(AbstractUser):
             )
         else:
             self.full_name = ""
+        self.search_name = self.normalize_search(self.full_name)
         self.email = self.email.replace(" ", "").replace("\t", "").lower()
         if not self.username:
             self.username = str(uuid.uuid4())
-        if self.is_starosta and not self.starosta_group.exists():
-            Group.objects.create(starosta=self)
-        return super().save(*args, **kwargs)
+
+    def save(self, *args, **kwargs):
+        self.normalize()
+        result = super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        if self.is_starosta and (update_fields is None or "role" in update_fields):
+            self.ensure_starosta_group()
+        return result
 
 
 class UserInvite(BaseModelFields):
@@ -76,13 +184,88 @@ class UserInvite(BaseModelFields):
     class Meta:
         verbose_name = "User invite"
         verbose_name_plural = "User invites"
+        indexes = [
+            models.Index(
+                fields=["user"],
+                condition=models.Q(deleted=False),
+                name="userinvite_alive_user",
+            ),
+        ]
 
     def __str__(self):
         return self.user.email
 
     def save(self, *args, **kwargs):
-        # TODO: Send invite email
-        return super().save(*args, **kwargs)
+        creating = self._state.adding
+        with transaction.atomic():
+            result = super().save(*args, **kwargs)
+            if creating:
+                InviteEmail.objects.create(invite=self)
+        return result
+
+
+class InviteEmail(BaseModelFields):
+    """
+    Outbox entry of an invite email, sent by the `send_invite_emails`
+    worker rather than during the request that created the invite.
+    """
+
+    invite = models.ForeignKey(UserInvite, on_delete=models.CASCADE, related_name="emails")
+    status = models.CharField(
+        max_length=255,
+        choices=InviteEmailStatusChoices.get_choices(),
+        default=InviteEmailStatusChoices.PENDING,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    # set while a worker holds the row; a crashed worker's claim expires
+    claim_token = models.UUIDField(null=True, blank=True, editable=False)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        verbose_name = "Invite email"
+        verbose_name_plural = "Invite emails"
+        indexes = [
+            models.Index(
+                fields=["next_attempt_at"],
+                condition=models.Q(
+                    status__in=[
+                        InviteEmailStatusChoices.PENDING,
+                        InviteEmailStatusChoices.SENDING,
+                    ]
+                ),
+                name="inviteemail_due",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.invite} ({self.status})"
+
+
+def get_group_members_prefetch():
+    return models.Prefetch(
+        "students", queryset=User.objects.only(*GROUP_MEMBER_FIELDS)
+    )
+
+
+def prefetch_group_members(groups):
+    """
+    Loads the starosta and the members of already fetched groups.
+    """
+    models.prefetch_related_objects(groups, "starosta", get_group_members_prefetch())
+
+
+class GroupQuerySet(BaseModelQuerySet):
+    def with_members(self):
+        """
+        Loads everything a serialized group needs in two queries, fetching
+        only the member fields it shows.
+        """
+        return self.select_related("starosta").prefetch_related(
+            get_group_members_prefetch()
+        )
 
 
 class Group(BaseModelFields):
@@ -91,10 +274,20 @@ class Group(BaseModelFields):
         User, on_delete=models.CASCADE, related_name="starosta_group"
     )
     students = models.ManyToManyField(User, related_name="students_group", blank=True)
+    calendar_token = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+
+    objects = GroupQuerySet.as_manager()
 
     class Meta:
         verbose_name = "Group"
         verbose_name_plural = "Groups"
+        indexes = [
+            models.Index(
+                fields=["starosta"],
+                condition=models.Q(deleted=False),
+                name="group_alive_starosta",
+            ),
+        ]
 
     def __str__(self):
         return self.name
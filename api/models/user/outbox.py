@@ -0,0 +1,169 @@
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Q
+from django.utils import timezone
+
+from models.user.models import InviteEmail
+from models.user.choices import InviteEmailStatusChoices
+
+# how long a claimed batch stays reserved for the worker that claimed it
+CLAIM_LEASE = timedelta(minutes=5)
+
+INVITE_SUBJECT = "Запрошення до StarostaHub"
+INVITE_BODY = (
+    "Вітаємо{name}!\n\n"
+    "Вас запрошено до групи «{group}» у StarostaHub.\n"
+    "Щоб приєднатися, перейдіть за посиланням:\n{url}\n"
+)
+
+
+def get_due_filter(now):
+    return Q(status=InviteEmailStatusChoices.PENDING, next_attempt_at__lte=now) | Q(
+        status=InviteEmailStatusChoices.SENDING, locked_until__lt=now
+    )
+
+
+def claim_invite_emails(batch_size: int) -> list:
+    """
+    Reserves up to `batch_size` due outbox rows for this worker.
+
+    The claiming UPDATE repeats the due filter, so when several workers
+    race for the same rows each row goes to exactly one of them.
+    """
+    now = timezone.now()
+    due = list(
+        InviteEmail.objects.filter(get_due_filter(now))
+        .order_by("next_attempt_at")
+        .values_list("pk", flat=True)[:batch_size]
+    )
+    if not due:
+        return []
+
+    token = uuid.uuid4()
+    InviteEmail.objects.filter(get_due_filter(now), pk__in=due).update(
+        status=InviteEmailStatusChoices.SENDING,
+        claim_token=token,
+        locked_until=now + CLAIM_LEASE,
+        updated_at=now,
+    )
+    return list(
+        InviteEmail.objects.filter(claim_token=token)
+        .select_related("invite__user")
+        .prefetch_related("invite__user__students_group")
+    )
+
+
+def check_invite_url() -> None:
+    """
+    Raises ImproperlyConfigured unless `INVITE_URL` is set: without it
+    invite emails would carry no working link.
+    """
+    if not settings.INVITE_URL or "{code}" not in settings.INVITE_URL:
+        raise ImproperlyConfigured(
+            "INVITE_URL must be set to the client's invite page, with a {code} "
+            "placeholder, to send invite emails."
+        )
+
+
+def build_invite_message(email: InviteEmail) -> EmailMessage:
+    user = email.invite.user
+    group = next(iter(user.students_group.all()), None)
+    return EmailMessage(
+        subject=INVITE_SUBJECT,
+        body=INVITE_BODY.format(
+            name=f", {user.first_name}" if user.first_name else "",
+            group=group.name if group else "",
+            url=settings.INVITE_URL.format(code=email.invite.code),
+        ),
+        to=[user.email],
+    )
+
+
+def get_retry_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=settings.INVITE_EMAIL_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def mark_failed_attempt(email: InviteEmail, error: Exception, now) -> None:
+    email.attempts += 1
+    email.last_error = f"{type(error).__name__}: {error}"
+    if email.attempts >= settings.INVITE_EMAIL_MAX_ATTEMPTS:
+        email.status = InviteEmailStatusChoices.FAILED
+    else:
+        email.status = InviteEmailStatusChoices.PENDING
+        email.next_attempt_at = now + get_retry_delay(email.attempts)
+
+
+def send_invite_emails(emails: list, connection=None) -> int:
+    """
+    Sends claimed outbox rows over one connection and records the result
+    of every row: sent, rescheduled with backoff, or failed for good.
+
+    :return: number of emails sent
+    """
+    if not emails:
+        return 0
+
+    token = emails[0].claim_token
+    connection = connection or get_connection()
+    sent = 0
+    now = timezone.now()
+    try:
+        connection.open()
+    except Exception as e:
+        for email in emails:
+            mark_failed_attempt(email, e, now)
+    else:
+        try:
+            for email in emails:
+                try:
+                    message = build_invite_message(email)
+                    message.connection = connection
+                    message.send()
+                except Exception as e:
+                    mark_failed_attempt(email, e, timezone.now())
+                else:
+                    email.attempts += 1
+                    email.status = InviteEmailStatusChoices.SENT
+                    email.sent_at = timezone.now()
+                    email.last_error = ""
+                    sent += 1
+        finally:
+            connection.close()
+
+    for email in emails:
+        email.claim_token = None
+        email.locked_until = None
+        email.updated_at = timezone.now()
+    # rows whose lease ran out may have been claimed by another worker since,
+    # and its result must not be overwritten with ours
+    InviteEmail.objects.filter(claim_token=token).bulk_update(
+        emails,
+        [
+            "status",
+            "attempts",
+            "next_attempt_at",
+            "claim_token",
+            "locked_until",
+            "sent_at",
+            "last_error",
+            "updated_at",
+        ],
+    )
+    return sent
+
+
+def deliver_invite_emails(batch_size: int = None) -> tuple:
+    """
+    Claims and sends one batch of due invite emails.
+
+    :return: tuple of the number of claimed and sent emails
+    """
+    # checked before claiming, so a misconfigured worker never burns the
+    # attempts of due emails
+    check_invite_url()
+    emails = claim_invite_emails(batch_size or settings.INVITE_EMAIL_BATCH_SIZE)
+    return len(emails), send_invite_emails(emails)
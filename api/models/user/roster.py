@@ -0,0 +1,181 @@
+import csv
+import io
+from itertools import islice
+from typing import Iterable, Iterator
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+
+from models.user.models import User, Group, UserInvite, InviteEmail
+from models.user.choices import UserRoleChoices
+from models.user.utils import touch_groups
+
+ROSTER_CHUNK_SIZE = 500
+ROSTER_MAX_ROWS = 5000
+ROSTER_COLUMNS = ("email", "first_name", "last_name")
+
+
+class RosterError(ValueError):
+    pass
+
+
+class RosterRowStatus(object):
+    CREATED = "created"
+    EXISTS = "exists"
+    DUPLICATE = "duplicate"
+    INVALID = "invalid"
+
+
+def get_column_indexes(header) -> dict:
+    names = [str(name or "").strip().lower() for name in header]
+    if "email" not in names:
+        raise RosterError("The roster has no 'email' column.")
+    return {column: names.index(column) for column in ROSTER_COLUMNS if column in names}
+
+
+def get_cell(row, index) -> str:
+    if index >= len(row) or row[index] is None:
+        return ""
+    return str(row[index]).strip()
+
+
+def iter_table_rows(rows: Iterable) -> Iterator[tuple]:
+    """
+    Maps the rows of a table whose first row is the header to
+    (row number, dict of the roster columns) pairs, skipping empty rows.
+    """
+    rows = iter(rows)
+    header = next(rows, None)
+    if header is None:
+        raise RosterError("The roster is empty.")
+    indexes = get_column_indexes(header)
+    for number, row in enumerate(rows, start=2):
+        values = {column: get_cell(row, index) for column, index in indexes.items()}
+        if any(values.values()):
+            yield number, values
+
+
+def iter_csv_rows(file) -> Iterator[tuple]:
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        yield from iter_table_rows(csv.reader(text))
+    except (csv.Error, UnicodeDecodeError):
+        raise RosterError("The roster is not a valid UTF-8 CSV file.")
+    finally:
+        text.detach()
+
+
+def iter_xlsx_rows(file) -> Iterator[tuple]:
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise RosterError(
+            "XLSX rosters are not supported on this server (openpyxl is not "
+            "installed), upload a CSV file instead."
+        )
+
+    try:
+        workbook = load_workbook(file, read_only=True, data_only=True)
+    except Exception:
+        raise RosterError("The roster is not a valid XLSX file.")
+    try:
+        yield from iter_table_rows(workbook.active.iter_rows(values_only=True))
+    finally:
+        workbook.close()
+
+
+def iter_roster_rows(file, filename: str) -> Iterator[tuple]:
+    """
+    Streams the rows of an uploaded CSV or XLSX roster as (row number,
+    dict with the `ROSTER_COLUMNS` keys) pairs.
+    """
+    if filename.lower().endswith(".xlsx"):
+        return iter_xlsx_rows(file)
+    if filename.lower().endswith(".csv"):
+        return iter_csv_rows(file)
+    raise RosterError("Unsupported roster format, expected .csv or .xlsx.")
+
+
+def import_roster_chunk(group: Group, rows: list, seen: set) -> list:
+    """
+    Creates the students, memberships, invites and queued invite emails of
+    one chunk of roster rows with one lookup and one insert per table.
+
+    :param rows: list of (row number, row dict) pairs
+    :param seen: emails already handled by earlier chunks, updated in place
+    """
+    candidates = []
+    for number, row in rows:
+        user = User(
+            email=row["email"],
+            first_name=row.get("first_name", ""),
+            last_name=row.get("last_name", ""),
+            role=UserRoleChoices.STUDENT,
+            is_active=False,
+        )
+        user.normalize()
+        candidates.append((number, user))
+
+    emails = {user.email for _, user in candidates}
+    existing = set(User.objects.filter(email__in=emails).values_list("email", flat=True))
+
+    report = []
+    users = []
+    for number, user in candidates:
+        entry = {"row": number, "email": user.email}
+        try:
+            validate_email(user.email)
+        except ValidationError:
+            entry.update(status=RosterRowStatus.INVALID, error="Invalid email.")
+        else:
+            # rows created by an earlier chunk exist by now, so repeats
+            # are told apart before the lookup
+            if user.email in seen:
+                entry["status"] = RosterRowStatus.DUPLICATE
+            elif user.email in existing:
+                entry["status"] = RosterRowStatus.EXISTS
+            else:
+                entry["status"] = RosterRowStatus.CREATED
+                users.append(user)
+            seen.add(user.email)
+        report.append(entry)
+
+    User.objects.bulk_create(users, batch_size=ROSTER_CHUNK_SIZE)
+    Group.students.through.objects.bulk_create(
+        [Group.students.through(group_id=group.pk, user_id=user.pk) for user in users],
+        batch_size=ROSTER_CHUNK_SIZE,
+    )
+    invites = UserInvite.objects.bulk_create(
+        [UserInvite(user=user) for user in users], batch_size=ROSTER_CHUNK_SIZE
+    )
+    InviteEmail.objects.bulk_create(
+        [InviteEmail(invite=invite) for invite in invites], batch_size=ROSTER_CHUNK_SIZE
+    )
+    return report
+
+
+def import_roster(
+    group: Group, rows: Iterable[tuple], chunk_size: int = ROSTER_CHUNK_SIZE
+) -> list:
+    """
+    Invites the students of a roster to `group`, skipping emails that
+    already have an account. Everything is written in one transaction.
+
+    :param rows: (row number, row dict) pairs as yielded by `iter_roster_rows`
+
+    :return: a report entry per roster row
+    """
+    rows = iter(rows)
+    report = []
+    seen = set()
+    with transaction.atomic():
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            if len(report) + len(chunk) > ROSTER_MAX_ROWS:
+                raise RosterError(f"The roster has more than {ROSTER_MAX_ROWS} rows.")
+            report += import_roster_chunk(group, chunk, seen)
+        touch_groups([group.pk])
+    return report
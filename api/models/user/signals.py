@@ -0,0 +1,97 @@
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from models.user.models import GROUP_MEMBER_FIELDS, User, Group
+from models.user.cache import GROUP_AUTH_FIELDS, invalidate_auth_users
+from models.user.utils import (
+    touch_groups,
+    get_user_group_ids,
+    get_group_member_ids,
+    bump_group_versions,
+    publish_group_change,
+)
+
+
+@receiver(m2m_changed, sender=Group.students.through)
+def touch_group_on_membership_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            touch_groups([instance.pk])
+    elif action in ("post_add", "post_remove"):
+        touch_groups(pk_set)
+    elif action == "pre_clear":
+        touch_groups(instance.students_group.values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=User)
+def touch_groups_on_member_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or created:
+        return
+    if update_fields is not None and update_fields.isdisjoint(GROUP_MEMBER_FIELDS):
+        return
+    touch_groups(get_user_group_ids(instance))
+
+
+@receiver(pre_delete, sender=User)
+def touch_groups_on_member_delete(sender, instance, **kwargs):
+    touch_groups(get_user_group_ids(instance))
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def bump_group_version(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_group_versions([instance.pk])
+
+
+@receiver(post_save, sender=Group)
+def publish_group_update(sender, instance, created, raw=False, **kwargs):
+    if not raw and not created:
+        publish_group_change([instance.pk], "group.updated")
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_auth_user(sender, instance, **kwargs):
+    invalidate_auth_users([instance.pk])
+
+
+@receiver(pre_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+def collect_group_members(sender, instance, update_fields=None, **kwargs):
+    # read before the change, so that a replaced starosta and the students
+    # of a deleted group are still found
+    instance._auth_member_ids = set()
+    if instance.pk is None:
+        return
+    if update_fields is not None and update_fields.isdisjoint(GROUP_AUTH_FIELDS):
+        return
+    instance._auth_member_ids = get_group_member_ids([instance.pk])
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_auth_users_on_group_change(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and update_fields.isdisjoint(GROUP_AUTH_FIELDS):
+        return
+    invalidate_auth_users(
+        {instance.starosta_id, *getattr(instance, "_auth_member_ids", ())}
+    )
+
+
+@receiver(m2m_changed, sender=Group.students.through)
+def invalidate_auth_users_on_membership_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        invalidate_auth_users([instance.pk])
+    elif action == "post_clear":
+        invalidate_auth_users()
+    else:
+        invalidate_auth_users(pk_set)
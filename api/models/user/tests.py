@@ -0,0 +1,507 @@
+import io
+import sys
+import tempfile
+from datetime import timedelta
+from importlib.util import find_spec
+from unittest import mock, skipUnless
+
+from django.core import mail
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.api.auth.authentication import get_refresh_token
+from models.user.cache import build_auth_user, get_auth_user_cache, load_auth_user
+from models.user.choices import InviteEmailStatusChoices, UserRoleChoices
+from models.user.models import User, Group, UserInvite, InviteEmail
+from models.user.outbox import (
+    claim_invite_emails,
+    deliver_invite_emails,
+    send_invite_emails,
+)
+from models.user.roster import (
+    ROSTER_CHUNK_SIZE,
+    RosterError,
+    import_roster,
+    iter_roster_rows,
+)
+from models.user.utils import create_user_invite, search_users
+
+
+@skipUnless(connection.vendor == "sqlite", "query plans are checked on SQLite")
+class UserIndexTestCase(TestCase):
+    def setUp(self):
+        self.starosta = User.objects.create(
+            email="starosta@example.com",
+            first_name="Olena",
+            last_name="Koval",
+            role=UserRoleChoices.STAROSTA,
+        )
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(f"USING INDEX {index_name}", plan)
+        self.assertNotIn("SCAN", plan)
+
+    def test_alive_group_of_a_starosta(self):
+        self.assertUsesIndex(
+            Group.objects.alive().filter(starosta=self.starosta), "group_alive_starosta"
+        )
+
+    def test_alive_invites_of_a_user(self):
+        self.assertUsesIndex(
+            UserInvite.objects.alive().filter(user=self.starosta), "userinvite_alive_user"
+        )
+
+    def test_login_lookup(self):
+        self.assertUsesIndex(
+            User.objects.filter(email="starosta@example.com"), "user_email"
+        )
+
+    def test_available_students_are_read_in_index_order(self):
+        students = User.objects.filter(role=UserRoleChoices.STUDENT, is_active=True)
+        plan = students.order_by("search_name", "id").explain()
+        self.assertIn("USING INDEX user_student_search_name", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+        plan = search_users(students, "kov").order_by("search_name", "id").explain()
+        self.assertIn("user_student_search_name", plan)
+
+
+@override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+class InviteEmailTestCase(TestCase):
+    def setUp(self):
+        starosta = User.objects.create(
+            email="starosta@example.com",
+            first_name="Olena",
+            last_name="Koval",
+            role=UserRoleChoices.STAROSTA,
+        )
+        self.invite = create_user_invite(
+            "student@example.com", starosta.group.pk, "Ivan", "Bondar"
+        )
+
+    @override_settings(INVITE_URL="https://app.example.com/invite/{code}")
+    def test_invite_email_links_to_the_invite_page(self):
+        self.assertEqual(deliver_invite_emails(), (1, 1))
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn(
+            f"https://app.example.com/invite/{self.invite.code}", mail.outbox[0].body
+        )
+        self.assertEqual(
+            InviteEmail.objects.get().status, InviteEmailStatusChoices.SENT
+        )
+
+    @override_settings(INVITE_URL="")
+    def test_nothing_is_sent_without_invite_url(self):
+        with self.assertRaises(ImproperlyConfigured):
+            deliver_invite_emails()
+        with self.assertRaises(CommandError):
+            call_command("send_invite_emails", "--once")
+
+        email = InviteEmail.objects.get()
+        self.assertEqual(email.status, InviteEmailStatusChoices.PENDING)
+        self.assertEqual(email.attempts, 0)
+        self.assertEqual(mail.outbox, [])
+
+
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    INVITE_URL="https://app.example.com/invite/{code}",
+    INVITE_EMAIL_MAX_ATTEMPTS=3,
+    INVITE_EMAIL_RETRY_DELAY=60,
+)
+class InviteEmailRetryTestCase(TestCase):
+    def setUp(self):
+        starosta = User.objects.create(
+            email="starosta@example.com",
+            first_name="Olena",
+            last_name="Koval",
+            role=UserRoleChoices.STAROSTA,
+        )
+        create_user_invite("student@example.com", starosta.group.pk, "Ivan", "Bondar")
+
+    def fail_sending(self):
+        return mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            side_effect=OSError("connection reset"),
+        )
+
+    def make_due(self):
+        InviteEmail.objects.update(next_attempt_at=timezone.now())
+
+    def test_failed_sends_are_retried_with_exponential_backoff(self):
+        for attempt, delay in [(1, 60), (2, 120)]:
+            with self.subTest(attempt=attempt):
+                before = timezone.now()
+                with self.fail_sending():
+                    self.assertEqual(deliver_invite_emails(), (1, 0))
+                after = timezone.now()
+
+                email = InviteEmail.objects.get()
+                self.assertEqual(email.status, InviteEmailStatusChoices.PENDING)
+                self.assertEqual(email.attempts, attempt)
+                self.assertEqual(email.last_error, "OSError: connection reset")
+                self.assertIsNone(email.claim_token)
+                self.assertGreaterEqual(
+                    email.next_attempt_at, before + timedelta(seconds=delay)
+                )
+                self.assertLessEqual(
+                    email.next_attempt_at, after + timedelta(seconds=delay)
+                )
+                # not due until the delay has passed
+                self.assertEqual(deliver_invite_emails(), (0, 0))
+                self.make_due()
+
+        self.assertEqual(deliver_invite_emails(), (1, 1))
+        email = InviteEmail.objects.get()
+        self.assertEqual(email.status, InviteEmailStatusChoices.SENT)
+        self.assertEqual(email.attempts, 3)
+        self.assertEqual(email.last_error, "")
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_email_fails_for_good_after_max_attempts(self):
+        for _ in range(3):
+            with self.fail_sending():
+                deliver_invite_emails()
+            self.make_due()
+
+        email = InviteEmail.objects.get()
+        self.assertEqual(email.status, InviteEmailStatusChoices.FAILED)
+        self.assertEqual(email.attempts, 3)
+        self.assertEqual(deliver_invite_emails(), (0, 0))
+        self.assertEqual(mail.outbox, [])
+
+    def test_claimed_emails_are_reserved_until_the_lease_expires(self):
+        self.assertEqual(len(claim_invite_emails(10)), 1)
+        self.assertEqual(claim_invite_emails(10), [])
+
+        InviteEmail.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(len(claim_invite_emails(10)), 1)
+
+    def test_worker_with_an_expired_lease_keeps_the_new_result(self):
+        stale = claim_invite_emails(10)
+        InviteEmail.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(deliver_invite_emails(), (1, 1))
+
+        with self.fail_sending():
+            send_invite_emails(stale)
+
+        email = InviteEmail.objects.get()
+        self.assertEqual(email.status, InviteEmailStatusChoices.SENT)
+        self.assertEqual(email.attempts, 1)
+        self.assertEqual(email.last_error, "")
+
+
+class AuthUserCacheTestCase(TestCase):
+    def setUp(self):
+        get_auth_user_cache().clear()
+        self.starosta = User.objects.create(
+            email="starosta@example.com",
+            first_name="Olena",
+            last_name="Koval",
+            role=UserRoleChoices.STAROSTA,
+        )
+        self.group = self.starosta.group
+        self.student = User.objects.create(
+            email="student@example.com", first_name="Ivan", last_name="Bondar"
+        )
+        self.group.students.add(self.student)
+        self.outsider = User.objects.create(
+            email="outsider@example.com",
+            first_name="Taras",
+            last_name="Melnyk",
+            role=UserRoleChoices.STAROSTA,
+        )
+        for user in [self.starosta, self.student, self.outsider]:
+            load_auth_user(user.pk)
+
+    def assertCached(self, *users, cached=True):
+        for user in users:
+            with self.subTest(user=user.email):
+                self.assertEqual(
+                    get_auth_user_cache().get(user.pk) is not None, cached
+                )
+
+    def assertNotCached(self, *users):
+        self.assertCached(*users, cached=False)
+
+    def get_cached_user(self, user):
+        return build_auth_user(load_auth_user(user.pk))
+
+    def test_role_change(self):
+        self.student.role = UserRoleChoices.STAROSTA
+        self.student.save()
+
+        self.assertNotCached(self.student)
+        self.assertCached(self.starosta, self.outsider)
+        self.assertEqual(
+            self.get_cached_user(self.student).role, UserRoleChoices.STAROSTA
+        )
+
+    def test_deactivation(self):
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {get_refresh_token(self.student).access_token}"
+        )
+        self.assertEqual(client.get("/api/user/profile").status_code, 200)
+
+        self.student.is_active = False
+        self.student.save()
+
+        self.assertNotCached(self.student)
+        self.assertEqual(client.get("/api/user/profile").status_code, 401)
+
+    def test_soft_deleted_group_drops_only_its_members(self):
+        self.group.soft_delete()
+
+        self.assertNotCached(self.starosta, self.student)
+        self.assertCached(self.outsider)
+        self.assertIsNone(self.get_cached_user(self.student).group_pk)
+
+    def test_hard_deleted_group_drops_its_members(self):
+        self.group.hard_delete()
+
+        self.assertNotCached(self.starosta, self.student)
+        self.assertCached(self.outsider)
+        self.assertIsNone(self.get_cached_user(self.student).group_pk)
+
+    def test_new_starosta_drops_the_old_and_the_new_one(self):
+        deputy = User.objects.create(
+            email="deputy@example.com", first_name="Maria", last_name="Shevchenko"
+        )
+        self.group.students.add(deputy)
+        load_auth_user(deputy.pk)
+
+        self.group.starosta = deputy
+        self.group.save()
+
+        self.assertNotCached(self.starosta, deputy, self.student)
+        self.assertCached(self.outsider)
+        self.assertIsNone(self.get_cached_user(self.starosta).group_pk)
+        self.assertEqual(self.get_cached_user(deputy).group_pk, self.group.pk)
+
+    def test_other_group_changes_keep_the_cache(self):
+        self.group.name = "KN-21"
+        self.group.save(update_fields=["name"])
+        create_user_invite("new@example.com", self.group.pk, "Petro", "Bondar")
+
+        self.assertCached(self.starosta, self.student, self.outsider)
+
+
+class GroupTouchTestCase(TestCase):
+    def setUp(self):
+        self.starosta = User.objects.create(
+            email="starosta@example.com",
+            first_name="Olena",
+            last_name="Koval",
+            role=UserRoleChoices.STAROSTA,
+        )
+        self.student = User.objects.create(
+            email="student@example.com", first_name="Ivan", last_name="Bondar"
+        )
+        self.group = Group.objects.get(starosta=self.starosta)
+        self.group.students.add(self.student)
+        self.past = timezone.now() - timedelta(hours=1)
+        Group.objects.filter(pk=self.group.pk).update(updated_at=self.past)
+
+    def get_updated_at(self):
+        return Group.objects.get(pk=self.group.pk).updated_at
+
+    def test_saving_a_member_field_touches_the_group(self):
+        self.student.first_name = "Petro"
+        self.student.save(update_fields=["first_name"])
+
+        self.assertGreater(self.get_updated_at(), self.past)
+
+    def test_saving_other_fields_leaves_the_group(self):
+        self.student.save(update_fields=["last_login"])
+
+        self.assertEqual(self.get_updated_at(), self.past)
+
+
+class SearchUsersTestCase(TestCase):
+    def setUp(self):
+        self.ivan = User.objects.create(
+            email="ivan.bondar@example.com", first_name="ivan", last_name="BONDAR"
+        )
+        self.olena = User.objects.create(
+            email="koval@example.com", first_name="Олена", last_name="Коваль"
+        )
+        self.petro = User.objects.create(
+            email="petro@example.com", first_name="Petro", last_name="Ivanenko"
+        )
+
+    def search(self, query):
+        return set(search_users(User.objects.all(), query))
+
+    def test_prefix_of_the_full_name(self):
+        self.assertEqual(self.search("iv"), {self.ivan})
+        self.assertEqual(self.search("  IVAN   bon "), {self.ivan})
+        self.assertEqual(self.search("оле"), {self.olena})
+
+    def test_prefix_of_the_email(self):
+        self.assertEqual(self.search("koval@"), {self.olena})
+        self.assertEqual(self.search("PETRO@EXAMPLE.COM"), {self.petro})
+
+    def test_only_prefixes_match(self):
+        # "Ivanenko" is Petro's last name, not the start of his name
+        self.assertEqual(self.search("ivanenko"), set())
+        self.assertEqual(self.search("bondar"), set())
+
+    def test_empty_query_matches_everyone(self):
+        self.assertEqual(self.search(" "), {self.ivan, self.olena, self.petro})
+
+    def test_search_name_follows_renames(self):
+        self.ivan.first_name = "Taras"
+        self.ivan.save()
+
+        self.assertEqual(self.search("taras b"), {self.ivan})
+        self.assertEqual(self.search("ivan b"), set())
+
+
+class RosterImportTestCase(TestCase):
+    def setUp(self):
+        self.starosta = User.objects.create(
+            email="starosta@example.com",
+            first_name="Olena",
+            last_name="Koval",
+            role=UserRoleChoices.STAROSTA,
+        )
+        self.group = Group.objects.get(starosta=self.starosta)
+        self.existing = User.objects.create(
+            email="taken@example.com", first_name="Ivan", last_name="Bondar"
+        )
+
+    def make_csv(self, *rows):
+        # Excel saves UTF-8 CSV files with a BOM
+        return io.BytesIO("\r\n".join(rows).encode("utf-8-sig"))
+
+    def import_csv(self, *rows, chunk_size=ROSTER_CHUNK_SIZE):
+        return import_roster(
+            self.group,
+            iter_roster_rows(self.make_csv(*rows), "roster.csv"),
+            chunk_size=chunk_size,
+        )
+
+    def test_report_per_row(self):
+        report = self.import_csv(
+            "Last_Name, Email ,First_Name",
+            "Shevchenko,Taras@Example.com,Taras",
+            "Bondar,TAKEN@example.com,Ivan",
+            ",,",
+            "Shevchenko,taras@example.com,Taras",
+            "Nobody,not-an-email,",
+        )
+
+        self.assertEqual(
+            report,
+            [
+                {"row": 2, "email": "taras@example.com", "status": "created"},
+                {"row": 3, "email": "taken@example.com", "status": "exists"},
+                {"row": 5, "email": "taras@example.com", "status": "duplicate"},
+                {
+                    "row": 6,
+                    "email": "not-an-email",
+                    "status": "invalid",
+                    "error": "Invalid email.",
+                },
+            ],
+        )
+
+    def test_created_students_are_invited(self):
+        self.import_csv(
+            "email,first_name,last_name", "taras@example.com,taras,shevchenko"
+        )
+
+        student = User.objects.get(email="taras@example.com")
+        self.assertFalse(student.is_active)
+        self.assertEqual(student.full_name, "Taras Shevchenko")
+        self.assertEqual(list(self.group.students.all()), [student])
+        invite = UserInvite.objects.get(user=student)
+        self.assertEqual(InviteEmail.objects.get().invite, invite)
+        self.assertFalse(self.group.students.filter(pk=self.existing.pk).exists())
+
+    def test_duplicates_are_found_across_chunks(self):
+        report = self.import_csv(
+            "email",
+            "a@example.com",
+            "b@example.com",
+            "c@example.com",
+            "a@example.com",
+            chunk_size=2,
+        )
+
+        self.assertEqual(
+            [row["status"] for row in report],
+            ["created", "created", "created", "duplicate"],
+        )
+        self.assertEqual(self.group.students.count(), 3)
+
+    def test_too_many_rows_write_nothing(self):
+        rows = [f"student{index}@example.com" for index in range(4)]
+
+        with mock.patch("models.user.roster.ROSTER_MAX_ROWS", 3):
+            with self.assertRaises(RosterError):
+                self.import_csv("email", *rows, chunk_size=2)
+
+        self.assertFalse(self.group.students.exists())
+        self.assertFalse(InviteEmail.objects.exists())
+
+    def test_invalid_rosters(self):
+        cases = [
+            (self.make_csv("name", "Taras"), "roster.csv", "no 'email' column"),
+            (io.BytesIO(b""), "roster.csv", "empty"),
+            (io.BytesIO(b"email\n\xff\xfe"), "roster.csv", "UTF-8"),
+            (self.make_csv("email"), "roster.txt", "Unsupported"),
+        ]
+        for file, filename, message in cases:
+            with self.subTest(message=message):
+                with self.assertRaisesMessage(RosterError, message):
+                    import_roster(self.group, iter_roster_rows(file, filename))
+
+    def test_xlsx_without_openpyxl(self):
+        with mock.patch.dict(sys.modules, {"openpyxl": None}):
+            with self.assertRaisesMessage(
+                RosterError, "XLSX rosters are not supported"
+            ):
+                import_roster(self.group, iter_roster_rows(io.BytesIO(), "roster.xlsx"))
+
+    @skipUnless(find_spec("openpyxl"), "openpyxl is not installed")
+    def test_xlsx(self):
+        from openpyxl import Workbook
+
+        workbook = Workbook()
+        workbook.active.append(["Email", "First name", "Last name"])
+        workbook.active.append(["taras@example.com", "Taras", "Shevchenko"])
+        file = io.BytesIO()
+        workbook.save(file)
+        file.seek(0)
+
+        report = import_roster(self.group, iter_roster_rows(file, "Roster.XLSX"))
+
+        self.assertEqual([row["status"] for row in report], ["created"])
+
+    def test_management_command(self):
+        with tempfile.NamedTemporaryFile(suffix=".csv") as roster:
+            roster.write(
+                self.make_csv("email", "taras@example.com", "taken@example.com").read()
+            )
+            roster.flush()
+            stdout = io.StringIO()
+
+            call_command("import_roster", self.group.pk, roster.name, stdout=stdout)
+
+        self.assertIn("Row 3 (taken@example.com): exists", stdout.getvalue())
+        self.assertIn("Invited 1 of 2 students.", stdout.getvalue())
+
+    def test_management_command_errors(self):
+        with self.assertRaisesMessage(CommandError, "not found"):
+            call_command("import_roster", 999999, "roster.csv")
+        with self.assertRaises(CommandError):
+            call_command("import_roster", self.group.pk, "/nonexistent/roster.csv")
@@ -1,7 +1,84 @@
+from datetime import timedelta
+from typing import Iterable
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from models.common.cache import get_payload_cache
+from models.common.pubsub import publish_on_commit
 from models.user.models import UserInvite, User, Group
 from models.user.choices import UserRoleChoices
 
 
+def touch_groups(group_ids: Iterable[int]) -> None:
+    """
+    Bumps `updated_at` of the given groups, so that cached and conditional
+    reads notice changes that do not save the group row itself.
+    """
+    group_ids = list(group_ids)
+    if group_ids:
+        Group.objects.filter(pk__in=group_ids).update(updated_at=timezone.now())
+        bump_group_versions(group_ids)
+        publish_group_change(group_ids, "roster.changed")
+
+
+def bump_group_versions(group_ids: Iterable[int]) -> None:
+    """
+    Invalidates the cached payloads of the given groups and of their
+    schedules, which include the group.
+    """
+    get_payload_cache().bump("group", group_ids)
+
+
+def get_group_channel(group_id) -> str:
+    return f"group:{group_id}"
+
+
+def publish_group_change(
+    group_ids: Iterable[int], event: str, data: dict = None
+) -> None:
+    """
+    Notifies the live update streams of the given groups of a change once
+    the current transaction commits.
+    """
+    for group_id in group_ids:
+        publish_on_commit(get_group_channel(group_id), event, data or {})
+
+
+def touch_last_login(user: User) -> None:
+    """
+    Records a login without saving the whole user. `last_login` is only
+    written once per `LAST_LOGIN_UPDATE_INTERVAL` seconds, and never if
+    the setting is None.
+    """
+    interval = settings.LAST_LOGIN_UPDATE_INTERVAL
+    if interval is None:
+        return
+    now = timezone.now()
+    if user.last_login and now - user.last_login < timedelta(seconds=interval):
+        return
+    User.objects.filter(pk=user.pk).update(last_login=now)
+    user.last_login = now
+
+
+def get_user_group_ids(user: User) -> list:
+    return list(
+        Group.objects.filter(Q(starosta=user) | Q(students=user))
+        .values_list("pk", flat=True)
+        .distinct()
+    )
+
+
+def get_group_member_ids(group_ids: Iterable[int]) -> set:
+    return set(
+        User.objects.filter(
+            Q(starosta_group__in=group_ids) | Q(students_group__in=group_ids)
+        ).values_list("pk", flat=True)
+    )
+
+
 def create_user_invite(
     email: str,
     group_id: int,
@@ -18,10 +95,90 @@ def create_user_invite(
     user.save()
 
     group = Group.objects.get(id=group_id)
+    # the membership signals touch the group, so the row is not saved
     group.students.add(user)
-    group.save()
 
     invite = UserInvite(user=user)
     invite.save()
 
     return invite
+
+
+def parse_ids(values) -> tuple:
+    """
+    Splits raw ids into a set of valid integer ids and a list of the
+    values that are not ids at all.
+    """
+    if not isinstance(values, (list, tuple, set)):
+        return set(), [values]
+    ids, invalid = set(), []
+    for value in values:
+        try:
+            ids.add(int(value))
+        except (TypeError, ValueError):
+            invalid.append(value)
+    return ids, invalid
+
+
+def update_group_members(
+    group: Group,
+    add: Iterable = (),
+    remove: Iterable = (),
+    members: Iterable = None,
+) -> list:
+    """
+    Changes the students of a group in bulk: adds `add`, removes `remove`,
+    or, if `members` is given, makes the roster exactly `members`.
+
+    All requested users are fetched in one query. If any of them is not
+    an existing student nothing is changed.
+
+    :return: list of the invalid ids
+    """
+    add_ids, invalid = parse_ids(add)
+    remove_ids, invalid_remove = parse_ids(remove)
+    invalid += invalid_remove
+    member_ids = None
+    if members is not None:
+        member_ids, invalid_members = parse_ids(members)
+        invalid += invalid_members
+
+    requested = add_ids | remove_ids | (member_ids or set())
+    students = set(
+        User.objects.filter(pk__in=requested, role=UserRoleChoices.STUDENT).values_list(
+            "pk", flat=True
+        )
+    )
+    invalid += sorted(requested - students)
+    if invalid:
+        return invalid
+
+    current = set(group.students.values_list("pk", flat=True))
+    if member_ids is not None:
+        target = member_ids
+    else:
+        target = (current | add_ids) - remove_ids
+
+    with transaction.atomic():
+        if current - target:
+            group.students.remove(*(current - target))
+        if target - current:
+            group.students.add(*(target - current))
+    return []
+
+
+def search_users(queryset, query: str):
+    """
+    Filters users whose name or email starts with `query`.
+
+    Prefixes are matched as a [prefix, prefix + max char) range, which any
+    index on the column can answer, unlike LIKE on SQLite.
+    """
+    query = User.normalize_search(query)
+    if not query:
+        return queryset
+    upper_bound = query + chr(0x10FFFF)
+    return queryset.filter(
+        Q(search_name__gte=query, search_name__lt=upper_bound)
+        | Q(email__gte=query, email__lt=upper_bound)
+    )
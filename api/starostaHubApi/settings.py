@@ -55,6 +55,7 @@ INSTALLED_APPS = [
     # 3rd party apps
     "rest_framework",
     "rest_framework_simplejwt",
+    "rest_framework_simplejwt.token_blacklist",
     "drf_yasg",
     "corsheaders",
     # My apps
@@ -65,6 +66,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.api.helpers.timing.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -81,13 +83,42 @@ AUTH_USER_MODEL = "user.User"
 REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
     "PAGE_SIZE": 10,
+    # JSON goes through orjson when it is installed and the stdlib otherwise,
+    # with the same output; PreRenderedJSONRenderer and
+    # rest_framework.parsers.JSONParser are the stdlib-only equivalents.
+    # Both renderers send PreRenderedJSON (cached, already encoded payloads)
+    # as is.
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.api.helpers.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "core.api.helpers.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+    # the API is JWT only; sessions are left to the admin, which
+    # authenticates through Django's own middleware
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.BasicAuthentication",
-        "rest_framework.authentication.SessionAuthentication",
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "core.api.auth.authentication.CachedJWTAuthentication",
     ],
+    # proxies in front of the API that append the client address to
+    # X-Forwarded-For. The throttles key on the address the last of them
+    # saw; with 0 the header, which any client can forge, is ignored and
+    # REMOTE_ADDR is used. Set it when deploying behind e.g. nginx.
+    "NUM_PROXIES": 0,
+    # token bucket sizes of the auth throttles, see core/api/auth/throttling.py
+    "DEFAULT_THROTTLE_RATES": {
+        "login_ip": "60/min",
+        "login_email": "10/min",
+        "register_ip": "10/hour",
+    },
 }
 
+# where the auth throttles keep their buckets; CacheBucketStore shares
+# them between processes through the default cache
+AUTH_THROTTLE_STORE = "core.api.auth.throttling.MemoryBucketStore"
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
@@ -118,6 +149,22 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# locmem is per process; point it at a shared backend, e.g.
+# "django.core.cache.backends.filebased.FileBasedCache" or
+# "django.core.cache.backends.redis.RedisCache" with "redis://127.0.0.1:6379",
+# to share cached payloads (and the version counters) between processes.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "starostahub",
+        "OPTIONS": {"MAX_ENTRIES": 10_000},
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -169,7 +216,75 @@ UNFOLD = {
     },
 }
 
+# Access tokens are checked without a query (see CachedJWTAuthentication),
+# so they can be short-lived. Refresh tokens rotate on every use and the
+# used one is blacklisted; `python manage.py flushexpiredtokens` (run it
+# daily) drops expired entries of the blacklist tables.
 SIMPLE_JWT = {
-    "ACCESS_TOKEN_LIFETIME": timedelta(days=365),
-    "REFRESH_TOKEN_LIFETIME": timedelta(days=365),
+    "ACCESS_TOKEN_LIFETIME": timedelta(minutes=15),
+    "REFRESH_TOKEN_LIFETIME": timedelta(days=30),
+    "ROTATE_REFRESH_TOKENS": True,
+    "BLACKLIST_AFTER_ROTATION": True,
+    "UPDATE_LAST_LOGIN": False,
+    "TOKEN_REFRESH_SERIALIZER": "core.api.auth.serializers.EpochTokenRefreshSerializer",
+}
+
+# Invite emails are queued in an outbox and sent by
+# `python manage.py send_invite_emails`.
+EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
+DEFAULT_FROM_EMAIL = "StarostaHub <noreply@starostahub.local>"
+# Required to send invite emails: the page of the client that accepts an
+# invite, with `{code}` replaced by the invite code, e.g.
+# INVITE_URL="https://app.example.com/invite/{code}". The worker refuses to
+# start without it rather than mailing links that lead nowhere.
+INVITE_URL = os.environ.get("INVITE_URL", "")
+INVITE_EMAIL_BATCH_SIZE = 50
+INVITE_EMAIL_MAX_ATTEMPTS = 5
+# retries wait RETRY_DELAY, 2 * RETRY_DELAY, 4 * RETRY_DELAY, ... seconds
+INVITE_EMAIL_RETRY_DELAY = 60
+
+# `last_login` is written at most once per this many seconds per user
+# (0 writes it on every login, None never)
+LAST_LOGIN_UPDATE_INTERVAL = 60 * 60
+
+# Password hashing runs in its own thread pool so a burst of logins
+# cannot starve the server; requests beyond the queue get a 503.
+PASSWORD_HASHING_WORKERS = os.cpu_count() or 2
+PASSWORD_HASHING_QUEUE = 32
+
+# JWT authentication resolves users from a per-process cache; entries are
+# dropped on user, group and membership changes and expire after the TTL
+AUTH_USER_CACHE_SIZE = 10_000
+AUTH_USER_CACHE_TTL = 60
+# embed the role and group id in issued tokens and trust the group id claim
+# when a user is not cached (saves the group lookup, but the claim only
+# changes when the token is refreshed)
+AUTH_USER_CLAIMS = False
+
+# Serialized group and schedule payloads are cached per group version (see
+# models.common.cache); versions move on every group, member and event change
+PAYLOAD_CACHE_ALIAS = "default"
+PAYLOAD_CACHE_TIMEOUT = 5 * 60
+
+# hub of the live updates streamed to clients (server-sent events); those
+# streams need an ASGI server, e.g. `uvicorn starostaHubApi.asgi:application`.
+# MemoryHub only reaches clients of the same process, with several workers
+# use "models.common.pubsub.CacheHub" over a cache they share (e.g. Redis)
+LIVE_UPDATES_HUB = "models.common.pubsub.MemoryHub"
+# seconds of silence after which a stream sends a heartbeat comment
+LIVE_UPDATES_HEARTBEAT = 15
+# seconds after which a stream ends and the client reconnects (and so
+# authenticates again)
+LIVE_UPDATES_STREAM_TIMEOUT = 5 * 60
+# seconds clients wait before reconnecting
+LIVE_UPDATES_RETRY = 3
+
+# report per-request timings (e.g. authentication) in a Server-Timing header
+SERVER_TIMING = DEBUG
+
+SWAGGER_SETTINGS = {
+    "USE_SESSION_AUTH": False,
+    "SECURITY_DEFINITIONS": {
+        "Bearer": {"type": "apiKey", "name": "Authorization", "in": "header"},
+    },
 }
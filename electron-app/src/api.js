@@ -1,5 +1,5 @@
 import axios from "axios";
-import { ACCESS_TOKEN } from "./constants";
+import { ACCESS_TOKEN, REFRESH_TOKEN } from "./constants";
 
 const api = axios.create({
     baseURL: process.env.REST_API_URL,
@@ -23,4 +23,151 @@ api.interceptors.request.use(
     }
 );
 
+let refreshing = null;
+
+// Refresh tokens rotate on every use, so concurrent refreshes must share one
+// request: a second one would present the already blacklisted token.
+export const refreshAccessToken = () => {
+    if (!refreshing) {
+        refreshing = api
+            .post("/api/auth/token/refresh", {
+                refresh: localStorage.getItem(REFRESH_TOKEN),
+            }, { skipAuthRefresh: true })
+            .then((res) => {
+                localStorage.setItem(ACCESS_TOKEN, res.data.access);
+                if (res.data.refresh) {
+                    localStorage.setItem(REFRESH_TOKEN, res.data.refresh);
+                }
+                return res.data.access;
+            })
+            .finally(() => {
+                refreshing = null;
+            });
+    }
+    return refreshing;
+};
+
+api.interceptors.response.use(
+    (response) => response,
+    async (error) => {
+        const config = error.config;
+        if (
+            error.response &&
+            error.response.status === 401 &&
+            config &&
+            !config.skipAuthRefresh &&
+            !config.authRetried &&
+            localStorage.getItem(REFRESH_TOKEN)
+        ) {
+            config.authRetried = true;
+            try {
+                await refreshAccessToken();
+            } catch (refreshError) {
+                return Promise.reject(error);
+            }
+            return api(config);
+        }
+        return Promise.reject(error);
+    }
+);
+
+const parseEvent = (block) => {
+    const event = { id: null, type: "message", data: "", retry: null };
+    for (const line of block.split("\n")) {
+        if (!line || line.startsWith(":")) {
+            continue;
+        }
+        const index = line.indexOf(":");
+        const field = index < 0 ? line : line.slice(0, index);
+        const value = index < 0 ? "" : line.slice(index + 1).replace(/^ /, "");
+        if (field === "id") {
+            event.id = value;
+        } else if (field === "event") {
+            event.type = value;
+        } else if (field === "data") {
+            event.data += event.data ? `\n${value}` : value;
+        } else if (field === "retry") {
+            event.retry = parseInt(value, 10);
+        }
+    }
+    return event;
+};
+
+// Calls `onChange(type, data)` for every change of a group pushed by the
+// server ("event.updated", "roster.changed", ..., or "reset" when changes
+// were missed). EventSource cannot send the Authorization header, so the
+// stream is read with fetch; it reconnects with the last event id until
+// the returned function is called.
+export const subscribeToGroup = (groupId, onChange) => {
+    const controller = new AbortController();
+    let lastEventId = null;
+    let retryDelay = 3000;
+
+    const wait = (delay) => new Promise((resolve) => setTimeout(resolve, delay));
+
+    const readStream = async (response) => {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = "";
+        for (;;) {
+            const { value, done } = await reader.read();
+            if (done) {
+                return;
+            }
+            buffer += decoder.decode(value, { stream: true }).replace(/\r\n?/g, "\n");
+            let index;
+            while ((index = buffer.indexOf("\n\n")) >= 0) {
+                const event = parseEvent(buffer.slice(0, index));
+                buffer = buffer.slice(index + 2);
+                if (event.retry) {
+                    retryDelay = event.retry;
+                }
+                if (event.id !== null) {
+                    lastEventId = event.id;
+                }
+                if (event.data && event.type !== "ready") {
+                    onChange(event.type, JSON.parse(event.data));
+                }
+            }
+        }
+    };
+
+    const connect = async () => {
+        while (!controller.signal.aborted) {
+            try {
+                const headers = {
+                    Accept: "text/event-stream",
+                    Authorization: `Bearer ${localStorage.getItem(ACCESS_TOKEN)}`,
+                };
+                if (lastEventId !== null) {
+                    headers["Last-Event-ID"] = lastEventId;
+                }
+                const response = await fetch(
+                    `${api.defaults.baseURL || ""}/api/user/groups/${groupId}/stream`,
+                    { headers, signal: controller.signal }
+                );
+                if (response.status === 401) {
+                    await refreshAccessToken();
+                    continue;
+                }
+                if (!response.ok) {
+                    // no access or no live updates on this server: the page
+                    // still works, it just does not update by itself
+                    return;
+                }
+                await readStream(response);
+            } catch (error) {
+                if (controller.signal.aborted || error.response) {
+                    // unsubscribed, or the session could not be refreshed
+                    return;
+                }
+            }
+            await wait(retryDelay);
+        }
+    };
+
+    connect();
+    return () => controller.abort();
+};
+
 export default api;
@@ -9,11 +9,27 @@ import NotFound from "./pages/NotFound.jsx";
 import ProtectedRoute from "./components/ProtectedRoute.jsx";
 import Register from './pages/Register.jsx';
 import Events from "./pages/Events.jsx";
+import api from "./api";
+import { REFRESH_TOKEN } from "./constants";
 import './index.css';
 
 function Logout() {
-    localStorage.clear()
-    return <Navigate to="/login" />
+    const [done, setDone] = React.useState(false);
+
+    React.useEffect(() => {
+        const refresh = localStorage.getItem(REFRESH_TOKEN);
+        const request = refresh
+            ? api.post("/api/auth/logout", { refresh }, { skipAuthRefresh: true })
+            : Promise.resolve();
+        request
+            .catch(() => {})
+            .finally(() => {
+                localStorage.clear();
+                setDone(true);
+            });
+    }, []);
+
+    return done ? <Navigate to="/login" /> : null;
 };
 
 function App() {
@@ -1,12 +1,14 @@
 import React, { useEffect, useState } from "react";
 import { useParams, useNavigate } from "react-router-dom";
 import { USER_ID } from "../constants";
-import api from "../api";
+import api, { subscribeToGroup } from "../api";
 
 export default function Events() {
     const navigate = useNavigate();
     const { id } = useParams();
     const [events, setEvents] = useState([]);
+    const [nextPage, setNextPage] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState(null);
 
@@ -19,13 +21,17 @@ export default function Events() {
     const currentUserId = parseInt(localStorage.getItem(USER_ID), 10);
 
     useEffect(() => {
-        const fetchEvents = async () => {
-            setLoading(true);
-            setError(null);
+        // `quiet` reloads after a pushed change, without the loading state
+        const fetchEvents = async (quiet = false) => {
+            if (!quiet) {
+                setLoading(true);
+                setError(null);
+            }
             try {
                 const response = await api.get(`/api/user/groups/${id}/events`);
                 if (response.status === 200) {
-                    setEvents(response.data.data);
+                    setEvents(response.data.data.results);
+                    setNextPage(response.data.data.next);
                 } else {
                     setError("Не вдалося завантажити розклад.");
                 }
@@ -52,8 +58,36 @@ export default function Events() {
 
         fetchEvents();
         fetchGroup();
+
+        let refetchTimeout = null;
+        const unsubscribe = subscribeToGroup(id, (type) => {
+            if (type.startsWith("event.") || type === "reset") {
+                // a burst of changes (e.g. a bulk edit) reloads once
+                clearTimeout(refetchTimeout);
+                refetchTimeout = setTimeout(() => fetchEvents(true), 300);
+            }
+        });
+        return () => {
+            clearTimeout(refetchTimeout);
+            unsubscribe();
+        };
     }, [id, currentUserId]);
 
+    const handleLoadMore = async () => {
+        setLoadingMore(true);
+        try {
+            const response = await api.get(nextPage);
+            if (response.status === 200) {
+                setEvents([...events, ...response.data.data.results]);
+                setNextPage(response.data.data.next);
+            }
+        } catch (err) {
+            console.error("Помилка завантаження подій:", err);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     const handleCreateEvent = () => {
         setEventForm({
             id: null,
@@ -379,6 +413,17 @@ export default function Events() {
                     ) : (
                         <div className="text-gray-400">Подій не знайдено.</div>
                     )}
+                    {nextPage && (
+                        <div className="mt-4 flex justify-center">
+                            <button
+                                onClick={handleLoadMore}
+                                disabled={loadingMore}
+                                className="px-4 py-2 bg-gray-600 rounded-lg font-bold hover:bg-gray-700 focus:ring-4 focus:ring-gray-500 focus:outline-none text-white"
+                            >
+                                {loadingMore ? "Завантаження..." : "Показати більше"}
+                            </button>
+                        </div>
+                    )}
                 </section>
             </main>
             <footer className="p-4 text-center text-sm text-gray-500 bg-gray-900">
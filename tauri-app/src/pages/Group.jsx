@@ -1,7 +1,7 @@
 import React, { useEffect, useState } from "react";
 import { useParams, useNavigate } from "react-router-dom";
 import { USER_ID } from "../constants";
-import api from "../api";
+import api, { subscribeToGroup } from "../api";
 
 export default function Group() {
     const navigate = useNavigate();
@@ -11,15 +11,21 @@ export default function Group() {
     const [error, setError] = useState(null);
 
     const [availableStudents, setAvailableStudents] = useState([]);
+    const [availableNext, setAvailableNext] = useState(null);
+    const [studentQuery, setStudentQuery] = useState("");
+    const [loadingMore, setLoadingMore] = useState(false);
     const [isAddingStudents, setIsAddingStudents] = useState(false);
     const [isRemovingStudents, setIsRemovingStudents] = useState(false);
     const [selectedStudentIds, setSelectedStudentIds] = useState([]);
     const [submitting, setSubmitting] = useState(false);
 
     useEffect(() => {
-        const fetchGroupData = async () => {
-            setLoading(true);
-            setError(null);
+        // `quiet` reloads after a pushed change, without the loading state
+        const fetchGroupData = async (quiet = false) => {
+            if (!quiet) {
+                setLoading(true);
+                setError(null);
+            }
             try {
                 const response = await api.get(`/api/user/groups/${id}`);
                 if (response.status === 200 && response.data.data) {
@@ -35,21 +41,59 @@ export default function Group() {
         };
 
         fetchGroupData();
+
+        let refetchTimeout = null;
+        const unsubscribe = subscribeToGroup(id, (type) => {
+            if (type === "group.updated" || type === "roster.changed" || type === "reset") {
+                clearTimeout(refetchTimeout);
+                refetchTimeout = setTimeout(() => fetchGroupData(true), 300);
+            }
+        });
+        return () => {
+            clearTimeout(refetchTimeout);
+            unsubscribe();
+        };
     }, [id]);
 
-    const fetchAvailableStudents = async () => {
+    const fetchAvailableStudents = async (query = "") => {
+        try {
+            const response = await api.get(`/api/user/available-students`, {
+                params: query ? { q: query } : {},
+            });
+            if (response.status === 200 && response.data.data) {
+                setAvailableStudents(response.data.data.results);
+                setAvailableNext(response.data.data.next);
+            }
+        } catch (err) {
+            console.error("Error fetching available students:", err);
+        }
+    };
+
+    useEffect(() => {
+        if (!isAddingStudents) {
+            return;
+        }
+        const timeout = setTimeout(() => fetchAvailableStudents(studentQuery), 300);
+        return () => clearTimeout(timeout);
+    }, [studentQuery, isAddingStudents]);
+
+    const handleLoadMoreStudents = async () => {
+        setLoadingMore(true);
         try {
-            const response = await api.get(`/api/user/available-students`);
-            if (response.status === 200 && Array.isArray(response.data.data)) {
-                setAvailableStudents(response.data.data);
+            const response = await api.get(availableNext);
+            if (response.status === 200 && response.data.data) {
+                setAvailableStudents([...availableStudents, ...response.data.data.results]);
+                setAvailableNext(response.data.data.next);
             }
         } catch (err) {
             console.error("Error fetching available students:", err);
+        } finally {
+            setLoadingMore(false);
         }
     };
 
-    const handleAddStudentsClick = async () => {
-        await fetchAvailableStudents();
+    const handleAddStudentsClick = () => {
+        setStudentQuery("");
         setIsAddingStudents(true);
     };
 
@@ -189,6 +233,15 @@ export default function Group() {
                         <h3 className="text-xl font-bold">
                             {isAddingStudents ? "Оберіть студентів для додавання" : "Оберіть студентів для видалення"}
                         </h3>
+                        {isAddingStudents && (
+                            <input
+                                type="text"
+                                value={studentQuery}
+                                onChange={(e) => setStudentQuery(e.target.value)}
+                                placeholder="Пошук за ім'ям або електронною адресою"
+                                className="w-full px-3 py-2 rounded-lg bg-gray-800 border border-gray-700 text-white focus:ring-2 focus:ring-blue-500 focus:outline-none"
+                            />
+                        )}
                         {(isAddingStudents ? availableStudents.length > 0 : students.length > 0) ? (
                             <div className="flex flex-col space-y-2">
                                 {(isAddingStudents ? availableStudents : students).map((st) => (
@@ -205,6 +258,15 @@ export default function Group() {
                         ) : (
                             <div>Немає доступних студентів.</div>
                         )}
+                        {isAddingStudents && availableNext && (
+                            <button
+                                onClick={handleLoadMoreStudents}
+                                disabled={loadingMore}
+                                className="px-4 py-2 bg-gray-600 rounded-lg font-bold hover:bg-gray-700 focus:ring-4 focus:ring-gray-500 focus:outline-none text-white"
+                            >
+                                {loadingMore ? "Завантаження..." : "Показати більше"}
+                            </button>
+                        )}
                         <div className="flex space-x-2">
                             <button
                                 disabled={submitting || selectedStudentIds.length === 0}